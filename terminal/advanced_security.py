@@ -14,6 +14,7 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import hmac
 import threading
+from collections import deque
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -21,12 +22,14 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 class AdvancedSecurity:
     """Manages advanced security features"""
 
+    AUDIT_LOG_LIMIT = 1000  # entries kept in memory and on disk
+
     def __init__(self):
         self.security_db_path = os.path.expanduser("~/.nexus/security.db")
         self.encryption_keys = {}
         self.api_keys = {}
         self.threat_patterns = []
-        self.audit_log = []
+        self.audit_log = deque(maxlen=self.AUDIT_LOG_LIMIT)
         self.biometric_data = {}
         self.session_keys = {}
         self._load_security_data()
@@ -39,7 +42,7 @@ class AdvancedSecurity:
                 with open(self.security_db_path, 'r') as f:
                     data = json.load(f)
                     self.api_keys = data.get("api_keys", {})
-                    self.audit_log = data.get("audit_log", [])
+                    self.audit_log = deque(data.get("audit_log", []), maxlen=self.AUDIT_LOG_LIMIT)
                     self.threat_patterns = data.get("threat_patterns", [])
         except Exception as e:
             print(f"Warning: Could not load security database: {e}")
@@ -50,7 +53,7 @@ class AdvancedSecurity:
             os.makedirs(os.path.dirname(self.security_db_path), exist_ok=True)
             data = {
                 "api_keys": self.api_keys,
-                "audit_log": self.audit_log[-1000:],  # Keep last 1000 entries
+                "audit_log": list(self.audit_log),
                 "threat_patterns": self.threat_patterns,
                 "last_updated": time.time()
             }
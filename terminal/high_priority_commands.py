@@ -3,239 +3,306 @@ High Priority Commands Integration
 Command handlers for the 5 new high-priority features
 """
 
-from rich.console import Console
+import weakref
+from collections import ChainMap
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import TYPE_CHECKING, NamedTuple, Optional
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.text import Text
+
+
+class _Spec(NamedTuple):
+    """Argument schema for one command, checked by ``_invoke``"""
+    method: str                    # method name on the bound manager
+    min_args: int = 0
+    usage: Optional[str] = None    # returned when args are missing or invalid
+    defaults: tuple = ()           # values for the optional trailing params
+    coerce: tuple = ()             # per-position converters, e.g. (None, int)
+    join_rest: bool = False        # last required param gets the remaining args joined
+
+
+# Command tables: name -> _Spec
+_API_COMMANDS = {
+    # HTTP Methods
+    'http get': _Spec('get', 1, "Usage: /http get [url] [optional:params]", (None,)),
+    'http post': _Spec('post', 2, "Usage: /http post [url] [json_data]"),
+    'http put': _Spec('put', 2, "Usage: /http put [url] [json_data]"),
+    'http delete': _Spec('delete', 1, "Usage: /http delete [url]"),
+    'http patch': _Spec('patch', 2, "Usage: /http patch [url] [json_data]"),
+
+    # Configuration
+    'http headers': _Spec('set_headers', 1, "Usage: /http headers [key:value,...]"),
+    'http auth': _Spec('set_auth', 2, "Usage: /http auth [type] [credentials]"),
+    'http reset': _Spec('reset', 0),
+
+    # Collections
+    'http save': _Spec('save_collection', 1, "Usage: /http save [name]"),
+    'http collection list': _Spec('list_collections', 0),
+    'http collection run': _Spec('run_collection', 1, "Usage: /http collection run [name]"),
+
+    # Testing
+    'http test': _Spec('test_endpoint', 1, "Usage: /http test [url] [expected_status]", (200,), (None, int)),
+    'http benchmark': _Spec('benchmark', 1, "Usage: /http benchmark [url] [requests]", (10,), (None, int)),
+
+    # History
+    'http history': _Spec('show_history', 0),
+    'http clear': _Spec('clear_history', 0),
+}
+
+_DB_COMMANDS = {
+    # Connection Management
+    'db connect': _Spec('connect', 2, "Usage: /db connect [type] [connection_string] [optional:name]\n"
+                              "   Types: sqlite, postgresql, mysql, mongodb", ("default",)),
+    'db list': _Spec('list_connections', 0),
+    'db close': _Spec('close', 0, None, (None,)),
+
+    # Query Operations
+    'db query': _Spec('query', 1, "Usage: /db query [SQL]", join_rest=True),
+    'db tables': _Spec('show_tables', 0),
+    'db schema': _Spec('describe_table', 1, "Usage: /db schema [table_name]"),
+
+    # Backup & Restore
+    'db backup': _Spec('backup', 1, "Usage: /db backup [output_path]"),
+    'db stats': _Spec('stats', 0),
+    'db script': _Spec('execute_script', 1, "Usage: /db script [file_path]"),
+}
+
+_PKG_COMMANDS = {
+    # Package Operations
+    'pkg search': _Spec('search', 1, "Usage: /pkg search [package]", (None,)),
+    'pkg install': _Spec('install', 1, "Usage: /pkg install [package] [optional:pm]", (None,)),
+    'pkg uninstall': _Spec('uninstall', 1, "Usage: /pkg uninstall [package]", (None,)),
+    'pkg update': _Spec('update', 0, None, (None,)),
+
+    # Information
+    'pkg outdated': _Spec('list_outdated', 0),
+    'pkg audit': _Spec('audit', 0),
+    'pkg info': _Spec('info', 1, "Usage: /pkg info [package]"),
+    'pkg scripts': _Spec('list_scripts', 0),
+    'pkg clean': _Spec('clean_cache', 0),
+    'pkg current': _Spec('get_current_pm', 0),
+}
+
+_TEST_COMMANDS = {
+    # Test Execution
+    'test run': _Spec('run_tests', 0, None, (None, None)),
+    'test coverage': _Spec('run_coverage', 0, None, (None,)),
+    'test watch': _Spec('watch_mode', 0, None, (None,)),
+    'test parallel': _Spec('run_parallel', 0, "Usage: /test parallel [workers]", (4,), (int,)),
+
+    # Test Information
+    'test list': _Spec('list_tests', 0),
+    'test report': _Spec('generate_report', 0, None, ('html',)),
+    'test results': _Spec('get_last_results', 0),
+    'test framework': _Spec('get_current_framework', 0),
+
+    # Specific Tests
+    'test file': _Spec('run_specific', 1, "Usage: /test file [path]"),
+}
+
+_WATCH_COMMANDS = {
+    # Watch Management
+    'watch start': _Spec('start', 2, "Usage: /watch start [path] [action]", join_rest=True),
+    'watch stop': _Spec('stop', 1, "Usage: /watch stop [id]"),
+    'watch list': _Spec('list_watchers', 0),
+    'watch logs': _Spec('show_logs', 0, "Usage: /watch logs [limit]", (20,), (int,)),
+    'watch stop-all': _Spec('stop_all', 0),
+    'watch status': _Spec('get_status', 0),
+
+    # Convenience Methods
+    'watch compile': _Spec('watch_compile', 1, "Usage: /watch compile [path] [optional:compiler]", ("auto",)),
+    'watch lint': _Spec('watch_lint', 1, "Usage: /watch lint [path] [optional:linter]", ("auto",)),
+    'watch test': _Spec('watch_test', 1, "Usage: /watch test [path] [optional:test_cmd]", ("auto",)),
+    'watch format': _Spec('watch_format', 1, "Usage: /watch format [path] [optional:formatter]", ("auto",)),
+    'watch reload': _Spec('watch_reload', 1, "Usage: /watch reload [path] [optional:port]", (3000,), (None, int)),
+}
+
+
+def _invoke(fn, spec, converters, args):
+    """Validate ``args`` against ``spec`` and call ``fn`` with the result"""
+    if len(args) < spec.min_args:
+        return spec.usage
+    if spec.join_rest:
+        split = spec.min_args - 1
+        params = [*args[:split], ' '.join(args[split:])]
+    else:
+        supplied = args[:spec.min_args + len(spec.defaults)]
+        params = [*supplied, *spec.defaults[len(supplied) - spec.min_args:]]
+    try:
+        for i, convert in converters:
+            params[i] = convert(params[i])
+    except ValueError:
+        return spec.usage
+    return fn(*params)
+
+
+class _Handlers(dict):
+    """Bound command handlers; a dict subclass so it can be weakly referenced"""
+    __slots__ = ('__weakref__', 'owners')
+
+
+# (table, target, owner) ids -> handlers, shared while any caller holds them.
+# Each entry keeps its target and owner alive, so the ids cannot be reused.
+_BOUND_HANDLERS = weakref.WeakValueDictionary()
+
+
+def _bind(table, target, make_overrides=None, owner=None):
+    """Turn a command table into handlers bound to ``target``'s methods.
+
+    Repeated registrations for the same objects return the same handlers
+    instead of building new partials. ``make_overrides(target, owner)``
+    supplies replacements for methods that need argument adaptation.
+    """
+    key = (id(table), id(target), id(owner))
+    handlers = _BOUND_HANDLERS.get(key)
+    if handlers is None:
+        overrides = make_overrides(target, owner) if make_overrides else {}
+        handlers = _Handlers(
+            (name, partial(_invoke, overrides.get(spec.method) or getattr(target, spec.method), spec,
+                           tuple((i, fn) for i, fn in enumerate(spec.coerce) if fn)))
+            for name, spec in table.items()
+        )
+        handlers.owners = (target, owner)
+        _BOUND_HANDLERS[key] = handlers
+    return MappingProxyType(handlers)
+
+
+def _api_overrides(api, nexus_instance):
+    def save_collection(name):
+        return api.save_collection(name, nexus_instance._http_last_method,
+                                   nexus_instance._http_last_url,
+                                   nexus_instance._http_last_data)
+
+    return {'save_collection': save_collection}
+
+
+def _test_overrides(test, _owner):
+    return {'run_tests': partial(test.run_tests, verbose=True)}
 
 
 def register_api_commands(nexus_instance):
     """Register API client commands with the NexusAI instance"""
-    api = nexus_instance.api_client
-    
-    commands = {
-        # HTTP Methods
-        'http get': lambda args: api.get(args[0], args[1] if len(args) > 1 else None),
-        'http post': lambda args: api.post(args[0], args[1]) if len(args) >= 2 else "Usage: /http post [url] [json_data]",
-        'http put': lambda args: api.put(args[0], args[1]) if len(args) >= 2 else "Usage: /http put [url] [json_data]",
-        'http delete': lambda args: api.delete(args[0]),
-        'http patch': lambda args: api.patch(args[0], args[1]) if len(args) >= 2 else "Usage: /http patch [url] [json_data]",
-        
-        # Configuration
-        'http headers': lambda args: api.set_headers(args[0]) if args else "Usage: /http headers [key:value,...]",
-        'http auth': lambda args: api.set_auth(args[0], args[1]) if len(args) >= 2 else "Usage: /http auth [type] [credentials]",
-        'http reset': lambda args: api.reset(),
-        
-        # Collections
-        'http save': lambda args: api.save_collection(args[0], nexus_instance._http_last_method, 
-                                                       nexus_instance._http_last_url,
-                                                       nexus_instance._http_last_data) if args else "Usage: /http save [name]",
-        'http collection list': lambda args: api.list_collections(),
-        'http collection run': lambda args: api.run_collection(args[0]) if args else "Usage: /http collection run [name]",
-        
-        # Testing
-        'http test': lambda args: api.test_endpoint(args[0], int(args[1]) if len(args) > 1 else 200),
-        'http benchmark': lambda args: api.benchmark(args[0], int(args[1]) if len(args) > 1 else 10),
-        
-        # History
-        'http history': lambda args: api.show_history(),
-        'http clear': lambda args: api.clear_history(),
-    }
-    
-    return commands
+    return _bind(_API_COMMANDS, nexus_instance.api_client, _api_overrides, nexus_instance)
 
 
 def register_db_commands(nexus_instance):
     """Register database commands with the NexusAI instance"""
-    db = nexus_instance.database_manager
-    
-    commands = {
-        # Connection Management
-        'db connect': lambda args: db.connect(args[0], args[1], args[2] if len(args) > 2 else "default") if len(args) >= 2 else 
-                     "Usage: /db connect [type] [connection_string] [optional:name]\n   Types: sqlite, postgresql, mysql, mongodb",
-        'db list': lambda args: db.list_connections(),
-        'db close': lambda args: db.close(args[0] if args else None),
-        
-        # Query Operations
-        'db query': lambda args: db.query(' '.join(args)) if args else "Usage: /db query [SQL]",
-        'db tables': lambda args: db.show_tables(),
-        'db schema': lambda args: db.describe_table(args[0]) if args else "Usage: /db schema [table_name]",
-        
-        # Backup & Restore
-        'db backup': lambda args: db.backup(args[0]) if args else "Usage: /db backup [output_path]",
-        'db stats': lambda args: db.stats(),
-        'db script': lambda args: db.execute_script(args[0]) if args else "Usage: /db script [file_path]",
-    }
-    
-    return commands
+    return _bind(_DB_COMMANDS, nexus_instance.database_manager)
 
 
 def register_pkg_commands(nexus_instance):
     """Register package manager commands with the NexusAI instance"""
-    pkg = nexus_instance.package_manager
-    
-    commands = {
-        # Package Operations
-        'pkg search': lambda args: pkg.search(args[0], args[1] if len(args) > 1 else None) if args else "Usage: /pkg search [package]",
-        'pkg install': lambda args: pkg.install(args[0], args[1] if len(args) > 1 else None) if args else "Usage: /pkg install [package] [optional:pm]",
-        'pkg uninstall': lambda args: pkg.uninstall(args[0], args[1] if len(args) > 1 else None) if args else "Usage: /pkg uninstall [package]",
-        'pkg update': lambda args: pkg.update(args[0] if args else None),
-        
-        # Information
-        'pkg outdated': lambda args: pkg.list_outdated(),
-        'pkg audit': lambda args: pkg.audit(),
-        'pkg info': lambda args: pkg.info(args[0]) if args else "Usage: /pkg info [package]",
-        'pkg scripts': lambda args: pkg.list_scripts(),
-        'pkg clean': lambda args: pkg.clean_cache(),
-        'pkg current': lambda args: pkg.get_current_pm(),
-    }
-    
-    return commands
+    return _bind(_PKG_COMMANDS, nexus_instance.package_manager)
 
 
 def register_test_commands(nexus_instance):
     """Register testing commands with the NexusAI instance"""
-    test = nexus_instance.test_runner
-    
-    commands = {
-        # Test Execution
-        'test run': lambda args: test.run_tests(args[0] if args else None, args[1] if len(args) > 1 else None, verbose=True),
-        'test coverage': lambda args: test.run_coverage(args[0] if args else None),
-        'test watch': lambda args: test.watch_mode(args[0] if args else None),
-        'test parallel': lambda args: test.run_parallel(int(args[0]) if args else 4),
-        
-        # Test Information
-        'test list': lambda args: test.list_tests(),
-        'test report': lambda args: test.generate_report(args[0] if args else 'html'),
-        'test results': lambda args: test.get_last_results(),
-        'test framework': lambda args: test.get_current_framework(),
-        
-        # Specific Tests
-        'test file': lambda args: test.run_specific(args[0]) if args else "Usage: /test file [path]",
-    }
-    
-    return commands
+    return _bind(_TEST_COMMANDS, nexus_instance.test_runner, _test_overrides)
 
 
 def register_watch_commands(nexus_instance):
     """Register file watcher commands with the NexusAI instance"""
-    watch = nexus_instance.file_watcher
-    
-    commands = {
-        # Watch Management
-        'watch start': lambda args: watch.start(args[0], ' '.join(args[1:])) if len(args) >= 2 else 
-                      "Usage: /watch start [path] [action]",
-        'watch stop': lambda args: watch.stop(args[0]) if args else "Usage: /watch stop [id]",
-        'watch list': lambda args: watch.list_watchers(),
-        'watch logs': lambda args: watch.show_logs(int(args[0]) if args else 20),
-        'watch stop-all': lambda args: watch.stop_all(),
-        'watch status': lambda args: watch.get_status(),
-        
-        # Convenience Methods
-        'watch compile': lambda args: watch.watch_compile(args[0], args[1] if len(args) > 1 else "auto") if args else 
-                        "Usage: /watch compile [path] [optional:compiler]",
-        'watch lint': lambda args: watch.watch_lint(args[0], args[1] if len(args) > 1 else "auto") if args else 
-                     "Usage: /watch lint [path] [optional:linter]",
-        'watch test': lambda args: watch.watch_test(args[0], args[1] if len(args) > 1 else "auto") if args else 
-                     "Usage: /watch test [path] [optional:test_cmd]",
-        'watch format': lambda args: watch.watch_format(args[0], args[1] if len(args) > 1 else "auto") if args else 
-                       "Usage: /watch format [path] [optional:formatter]",
-        'watch reload': lambda args: watch.watch_reload(args[0], int(args[1]) if len(args) > 1 else 3000) if args else 
-                       "Usage: /watch reload [path] [optional:port]",
-    }
-    
-    return commands
+    return _bind(_WATCH_COMMANDS, nexus_instance.file_watcher)
 
 
 def get_all_high_priority_commands(nexus_instance):
-    """Get all high-priority command handlers"""
-    all_commands = {}
-    
+    """Get all high-priority command handlers.
+
+    Returns a ``ChainMap`` over the per-group handler tables, so lookups
+    work like a dict without copying every handler into a new one.
+    """
     # Only register if modules are available
-    if nexus_instance.api_client:
-        all_commands.update(register_api_commands(nexus_instance))
-    
-    if nexus_instance.database_manager:
-        all_commands.update(register_db_commands(nexus_instance))
-    
-    if nexus_instance.package_manager:
-        all_commands.update(register_pkg_commands(nexus_instance))
-    
-    if nexus_instance.test_runner:
-        all_commands.update(register_test_commands(nexus_instance))
-    
-    if nexus_instance.file_watcher:
-        all_commands.update(register_watch_commands(nexus_instance))
-    
-    return all_commands
+    registrations = (
+        (nexus_instance.api_client, register_api_commands),
+        (nexus_instance.database_manager, register_db_commands),
+        (nexus_instance.package_manager, register_pkg_commands),
+        (nexus_instance.test_runner, register_test_commands),
+        (nexus_instance.file_watcher, register_watch_commands),
+    )
+    return ChainMap(*(register(nexus_instance) for manager, register in registrations if manager))
+
 
+@lru_cache(maxsize=1)
+def get_high_priority_help_text() -> "Text":
+    """Get help text for high-priority features.
 
-def get_high_priority_help_text() -> str:
-    """Get help text for high-priority features"""
+    The text is static, so it is built once and the same ``Text`` instance is
+    returned on every call; callers must treat it as read-only.
+    """
+    # Imported here so registering commands does not pull in rich
+    from rich.style import Style
     from rich.text import Text
-    
+
+    # Parse each style once instead of on every append
+    title = Style.parse("bold magenta")
+    heading = Style.parse("bold yellow")
+    entry = Style.parse("white")
+
     help_text = Text()
     
-    help_text.append("\n🚀 HIGH-PRIORITY FEATURES:\n\n", style="bold magenta")
+    help_text.append("\n🚀 HIGH-PRIORITY FEATURES:\n\n", style=title)
     
     # API Testing
-    help_text.append("🌐 API TESTING & REQUESTS:\n", style="bold yellow")
-    help_text.append("/http get [url]                       - Make GET request\n", style="white")
-    help_text.append("/http post [url] [json]               - Make POST request\n", style="white")
-    help_text.append("/http put [url] [json]                - Make PUT request\n", style="white")
-    help_text.append("/http delete [url]                    - Make DELETE request\n", style="white")
-    help_text.append("/http headers [key:value,...]         - Set custom headers\n", style="white")
-    help_text.append("/http auth [type] [credentials]       - Set authentication\n", style="white")
-    help_text.append("/http save [name]                     - Save request to collection\n", style="white")
-    help_text.append("/http collection list                 - List saved collections\n", style="white")
-    help_text.append("/http collection run [name]           - Run saved request\n", style="white")
-    help_text.append("/http test [url] [expected_status]    - Test API endpoint\n", style="white")
-    help_text.append("/http benchmark [url] [requests]      - Benchmark API performance\n", style="white")
-    help_text.append("/http history                         - Show request history\n\n", style="white")
+    help_text.append("🌐 API TESTING & REQUESTS:\n", style=heading)
+    help_text.append("/http get [url]                       - Make GET request\n", style=entry)
+    help_text.append("/http post [url] [json]               - Make POST request\n", style=entry)
+    help_text.append("/http put [url] [json]                - Make PUT request\n", style=entry)
+    help_text.append("/http delete [url]                    - Make DELETE request\n", style=entry)
+    help_text.append("/http headers [key:value,...]         - Set custom headers\n", style=entry)
+    help_text.append("/http auth [type] [credentials]       - Set authentication\n", style=entry)
+    help_text.append("/http save [name]                     - Save request to collection\n", style=entry)
+    help_text.append("/http collection list                 - List saved collections\n", style=entry)
+    help_text.append("/http collection run [name]           - Run saved request\n", style=entry)
+    help_text.append("/http test [url] [expected_status]    - Test API endpoint\n", style=entry)
+    help_text.append("/http benchmark [url] [requests]      - Benchmark API performance\n", style=entry)
+    help_text.append("/http history                         - Show request history\n\n", style=entry)
     
     # Database Management
-    help_text.append("🗄️ DATABASE MANAGEMENT:\n", style="bold yellow")
-    help_text.append("/db connect [type] [conn_str] [name]  - Connect to database\n", style="white")
-    help_text.append("/db list                              - List connections\n", style="white")
-    help_text.append("/db query [SQL]                       - Execute SQL query\n", style="white")
-    help_text.append("/db tables                            - List all tables\n", style="white")
-    help_text.append("/db schema [table]                    - Show table schema\n", style="white")
-    help_text.append("/db backup [path]                     - Backup database\n", style="white")
-    help_text.append("/db stats                             - Database statistics\n", style="white")
-    help_text.append("/db script [file]                     - Execute SQL script\n", style="white")
-    help_text.append("/db close [name]                      - Close connection\n\n", style="white")
+    help_text.append("🗄️ DATABASE MANAGEMENT:\n", style=heading)
+    help_text.append("/db connect [type] [conn_str] [name]  - Connect to database\n", style=entry)
+    help_text.append("/db list                              - List connections\n", style=entry)
+    help_text.append("/db query [SQL]                       - Execute SQL query\n", style=entry)
+    help_text.append("/db tables                            - List all tables\n", style=entry)
+    help_text.append("/db schema [table]                    - Show table schema\n", style=entry)
+    help_text.append("/db backup [path]                     - Backup database\n", style=entry)
+    help_text.append("/db stats                             - Database statistics\n", style=entry)
+    help_text.append("/db script [file]                     - Execute SQL script\n", style=entry)
+    help_text.append("/db close [name]                      - Close connection\n\n", style=entry)
     
     # Package Manager
-    help_text.append("📦 PACKAGE MANAGER:\n", style="bold yellow")
-    help_text.append("/pkg search [package]                 - Search for packages\n", style="white")
-    help_text.append("/pkg install [package]                - Install package\n", style="white")
-    help_text.append("/pkg uninstall [package]              - Uninstall package\n", style="white")
-    help_text.append("/pkg update [package]                 - Update package(s)\n", style="white")
-    help_text.append("/pkg outdated                         - List outdated packages\n", style="white")
-    help_text.append("/pkg audit                            - Security audit\n", style="white")
-    help_text.append("/pkg info [package]                   - Package information\n", style="white")
-    help_text.append("/pkg scripts                          - List available scripts\n", style="white")
-    help_text.append("/pkg clean                            - Clean package cache\n\n", style="white")
+    help_text.append("📦 PACKAGE MANAGER:\n", style=heading)
+    help_text.append("/pkg search [package]                 - Search for packages\n", style=entry)
+    help_text.append("/pkg install [package]                - Install package\n", style=entry)
+    help_text.append("/pkg uninstall [package]              - Uninstall package\n", style=entry)
+    help_text.append("/pkg update [package]                 - Update package(s)\n", style=entry)
+    help_text.append("/pkg outdated                         - List outdated packages\n", style=entry)
+    help_text.append("/pkg audit                            - Security audit\n", style=entry)
+    help_text.append("/pkg info [package]                   - Package information\n", style=entry)
+    help_text.append("/pkg scripts                          - List available scripts\n", style=entry)
+    help_text.append("/pkg clean                            - Clean package cache\n\n", style=entry)
     
     # Test Runner
-    help_text.append("🧪 TEST AUTOMATION:\n", style="bold yellow")
-    help_text.append("/test run [pattern]                   - Run tests\n", style="white")
-    help_text.append("/test coverage                        - Run with coverage\n", style="white")
-    help_text.append("/test watch                           - Watch mode testing\n", style="white")
-    help_text.append("/test parallel [workers]              - Run tests in parallel\n", style="white")
-    help_text.append("/test list                            - List all tests\n", style="white")
-    help_text.append("/test report [format]                 - Generate test report\n", style="white")
-    help_text.append("/test file [path]                     - Run specific test\n\n", style="white")
+    help_text.append("🧪 TEST AUTOMATION:\n", style=heading)
+    help_text.append("/test run [pattern]                   - Run tests\n", style=entry)
+    help_text.append("/test coverage                        - Run with coverage\n", style=entry)
+    help_text.append("/test watch                           - Watch mode testing\n", style=entry)
+    help_text.append("/test parallel [workers]              - Run tests in parallel\n", style=entry)
+    help_text.append("/test list                            - List all tests\n", style=entry)
+    help_text.append("/test report [format]                 - Generate test report\n", style=entry)
+    help_text.append("/test file [path]                     - Run specific test\n\n", style=entry)
     
     # File Watcher
-    help_text.append("👁️ FILE WATCHER:\n", style="bold yellow")
-    help_text.append("/watch start [path] [action]          - Start watching path\n", style="white")
-    help_text.append("/watch stop [id]                      - Stop watcher\n", style="white")
-    help_text.append("/watch list                           - List active watchers\n", style="white")
-    help_text.append("/watch compile [path]                 - Auto-compile on change\n", style="white")
-    help_text.append("/watch lint [path]                    - Auto-lint on change\n", style="white")
-    help_text.append("/watch test [path]                    - Auto-test on change\n", style="white")
-    help_text.append("/watch format [path]                  - Auto-format on change\n", style="white")
-    help_text.append("/watch reload [path]                  - Auto-reload browser\n", style="white")
-    help_text.append("/watch logs                           - Show watch logs\n\n", style="white")
+    help_text.append("👁️ FILE WATCHER:\n", style=heading)
+    help_text.append("/watch start [path] [action]          - Start watching path\n", style=entry)
+    help_text.append("/watch stop [id]                      - Stop watcher\n", style=entry)
+    help_text.append("/watch list                           - List active watchers\n", style=entry)
+    help_text.append("/watch compile [path]                 - Auto-compile on change\n", style=entry)
+    help_text.append("/watch lint [path]                    - Auto-lint on change\n", style=entry)
+    help_text.append("/watch test [path]                    - Auto-test on change\n", style=entry)
+    help_text.append("/watch format [path]                  - Auto-format on change\n", style=entry)
+    help_text.append("/watch reload [path]                  - Auto-reload browser\n", style=entry)
+    help_text.append("/watch logs                           - Show watch logs\n\n", style=entry)
     
     return help_text
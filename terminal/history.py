@@ -1,53 +1,109 @@
 import json
 import os
-from datetime import datetime
+import time
 from typing import List, Dict, Any
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Reusable msgspec codec; decoding stays untyped so sessions load as dicts
+if msgspec is not None:
+    _encoder = msgspec.json.Encoder()
+    _decoder = msgspec.json.Decoder()
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON, using msgspec or orjson when installed."""
+    if msgspec is not None:
+        return _encoder.encode(obj)
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes written by ``_dumps`` (or older pretty-printed files)."""
+    if msgspec is not None:
+        return _decoder.decode(data)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _new_timestamp() -> str:
+    """Return a nanosecond timestamp, unique even for saves within one second."""
+    return str(time.time_ns())
+
+
 class HistoryManager:
     def __init__(self, base_dir: str = None):
         if base_dir is None:
             base_dir = os.path.join(os.path.expanduser("~"), ".nexus", "history")
         self.base_dir = base_dir
         os.makedirs(self.base_dir, exist_ok=True)
+        # username -> (directory mtime_ns, sorted session filenames)
+        self._sessions_cache: Dict[str, tuple] = {}
 
     def save_session(self, username: str, messages: List[Dict[str, str]]) -> str:
         """Save the current chat session to a JSON file."""
         if not messages:
             return None
             
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = _new_timestamp()
         filename = f"{username}_{timestamp}.json"
         filepath = os.path.join(self.base_dir, filename)
         
-        data = {
-            "username": username,
-            "timestamp": timestamp,
-            "messages": messages
-        }
-        
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(filepath, "wb") as f:
+                # Written field by field so no wrapper dict is built around messages
+                f.write(b'{"username":' + _dumps(username))
+                f.write(b',"timestamp":' + _dumps(timestamp))
+                f.write(b',"messages":')
+                f.write(_dumps(messages))
+                f.write(b"}")
+            # The directory mtime may not tick on coarse-grained filesystems
+            self._sessions_cache.clear()
             return filepath
         except Exception as e:
             print(f"Error saving history: {e}")
             return None
 
     def list_sessions(self, username: str) -> List[str]:
-        """List available session files for a user."""
+        """List available session files for a user.
+
+        Sessions are ordered newest first by file mtime. The listing is cached
+        per user and only rebuilt when the history directory's mtime changes.
+        """
         try:
-            files = [f for f in os.listdir(self.base_dir) if f.startswith(username) and f.endswith(".json")]
-            return sorted(files, reverse=True)
+            mtime = os.stat(self.base_dir).st_mtime_ns
+            cached = self._sessions_cache.get(username)
+            if cached is None or cached[0] != mtime:
+                prefix = f"{username}_"
+                with os.scandir(self.base_dir) as it:
+                    entries = [
+                        (e.stat().st_mtime_ns, e.name) for e in it
+                        if e.name.startswith(prefix) and e.name.endswith(".json")
+                    ]
+                entries.sort(reverse=True)
+                cached = (mtime, [name for _, name in entries])
+                self._sessions_cache[username] = cached
+            return list(cached[1])
         except Exception:
             return []
 
     def load_session(self, filename: str) -> Dict[str, Any]:
         """Load a specific session."""
         filepath = os.path.join(self.base_dir, filename)
-        if not os.path.exists(filepath):
-            return None
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(filepath, "rb") as f:
+                return _loads(f.read())
         except Exception:
+            # Missing or unreadable sessions both load as None
             return None
@@ -5,17 +5,161 @@ Connect and manage external services and APIs
 
 import os
 import json
+import asyncio
+import atexit
 import time
 import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime
 import hashlib
-import hmac
 import base64
-from urllib.parse import urlencode, quote
-import subprocess
+import ipaddress
+from collections import ChainMap, defaultdict
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 import re
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(data: bytes) -> Any:
+    """Decode a JSON payload, using orjson when it is installed"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+# Longest Retry-After we are willing to sleep for in an interactive command
+_MAX_RETRY_AFTER = 30.0
+
+
+def _retry_after_seconds(response: requests.Response) -> float:
+    """Parse a 429 response's Retry-After header (seconds or HTTP date)"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return 1.0
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            delay = 1.0
+    return min(max(delay, 0.0), _MAX_RETRY_AFTER)
+
+
+_STATUS_ICONS = {"connected": "🟢", "failed": "🔴", "unknown": "⚪"}
+_EVENT_CLEAN_RE = re.compile(r"[^a-zA-Z0-9_\-]")
+_BLOCKED_WEBHOOK_HOSTS = frozenset({"localhost", "metadata.google.internal"})
+
+
+def _is_private_host(host: str) -> bool:
+    """Return True for hosts a webhook must not target (loopback, private, link-local...)"""
+    host = host.lower().rstrip('.')
+    if host in _BLOCKED_WEBHOOK_HOSTS or host.endswith('.localhost'):
+        return True
+    try:
+        ip = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved or ip.is_unspecified
+
+
+# Service catalogue shared by every hub; exposed read-only
+_SUPPORTED_SERVICES = {
+    "github": {
+        "name": "GitHub",
+        "description": "Version control and collaboration platform",
+        "auth_type": "token",
+        "base_url": "https://api.github.com",
+        "features": ["repos", "issues", "pull_requests", "webhooks"]
+    },
+    "slack": {
+        "name": "Slack",
+        "description": "Team communication platform",
+        "auth_type": "token",
+        "base_url": "https://slack.com/api",
+        "features": ["messages", "channels", "users", "webhooks"]
+    },
+    "discord": {
+        "name": "Discord",
+        "description": "Gaming and community platform",
+        "auth_type": "bot_token",
+        "base_url": "https://discord.com/api",
+        "features": ["messages", "channels", "users", "webhooks"]
+    },
+    "trello": {
+        "name": "Trello",
+        "description": "Project management tool",
+        "auth_type": "token",
+        "base_url": "https://api.trello.com/1",
+        "features": ["boards", "cards", "lists", "webhooks"]
+    },
+    "jira": {
+        "name": "Jira",
+        "description": "Issue tracking and project management",
+        "auth_type": "basic",
+        "base_url": "https://api.atlassian.com",
+        "features": ["issues", "projects", "users", "webhooks"]
+    },
+    "notion": {
+        "name": "Notion",
+        "description": "All-in-one workspace",
+        "auth_type": "token",
+        "base_url": "https://api.notion.com/v1",
+        "features": ["pages", "databases", "users", "webhooks"]
+    },
+    "linear": {
+        "name": "Linear",
+        "description": "Issue tracking for software teams",
+        "auth_type": "token",
+        "base_url": "https://api.linear.app/graphql",
+        "features": ["issues", "projects", "teams", "webhooks"]
+    },
+    "figma": {
+        "name": "Figma",
+        "description": "Design and prototyping tool",
+        "auth_type": "token",
+        "base_url": "https://api.figma.com/v1",
+        "features": ["files", "projects", "teams", "comments"]
+    },
+    "stripe": {
+        "name": "Stripe",
+        "description": "Payment processing platform",
+        "auth_type": "secret_key",
+        "base_url": "https://api.stripe.com/v1",
+        "features": ["payments", "customers", "subscriptions", "webhooks"]
+    },
+    "twilio": {
+        "name": "Twilio",
+        "description": "Communication APIs (SMS, Voice, Email)",
+        "auth_type": "api_key",
+        "base_url": "https://api.twilio.com",
+        "features": ["sms", "calls", "emails", "webhooks"]
+    }
+}
+# Frozen all the way down: nested templates are proxies and feature lists tuples
+SUPPORTED_SERVICES = MappingProxyType({
+    name: MappingProxyType({**template, 'features': tuple(template['features'])})
+    for name, template in _SUPPORTED_SERVICES.items()
+})
+
+# One exit hook flushes whichever hubs are still alive; the set doesn't keep them so
+_live_hubs = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_hubs():
+    for hub in list(_live_hubs):
+        hub.flush()
+
 
 class IntegrationHub:
     """Central hub for managing external service integrations"""
@@ -26,120 +170,137 @@ class IntegrationHub:
         self.webhooks = {}
         self.api_keys = {}
         self.connection_status = {}
+        self._status_lock = threading.Lock()
+        # Maintained on every change so get_integration_stats never scans
+        self._status_counts = {'connected': 0, 'failed': 0}
+        self._active_webhook_count = 0
+        # Saves are coalesced: changes mark the hub dirty and a timer writes once
+        self._save_lock = threading.Lock()
+        # Serialises whole writes so the timer and an exit flush can't share the temp file
+        self._write_lock = threading.Lock()
+        self._save_delay = 1.0
+        self._save_timer = None
+        self._dirty = False
+        _live_hubs.add(self)
+
+        # Per-service handlers, looked up by name instead of an if/elif chain
+        self._test_dispatch = {
+            "github": self._test_github_connection,
+            "slack": self._test_slack_connection,
+            "discord": self._test_discord_connection,
+            "trello": self._test_trello_connection,
+            "jira": self._test_jira_connection,
+            "notion": self._test_notion_connection,
+        }
+        self._action_dispatch = {
+            "github": self._execute_github_action,
+            "slack": self._execute_slack_action,
+            "discord": self._execute_discord_action,
+        }
+        # Pooled keep-alive sessions, one per configured service
+        self._sessions: Dict[str, requests.Session] = {}
+        # (service, credentials digest) -> (checked_at, message) for successful tests
+        self._auth_cache: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        self._auth_ttl = 300
+        # Rate limiting: per-host Retry-After deadline, and a lock so a throttled
+        # host only sees one request in flight until it recovers
+        self._host_retry_after: Dict[str, float] = {}
+        self._host_locks = defaultdict(threading.Lock)
         self.load_integrations()
 
-        # Supported services
-        self.supported_services = {
-            "github": {
-                "name": "GitHub",
-                "description": "Version control and collaboration platform",
-                "auth_type": "token",
-                "base_url": "https://api.github.com",
-                "features": ["repos", "issues", "pull_requests", "webhooks"]
-            },
-            "slack": {
-                "name": "Slack",
-                "description": "Team communication platform",
-                "auth_type": "token",
-                "base_url": "https://slack.com/api",
-                "features": ["messages", "channels", "users", "webhooks"]
-            },
-            "discord": {
-                "name": "Discord",
-                "description": "Gaming and community platform",
-                "auth_type": "bot_token",
-                "base_url": "https://discord.com/api",
-                "features": ["messages", "channels", "users", "webhooks"]
-            },
-            "trello": {
-                "name": "Trello",
-                "description": "Project management tool",
-                "auth_type": "token",
-                "base_url": "https://api.trello.com/1",
-                "features": ["boards", "cards", "lists", "webhooks"]
-            },
-            "jira": {
-                "name": "Jira",
-                "description": "Issue tracking and project management",
-                "auth_type": "basic",
-                "base_url": "https://api.atlassian.com",
-                "features": ["issues", "projects", "users", "webhooks"]
-            },
-            "notion": {
-                "name": "Notion",
-                "description": "All-in-one workspace",
-                "auth_type": "token",
-                "base_url": "https://api.notion.com/v1",
-                "features": ["pages", "databases", "users", "webhooks"]
-            },
-            "linear": {
-                "name": "Linear",
-                "description": "Issue tracking for software teams",
-                "auth_type": "token",
-                "base_url": "https://api.linear.app/graphql",
-                "features": ["issues", "projects", "teams", "webhooks"]
-            },
-            "figma": {
-                "name": "Figma",
-                "description": "Design and prototyping tool",
-                "auth_type": "token",
-                "base_url": "https://api.figma.com/v1",
-                "features": ["files", "projects", "teams", "comments"]
-            },
-            "stripe": {
-                "name": "Stripe",
-                "description": "Payment processing platform",
-                "auth_type": "secret_key",
-                "base_url": "https://api.stripe.com/v1",
-                "features": ["payments", "customers", "subscriptions", "webhooks"]
-            },
-            "twilio": {
-                "name": "Twilio",
-                "description": "Communication APIs (SMS, Voice, Email)",
-                "auth_type": "api_key",
-                "base_url": "https://api.twilio.com",
-                "features": ["sms", "calls", "emails", "webhooks"]
-            }
-        }
+        # Supported services (shared, read-only)
+        self.supported_services = SUPPORTED_SERVICES
 
     def load_integrations(self):
         """Load saved integrations from file"""
         try:
             if os.path.exists(self.integrations_file):
-                with open(self.integrations_file, 'r') as f:
-                    data = json.load(f)
+                with open(self.integrations_file, 'rb') as f:
+                    data = _json_loads(f.read())
                     self.services = data.get('services', {})
+                    for name, service in self.services.items():
+                        service['_headers'] = self._auth_headers(name, service)
                     self.webhooks = data.get('webhooks', {})
+                    self._active_webhook_count = sum(1 for w in self.webhooks.values() if w.get('active', False))
                     self.api_keys = data.get('api_keys', {})
         except Exception as e:
             print(f"Warning: Could not load integrations: {e}")
 
     def save_integrations(self):
-        """Save integrations to file"""
+        """Save integrations to file.
+
+        The file is written to a temporary path and swapped in with
+        ``os.replace`` so a crash mid-write never leaves it truncated.
+        """
         try:
-            data = {
-                'services': self.services,
-                'webhooks': self.webhooks,
-                'api_keys': self.api_keys
-            }
-            with open(self.integrations_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            with self._write_lock:
+                # Shallow copies so a concurrent add/remove can't change the dicts mid-encode
+                data = {
+                    'services': self._persistable_services(),
+                    'webhooks': dict(self.webhooks),
+                    'api_keys': dict(self.api_keys)
+                }
+                if orjson is not None:
+                    blob = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
+                else:
+                    blob = json.dumps(data, indent=2, sort_keys=True).encode('utf-8')
+                tmp_path = f"{self.integrations_file}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(blob)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.integrations_file)
         except Exception as e:
             return f"❌ Error saving integrations: {e}"
         return "✅ Integrations saved successfully"
 
+    def _persistable_services(self) -> Dict[str, Dict]:
+        """Copy of the service configs without runtime-only fields such as '_headers'"""
+        return {name: {k: v for k, v in service.items() if not k.startswith('_')}
+                for name, service in list(self.services.items())}
+
+    def _mark_dirty(self):
+        """Schedule a save; a burst of changes within the delay is written once"""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self._save_delay, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self) -> Optional[str]:
+        """Write any pending changes to disk immediately"""
+        with self._save_lock:
+            timer, self._save_timer = self._save_timer, None
+            dirty, self._dirty = self._dirty, False
+        if timer is not None:
+            timer.cancel()
+        if not dirty:
+            return None
+        result = self.save_integrations()
+        if result.startswith("❌"):
+            self._mark_dirty()
+        return result
+
     def add_service(self, service_name: str, config: Dict) -> str:
         """Add a new service integration"""
         if service_name not in self.supported_services:
             return f"❌ Service '{service_name}' not supported. Available: {', '.join(self.supported_services.keys())}"
 
-        service_config = self.supported_services[service_name].copy()
-        service_config.update(config)
-        service_config['added_at'] = datetime.now().isoformat()
-        service_config['status'] = 'configured'
+        # Later maps are defaults: metadata overrides user config overrides the template
+        service_config = dict(ChainMap(
+            {'added_at': datetime.now().isoformat(), 'status': 'configured'},
+            config,
+            self.supported_services[service_name],
+        ))
+        # Each service owns its containers; none are shared with the template
+        service_config['features'] = list(service_config.get('features', ()))
+        service_config['_headers'] = self._auth_headers(service_name, service_config)
 
         self.services[service_name] = service_config
-        self.save_integrations()
+        self._close_session(service_name)
+        self.invalidate_auth_cache(service_name)
+        self._mark_dirty()
 
         return f"✅ Service '{service_name}' added successfully"
 
@@ -149,12 +310,120 @@ class IntegrationHub:
             return f"❌ Service '{service_name}' not found"
 
         del self.services[service_name]
+        self._close_session(service_name)
+        self.invalidate_auth_cache(service_name)
         if service_name in self.api_keys:
             del self.api_keys[service_name]
 
-        self.save_integrations()
+        self._mark_dirty()
         return f"✅ Service '{service_name}' removed successfully"
 
+    def _auth_headers(self, service_name: str, service: Dict) -> Dict[str, str]:
+        """Build the authentication headers a service expects.
+
+        Called once when a service is added or loaded; the result is kept on
+        the service config as ``_headers``.
+        """
+        token = service.get('token')
+        if service_name == "github":
+            return {'Authorization': f'token {token}', 'Accept': 'application/vnd.github.v3+json'}
+        if service_name == "slack":
+            return {'Authorization': f'Bearer {token}'}
+        if service_name == "discord":
+            return {'Authorization': f'Bot {token}'}
+        if service_name == "notion":
+            return {'Authorization': f'Bearer {token}', 'Notion-Version': '2022-06-28'}
+        if service_name == "jira":
+            auth = base64.b64encode(f"{service.get('email')}:{service.get('api_token')}".encode()).decode()
+            return {'Authorization': f'Basic {auth}'}
+        return {}
+
+    def _get_session(self, service_name: str) -> requests.Session:
+        """Return the keep-alive session for a service, creating it on first use"""
+        session = self._sessions.get(service_name)
+        if session is None:
+            session = requests.Session()
+            # 429 is handled per host by _request so Retry-After is honoured across threads
+            retry = Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504],
+                          raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retry)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update(self.services.get(service_name, {}).get('_headers', {}))
+            self._sessions[service_name] = session
+        return session
+
+    def _request(self, service_name: str, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the service's session, honouring 429 Retry-After.
+
+        After a 429 the host's deadline is recorded; requests to that host then
+        wait it out and go through one at a time, and the throttled request is
+        retried once.
+        """
+        session = self._get_session(service_name)
+        host = urlsplit(url).hostname or ''
+        for attempt in range(2):
+            if self._host_retry_after.get(host, 0.0) > time.monotonic():
+                with self._host_locks[host]:
+                    delay = self._host_retry_after.get(host, 0.0) - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    response = session.request(method, url, **kwargs)
+            else:
+                response = session.request(method, url, **kwargs)
+            if response.status_code != 429 or attempt:
+                return response
+            self._host_retry_after[host] = time.monotonic() + _retry_after_seconds(response)
+        return response
+
+    def _close_session(self, service_name: str):
+        """Drop a service's session, e.g. after its credentials change"""
+        session = self._sessions.pop(service_name, None)
+        if session is not None:
+            session.close()
+
+    def close(self):
+        """Flush pending changes and close all pooled HTTP sessions"""
+        self.flush()
+        for service_name in list(self._sessions):
+            self._close_session(service_name)
+
+    def _set_status(self, service_name: str, status: str):
+        """Record a connection status; safe to call from worker threads"""
+        with self._status_lock:
+            previous = self.connection_status.get(service_name)
+            if previous in self._status_counts:
+                self._status_counts[previous] -= 1
+            if status in self._status_counts:
+                self._status_counts[status] += 1
+            self.connection_status[service_name] = status
+
+    def test_all_connections(self) -> Dict[str, str]:
+        """Test every configured service concurrently.
+
+        Each test is an independent network round-trip, so the total time is
+        roughly that of the slowest service rather than the sum of all.
+        """
+        if not self.services:
+            return {}
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(16, len(self.services))) as executor:
+            futures = {executor.submit(self.test_connection, name): name for name in self.services}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results
+
+    async def atest_connection(self, service_name: str) -> str:
+        """Awaitable ``test_connection`` for event-loop callers such as the TUI"""
+        return await asyncio.to_thread(self.test_connection, service_name)
+
+    async def atest_all_connections(self) -> Dict[str, str]:
+        """Test every configured service concurrently without blocking the event loop"""
+        names = list(self.services)
+        results = await asyncio.gather(*(self.atest_connection(name) for name in names))
+        return dict(zip(names, results))
+
     def test_connection(self, service_name: str) -> str:
         """Test connection to a service"""
         if service_name not in self.services:
@@ -162,45 +431,54 @@ class IntegrationHub:
 
         service = self.services[service_name]
 
-        try:
-            if service_name == "github":
-                return self._test_github_connection(service)
-            elif service_name == "slack":
-                return self._test_slack_connection(service)
-            elif service_name == "discord":
-                return self._test_discord_connection(service)
-            elif service_name == "trello":
-                return self._test_trello_connection(service)
-            elif service_name == "jira":
-                return self._test_jira_connection(service)
-            elif service_name == "notion":
-                return self._test_notion_connection(service)
-            else:
-                return f"⚠️ Connection test not implemented for {service_name}"
+        # Identity endpoints rarely change; reuse a recent success for the same credentials
+        cache_key = (service_name, self._credentials_digest(service))
+        cached = self._auth_cache.get(cache_key)
+        if cached and time.time() - cached[0] < self._auth_ttl:
+            return cached[1]
+
+        test = self._test_dispatch.get(service_name)
+        if test is None:
+            return f"⚠️ Connection test not implemented for {service_name}"
 
+        try:
+            result = test(service)
         except Exception as e:
-            self.connection_status[service_name] = 'failed'
+            self._set_status(service_name, 'failed')
             return f"❌ Connection failed: {str(e)}"
 
+        if result.startswith("✅"):
+            self._auth_cache[cache_key] = (time.time(), result)
+        return result
+
+    @staticmethod
+    def _credentials_digest(service: Dict) -> str:
+        """Hash the credential fields so cached results never outlive a key change"""
+        creds = "\0".join(str(service.get(k, '')) for k in ('token', 'api_key', 'api_token', 'email', 'domain'))
+        return hashlib.sha256(creds.encode()).hexdigest()
+
+    def invalidate_auth_cache(self, service_name: Optional[str] = None):
+        """Forget cached connection test results for one service, or all"""
+        if service_name is None:
+            self._auth_cache.clear()
+            return
+        for key in [k for k in self._auth_cache if k[0] == service_name]:
+            del self._auth_cache[key]
+
     def _test_github_connection(self, service: Dict) -> str:
         """Test GitHub API connection"""
         token = service.get('token')
         if not token:
             return "❌ GitHub token not configured"
 
-        headers = {
-            'Authorization': f'token {token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-
-        response = requests.get('https://api.github.com/user', headers=headers, timeout=10)
+        response = self._request('github', 'GET', 'https://api.github.com/user', timeout=10)
 
         if response.status_code == 200:
-            user_data = response.json()
-            self.connection_status['github'] = 'connected'
+            user_data = _json_loads(response.content)
+            self._set_status('github', 'connected')
             return f"✅ GitHub connected as {user_data.get('login', 'unknown user')}"
         else:
-            self.connection_status['github'] = 'failed'
+            self._set_status('github', 'failed')
             return f"❌ GitHub connection failed: {response.status_code}"
 
     def _test_slack_connection(self, service: Dict) -> str:
@@ -209,18 +487,18 @@ class IntegrationHub:
         if not token:
             return "❌ Slack token not configured"
 
-        headers = {'Authorization': f'Bearer {token}'}
-        response = requests.post('https://slack.com/api/auth.test', headers=headers, timeout=10)
+        response = self._request('slack', 'POST', 'https://slack.com/api/auth.test', timeout=10)
 
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             if data.get('ok'):
-                self.connection_status['slack'] = 'connected'
+                self._set_status('slack', 'connected')
                 return f"✅ Slack connected to workspace {data.get('team', 'unknown')}"
             else:
+                self._set_status('slack', 'failed')
                 return f"❌ Slack auth failed: {data.get('error', 'unknown error')}"
         else:
-            self.connection_status['slack'] = 'failed'
+            self._set_status('slack', 'failed')
             return f"❌ Slack connection failed: {response.status_code}"
 
     def _test_discord_connection(self, service: Dict) -> str:
@@ -229,15 +507,14 @@ class IntegrationHub:
         if not token:
             return "❌ Discord token not configured"
 
-        headers = {'Authorization': f'Bot {token}'}
-        response = requests.get('https://discord.com/api/users/@me', headers=headers, timeout=10)
+        response = self._request('discord', 'GET', 'https://discord.com/api/users/@me', timeout=10)
 
         if response.status_code == 200:
-            data = response.json()
-            self.connection_status['discord'] = 'connected'
+            data = _json_loads(response.content)
+            self._set_status('discord', 'connected')
             return f"✅ Discord connected as {data.get('username', 'unknown bot')}"
         else:
-            self.connection_status['discord'] = 'failed'
+            self._set_status('discord', 'failed')
             return f"❌ Discord connection failed: {response.status_code}"
 
     def _test_trello_connection(self, service: Dict) -> str:
@@ -248,15 +525,15 @@ class IntegrationHub:
         if not api_key or not token:
             return "❌ Trello API key and token not configured"
 
-        url = f"https://api.trello.com/1/members/me?key={api_key}&token={token}"
-        response = requests.get(url, timeout=10)
+        url = "https://api.trello.com/1/members/me"
+        response = self._request('trello', 'GET', url, params={'key': api_key, 'token': token}, timeout=10)
 
         if response.status_code == 200:
-            data = response.json()
-            self.connection_status['trello'] = 'connected'
+            data = _json_loads(response.content)
+            self._set_status('trello', 'connected')
             return f"✅ Trello connected as {data.get('fullName', 'unknown user')}"
         else:
-            self.connection_status['trello'] = 'failed'
+            self._set_status('trello', 'failed')
             return f"❌ Trello connection failed: {response.status_code}"
 
     def _test_jira_connection(self, service: Dict) -> str:
@@ -268,18 +545,15 @@ class IntegrationHub:
         if not all([email, api_token, domain]):
             return "❌ Jira email, API token, and domain not configured"
 
-        auth = base64.b64encode(f"{email}:{api_token}".encode()).decode()
-        headers = {'Authorization': f'Basic {auth}'}
-
         url = f"https://{domain}.atlassian.net/rest/api/3/myself"
-        response = requests.get(url, headers=headers, timeout=10)
+        response = self._request('jira', 'GET', url, timeout=10)
 
         if response.status_code == 200:
-            data = response.json()
-            self.connection_status['jira'] = 'connected'
+            data = _json_loads(response.content)
+            self._set_status('jira', 'connected')
             return f"✅ Jira connected as {data.get('displayName', 'unknown user')}"
         else:
-            self.connection_status['jira'] = 'failed'
+            self._set_status('jira', 'failed')
             return f"❌ Jira connection failed: {response.status_code}"
 
     def _test_notion_connection(self, service: Dict) -> str:
@@ -288,18 +562,13 @@ class IntegrationHub:
         if not token:
             return "❌ Notion token not configured"
 
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Notion-Version': '2022-06-28'
-        }
-
-        response = requests.get('https://api.notion.com/v1/users', headers=headers, timeout=10)
+        response = self._request('notion', 'GET', 'https://api.notion.com/v1/users', timeout=10)
 
         if response.status_code == 200:
-            self.connection_status['notion'] = 'connected'
+            self._set_status('notion', 'connected')
             return "✅ Notion connected successfully"
         else:
-            self.connection_status['notion'] = 'failed'
+            self._set_status('notion', 'failed')
             return f"❌ Notion connection failed: {response.status_code}"
 
     def list_services(self) -> str:
@@ -307,28 +576,28 @@ class IntegrationHub:
         if not self.services:
             return "📋 No services configured. Use /integrate add [service] to add one."
 
-        output = "🔗 Configured Services:\n\n"
+        parts = ["🔗 Configured Services:\n\n"]
         for name, service in self.services.items():
             status = self.connection_status.get(name, 'unknown')
-            status_icon = {"connected": "🟢", "failed": "🔴", "unknown": "⚪"}.get(status, "⚪")
-            output += f"{status_icon} {name.upper()}: {service.get('name', name)}\n"
-            output += f"   📝 {service.get('description', 'No description')}\n"
-            output += f"   🔧 Status: {status}\n"
-            output += f"   📅 Added: {service.get('added_at', 'Unknown')[:10]}\n\n"
+            status_icon = _STATUS_ICONS.get(status, "⚪")
+            parts.append(f"{status_icon} {name.upper()}: {service.get('name', name)}\n")
+            parts.append(f"   📝 {service.get('description', 'No description')}\n")
+            parts.append(f"   🔧 Status: {status}\n")
+            parts.append(f"   📅 Added: {service.get('added_at', 'Unknown')[:10]}\n\n")
 
-        return output
+        return "".join(parts)
 
     def list_supported_services(self) -> str:
         """List all supported services"""
-        output = "🚀 Supported Services:\n\n"
+        parts = ["🚀 Supported Services:\n\n"]
         for name, service in self.supported_services.items():
             configured = "✅" if name in self.services else "❌"
-            output += f"{configured} {name.upper()}: {service['name']}\n"
-            output += f"   📝 {service['description']}\n"
-            output += f"   🔐 Auth: {service['auth_type']}\n"
-            output += f"   ⚡ Features: {', '.join(service['features'])}\n\n"
+            parts.append(f"{configured} {name.upper()}: {service['name']}\n")
+            parts.append(f"   📝 {service['description']}\n")
+            parts.append(f"   🔐 Auth: {service['auth_type']}\n")
+            parts.append(f"   ⚡ Features: {', '.join(service['features'])}\n\n")
 
-        return output
+        return "".join(parts)
 
     def get_service_info(self, service_name: str) -> str:
         """Get detailed information about a service"""
@@ -338,21 +607,21 @@ class IntegrationHub:
         service = self.supported_services[service_name]
         configured = service_name in self.services
 
-        output = f"ℹ️ Service Information: {service_name.upper()}\n\n"
-        output += f"📝 Name: {service['name']}\n"
-        output += f"📖 Description: {service['description']}\n"
-        output += f"🔐 Authentication: {service['auth_type']}\n"
-        output += f"🌐 Base URL: {service['base_url']}\n"
-        output += f"⚡ Features: {', '.join(service['features'])}\n"
-        output += f"✅ Configured: {'Yes' if configured else 'No'}\n"
+        parts = [f"ℹ️ Service Information: {service_name.upper()}\n\n"]
+        parts.append(f"📝 Name: {service['name']}\n")
+        parts.append(f"📖 Description: {service['description']}\n")
+        parts.append(f"🔐 Authentication: {service['auth_type']}\n")
+        parts.append(f"🌐 Base URL: {service['base_url']}\n")
+        parts.append(f"⚡ Features: {', '.join(service['features'])}\n")
+        parts.append(f"✅ Configured: {'Yes' if configured else 'No'}\n")
 
         if configured:
             config = self.services[service_name]
-            output += f"📅 Added: {config.get('added_at', 'Unknown')[:10]}\n"
+            parts.append(f"📅 Added: {config.get('added_at', 'Unknown')[:10]}\n")
             status = self.connection_status.get(service_name, 'unknown')
-            output += f"🔗 Status: {status}\n"
+            parts.append(f"🔗 Status: {status}\n")
 
-        return output
+        return "".join(parts)
 
     def execute_service_action(self, service_name: str, action: str, **params) -> str:
         """Execute an action on a configured service"""
@@ -362,37 +631,28 @@ class IntegrationHub:
         if service_name not in self.connection_status or self.connection_status[service_name] != 'connected':
             return f"❌ Service '{service_name}' not connected. Use /integrate test {service_name} first"
 
-        try:
-            if service_name == "github":
-                return self._execute_github_action(action, self.services[service_name], **params)
-            elif service_name == "slack":
-                return self._execute_slack_action(action, self.services[service_name], **params)
-            elif service_name == "discord":
-                return self._execute_discord_action(action, self.services[service_name], **params)
-            else:
-                return f"⚠️ Action execution not implemented for {service_name}"
+        execute = self._action_dispatch.get(service_name)
+        if execute is None:
+            return f"⚠️ Action execution not implemented for {service_name}"
 
+        try:
+            return execute(action, self.services[service_name], **params)
         except Exception as e:
             return f"❌ Action failed: {str(e)}"
 
     def _execute_github_action(self, action: str, service: Dict, **params) -> str:
         """Execute GitHub-specific actions"""
-        token = service.get('token')
-        headers = {
-            'Authorization': f'token {token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-
         if action == "list_repos":
-            response = requests.get('https://api.github.com/user/repos', headers=headers, params={'per_page': 10})
+            response = self._request('github', 'GET', 'https://api.github.com/user/repos',
+                                     params={'per_page': 10}, timeout=10)
             if response.status_code == 200:
-                repos = response.json()
-                output = "📚 Your GitHub Repositories:\n\n"
-                for repo in repos[:10]:
-                    output += f"📁 {repo['name']}\n"
-                    output += f"   🌟 {repo['stargazers_count']} stars | 🍴 {repo['forks_count']} forks\n"
-                    output += f"   📝 {repo['description'] or 'No description'}\n\n"
-                return output
+                repos = _json_loads(response.content)
+                parts = ["📚 Your GitHub Repositories:\n\n"]
+                for repo in repos:
+                    parts.append(f"📁 {repo['name']}\n")
+                    parts.append(f"   🌟 {repo['stargazers_count']} stars | 🍴 {repo['forks_count']} forks\n")
+                    parts.append(f"   📝 {repo['description'] or 'No description'}\n\n")
+                return "".join(parts)
             else:
                 return f"❌ Failed to fetch repos: {response.status_code}"
 
@@ -405,10 +665,10 @@ class IntegrationHub:
                 return "❌ Missing required parameters: repo, title"
 
             data = {'title': title, 'body': body}
-            response = requests.post(f'https://api.github.com/repos/{repo}/issues', headers=headers, json=data)
+            response = self._request('github', 'POST', f'https://api.github.com/repos/{repo}/issues', json=data, timeout=10)
 
             if response.status_code == 201:
-                issue = response.json()
+                issue = _json_loads(response.content)
                 return f"✅ Issue created: #{issue['number']} - {issue['title']}"
             else:
                 return f"❌ Failed to create issue: {response.status_code}"
@@ -417,19 +677,17 @@ class IntegrationHub:
 
     def _execute_slack_action(self, action: str, service: Dict, **params) -> str:
         """Execute Slack-specific actions"""
-        token = service.get('token')
-        headers = {'Authorization': f'Bearer {token}'}
-
         if action == "list_channels":
-            response = requests.get('https://slack.com/api/conversations.list', headers=headers, params={'limit': 20})
+            response = self._request('slack', 'GET', 'https://slack.com/api/conversations.list',
+                                     params={'limit': 10}, timeout=10)
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 if data.get('ok'):
-                    output = "📺 Slack Channels:\n\n"
-                    for channel in data.get('channels', [])[:10]:
-                        output += f"#{channel['name']}\n"
-                        output += f"   👥 {channel.get('num_members', 0)} members\n\n"
-                    return output
+                    parts = ["📺 Slack Channels:\n\n"]
+                    for channel in data.get('channels', []):
+                        parts.append(f"#{channel['name']}\n")
+                        parts.append(f"   👥 {channel.get('num_members', 0)} members\n\n")
+                    return "".join(parts)
                 else:
                     return f"❌ Slack API error: {data.get('error')}"
             else:
@@ -443,10 +701,10 @@ class IntegrationHub:
                 return "❌ Missing required parameters: channel, text"
 
             data = {'channel': channel, 'text': text}
-            response = requests.post('https://slack.com/api/chat.postMessage', headers=headers, json=data)
+            response = self._request('slack', 'POST', 'https://slack.com/api/chat.postMessage', json=data, timeout=10)
 
             if response.status_code == 200:
-                result = response.json()
+                result = _json_loads(response.content)
                 if result.get('ok'):
                     return "✅ Message sent successfully"
                 else:
@@ -458,18 +716,16 @@ class IntegrationHub:
 
     def _execute_discord_action(self, action: str, service: Dict, **params) -> str:
         """Execute Discord-specific actions"""
-        token = service.get('token')
-        headers = {'Authorization': f'Bot {token}'}
-
         if action == "list_guilds":
-            response = requests.get('https://discord.com/api/users/@me/guilds', headers=headers)
+            response = self._request('discord', 'GET', 'https://discord.com/api/users/@me/guilds',
+                                     params={'limit': 10}, timeout=10)
             if response.status_code == 200:
-                guilds = response.json()
-                output = "🏰 Discord Servers:\n\n"
-                for guild in guilds[:10]:
-                    output += f"🏠 {guild['name']}\n"
-                    output += f"   👑 Owner: {guild.get('owner', 'Unknown')}\n\n"
-                return output
+                guilds = _json_loads(response.content)
+                parts = ["🏰 Discord Servers:\n\n"]
+                for guild in guilds:
+                    parts.append(f"🏠 {guild['name']}\n")
+                    parts.append(f"   👑 Owner: {guild.get('owner', 'Unknown')}\n\n")
+                return "".join(parts)
             else:
                 return f"❌ Failed to fetch guilds: {response.status_code}"
 
@@ -485,8 +741,11 @@ class IntegrationHub:
         if not isinstance(webhook_url, str) or not isinstance(events, list):
             raise ValueError("Invalid webhook url or events list")
 
-        # Prevent local network addresses or file:/// curls (simple guard)
-        if re.match(r"^(?:http|https)://(?:127\.|localhost|10\.|192\.168\.)", webhook_url, re.IGNORECASE):
+        # Only http(s) URLs, and never local network addresses (SSRF guard)
+        parsed = urlsplit(webhook_url)
+        if parsed.scheme.lower() not in ('http', 'https') or not parsed.hostname:
+            raise ValueError("Webhook URL must be an http(s) URL")
+        if _is_private_host(parsed.hostname):
             raise ValueError("Refusing to register webhooks to local or private IP addresses")
 
         # Limit number of events and sanitize event names
@@ -497,7 +756,7 @@ class IntegrationHub:
         for e in events:
             if not isinstance(e, str):
                 continue
-            e_clean = re.sub(r"[^a-zA-Z0-9_\-]", "", e).lower()
+            e_clean = _EVENT_CLEAN_RE.sub("", e).lower()
             if e_clean:
                 clean_events.append(e_clean)
 
@@ -509,7 +768,7 @@ class IntegrationHub:
             'active': True
         }
 
-        webhook_id = f"{service_name}_{hashlib.md5(webhook_url.encode()).hexdigest()[:8]}"
+        webhook_id = f"{service_name}_{hashlib.blake2b(webhook_url.encode(), digest_size=4).hexdigest()}"
 
         # simple threat detection on url and events (use AdvancedSecurity if available)
         try:
@@ -522,50 +781,77 @@ class IntegrationHub:
             # If advanced security isn't available or raises, proceed conservatively
             pass
 
+        previous = self.webhooks.get(webhook_id)
+        if previous is not None and previous.get('active', False):
+            self._active_webhook_count -= 1
         self.webhooks[webhook_id] = webhook_config
-        self.save_integrations()
+        self._active_webhook_count += 1
+        self._mark_dirty()
 
         return f"✅ Webhook '{webhook_id}' created for {service_name}"
 
+    def remove_webhook(self, webhook_id: str) -> str:
+        """Remove a configured webhook"""
+        webhook = self.webhooks.pop(webhook_id, None)
+        if webhook is None:
+            return f"❌ Webhook '{webhook_id}' not found"
+        if webhook.get('active', False):
+            self._active_webhook_count -= 1
+        self._mark_dirty()
+        return f"✅ Webhook '{webhook_id}' removed"
+
     def list_webhooks(self) -> str:
         """List all configured webhooks"""
         if not self.webhooks:
             return "🔗 No webhooks configured"
 
-        output = "🪝 Configured Webhooks:\n\n"
+        parts = ["🪝 Configured Webhooks:\n\n"]
         for webhook_id, config in self.webhooks.items():
             status = "🟢 Active" if config.get('active', False) else "🔴 Inactive"
-            output += f"🪝 {webhook_id}\n"
-            output += f"   🔗 Service: {config['service']}\n"
-            output += f"   🌐 URL: {config['url']}\n"
-            output += f"   📅 Created: {config.get('created_at', 'Unknown')[:10]}\n"
-            output += f"   {status}\n\n"
+            parts.append(f"🪝 {webhook_id}\n")
+            parts.append(f"   🔗 Service: {config['service']}\n")
+            parts.append(f"   🌐 URL: {config['url']}\n")
+            parts.append(f"   📅 Created: {config.get('created_at', 'Unknown')[:10]}\n")
+            parts.append(f"   {status}\n\n")
 
-        return output
+        return "".join(parts)
 
     def get_integration_stats(self) -> Dict:
         """Get integration statistics"""
-        stats = {
+        return {
             'total_services': len(self.services),
             'supported_services': len(self.supported_services),
-            'connected_services': sum(1 for status in self.connection_status.values() if status == 'connected'),
-            'failed_connections': sum(1 for status in self.connection_status.values() if status == 'failed'),
+            'connected_services': self._status_counts['connected'],
+            'failed_connections': self._status_counts['failed'],
             'total_webhooks': len(self.webhooks),
-            'active_webhooks': sum(1 for w in self.webhooks.values() if w.get('active', False))
+            'active_webhooks': self._active_webhook_count
         }
 
-        return stats
+    def export_configuration(self, format_type: str = "json", path: Optional[str] = None) -> str:
+        """Export integration configuration.
+
+        Returns the JSON text, or writes the encoded bytes straight to ``path``
+        (skipping the str round-trip) and returns a status message.
+        """
+        if format_type != "json":
+            return f"❌ Unsupported export format: {format_type}. Use 'json'"
 
-    def export_configuration(self, format_type: str = "json") -> str:
-        """Export integration configuration"""
         config = {
-            'services': self.services,
-            'webhooks': self.webhooks,
-            'connection_status': self.connection_status,
+            'services': self._persistable_services(),
+            'webhooks': dict(self.webhooks),
+            'connection_status': dict(self.connection_status),
             'exported_at': datetime.now().isoformat()
         }
-
-        if format_type == "json":
-            return json.dumps(config, indent=2)
+        if orjson is not None:
+            blob = orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
         else:
-            return f"❌ Unsupported export format: {format_type}. Use 'json'"
+            blob = json.dumps(config, indent=2, sort_keys=True).encode('utf-8')
+
+        if path is None:
+            return blob.decode('utf-8')
+        try:
+            with open(path, 'wb') as f:
+                f.write(blob)
+        except Exception as e:
+            return f"❌ Error exporting configuration: {e}"
+        return f"✅ Configuration exported to {path}"
@@ -1,4 +1,4 @@
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.text import Text
 from rich.table import Table
@@ -6,22 +6,61 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.live import Live
 from rich.layout import Layout
 import yaml
+try:
+    # LibYAML bindings parse and emit in C when available
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
 import re
 import logging
+import logging.handlers
 from datetime import datetime
 import sys
 import time
 import requests
-from typing import Dict, Optional
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Iterator, List, Optional, Union
 import shlex
+from functools import lru_cache
 import hashlib
+import hmac
 import os
 import json
 import threading
-import openai
-import ollama
+import weakref
+import atexit
+import importlib
+import asyncio
 from dotenv import load_dotenv
 
+# Provider SDKs are heavy and a run uses at most one of them, so they are
+# imported on first use. Inside this module go through _lazy(); external code
+# can still reach them as module attributes via __getattr__.
+_LAZY_IMPORTS = {
+    "genai": ("google.generativeai", None),
+    "Groq": ("groq", "Groq"),
+    "ollama": ("ollama", None),
+    "openai": ("openai", None),
+}
+
+
+def _lazy(name: str):
+    """Import a provider SDK (or one of its attributes) on first access."""
+    value = globals().get(name)
+    if value is None:
+        module_name, attr = _LAZY_IMPORTS[name]
+        value = importlib.import_module(module_name)
+        if attr:
+            value = getattr(value, attr)
+        globals()[name] = value
+    return value
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        return _lazy(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 load_dotenv()
 # --- New Feature Imports ---
 try:
@@ -123,10 +162,17 @@ except ImportError:
         BlockchainManager = None
         MLOpsManager = None
 
-# Cache for Ollama model list to avoid repeated expensive calls.
-from functools import lru_cache
 import subprocess
 
+# Cache for Ollama model list to avoid repeated expensive calls.
+_OLLAMA_MODELS_TTL = 60.0
+_ollama_models_cache = None  # (models, monotonic timestamp)
+# /ollama-models re-reads the full listing more eagerly; show() specs are fixed per pull
+_OLLAMA_LIST_TTL = 10.0
+_OLLAMA_SHOW_TTL = 300.0
+_ollama_list_cache = None  # (entries, monotonic timestamp)
+_ollama_show_cache = {}  # model name -> (info, monotonic timestamp)
+
 def run_cli_list() -> str:
     """Run 'ollama list' command via subprocess."""
     try:
@@ -138,42 +184,79 @@ def run_cli_list() -> str:
     except FileNotFoundError:
         logging.warning("Ollama CLI not found in PATH")
     except Exception as e:
-        logging.error(f"Error running ollama list: {e}")
+        logging.error("Error running ollama list: %s", e)
     return ""
 
-@lru_cache(maxsize=1)
-def _get_ollama_models_list() -> list[str]:
-    """Retrieve Ollama models once per process run."""
+def _get_ollama_models_list(refresh: bool = False) -> list[str]:
+    """Return installed Ollama model names, probing at most once per TTL."""
+    global _ollama_models_cache
+    cached = _ollama_models_cache
+    if not refresh and cached is not None and time.monotonic() - cached[1] < _OLLAMA_MODELS_TTL:
+        return cached[0]
+    models = _probe_ollama_models()
+    _ollama_models_cache = (models, time.monotonic())
+    return models
+
+def _ollama_base_url() -> str:
+    """Ollama daemon URL, honouring OLLAMA_HOST like the SDK and CLI do."""
+    host = os.getenv("OLLAMA_HOST") or "http://localhost:11434"
+    if not host.startswith(("http://", "https://")):
+        host = f"http://{host}"
+    return host.rstrip("/")
+
+def _ollama_model_entries(res) -> list:
+    """Model entries from an ``ollama.list()`` result (ListResponse, dict or list)."""
+    if isinstance(res, list):
+        return res
+    if isinstance(res, dict):
+        return res.get('models') or []
+    return getattr(res, 'models', None) or []
+
+def _ollama_model_name(m) -> str:
+    """Name of one model entry, whether a Model object or a plain dict."""
+    if isinstance(m, dict):
+        return m.get('name') or m.get('model') or str(m)
+    return getattr(m, 'model', None) or getattr(m, 'name', None) or str(m)
+
+def _ollama_list(refresh: bool = False) -> list:
+    """Model entries from ``ollama.list()``, reused for ``_OLLAMA_LIST_TTL`` seconds.
+
+    If the daemon stops answering, the last good listing is returned instead of the error.
+    """
+    global _ollama_list_cache
+    cached = _ollama_list_cache
+    if not refresh and cached is not None and time.monotonic() - cached[1] < _OLLAMA_LIST_TTL:
+        return cached[0]
+    try:
+        entries = _ollama_model_entries(_lazy("ollama").list())
+    except Exception:
+        if cached is None:
+            raise
+        return cached[0]
+    _ollama_list_cache = (entries, time.monotonic())
+    return entries
+
+def _ollama_show(name: str):
+    """``ollama.show(name)``, reused for ``_OLLAMA_SHOW_TTL`` seconds."""
+    cached = _ollama_show_cache.get(name)
+    if cached is not None and time.monotonic() - cached[1] < _OLLAMA_SHOW_TTL:
+        return cached[0]
+    info = _lazy("ollama").show(name)
+    _ollama_show_cache[name] = (info, time.monotonic())
+    return info
+
+def _probe_ollama_models() -> list[str]:
+    """Query Ollama for its models via the Python client, falling back to the CLI."""
     models = []
     
     # 1. Try Python client first
     try:
-        res = ollama.list()
-        if hasattr(res, 'models'):
-            model_list = res.models
-        elif isinstance(res, dict) and res.get('models'):
-            model_list = res.get('models')
-        elif isinstance(res, list):
-            model_list = res
-        else:
-            model_list = []
-        
-        for m in model_list:
-            if hasattr(m, 'model'):
-                name = m.model
-            elif hasattr(m, 'name'):
-                name = m.name
-            elif isinstance(m, dict):
-                name = m.get('name') or m.get('model') or str(m)
-            else:
-                name = str(m)
-            models.append(name)
-            
+        models = [_ollama_model_name(m) for m in _ollama_model_entries(_lazy("ollama").list())]
         if models:
             return models
             
     except Exception as e:
-        logging.warning(f"Ollama Python client failed: {e}")
+        logging.warning("Ollama Python client failed: %s", e)
 
     # 2. Fallback to CLI
     try:
@@ -190,7 +273,7 @@ def _get_ollama_models_list() -> list[str]:
                     models.append(parts[0])
                     
     except Exception as e:
-        logging.error(f"Ollama CLI parsing failed: {e}")
+        logging.error("Ollama CLI parsing failed: %s", e)
     
     return models
 
@@ -213,10 +296,13 @@ def update_console_theme(theme_manager=None):
     else:
         console = Console()
 
+# Buffer log records and write them to disk in batches; errors flush immediately
+# and logging's exit hook flushes whatever is left.
+_log_file_handler = logging.FileHandler('ai_assistant.log', delay=True)
+_log_file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
 logging.basicConfig(
-    filename='ai_assistant.log',
     level=logging.WARNING,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+    handlers=[logging.handlers.MemoryHandler(capacity=100, flushLevel=logging.ERROR, target=_log_file_handler)]
 )
 
 # Settings - resolve at runtime to respect test env overrides (HOME) and Windows USERPROFILE
@@ -241,6 +327,7 @@ MAX_OUTPUT_TOKENS = 4000  # Increased from 1000
 MAX_RESPONSE_LENGTH = 8000  # Increased from 2000
 MAX_INPUT_LENGTH = 4000  # Increased from 1000
 CONTEXT_HISTORY_SIZE = 10  # Number of previous messages to include
+HF_BATCH_SIZE = 32  # Max prompts per HuggingFace inference request
 
 # Security settings
 ALLOWED_DOMAINS = [
@@ -256,18 +343,56 @@ class SecurityError(Exception):
 class APIError(Exception):
     pass
 
+class ProviderError(Exception):
+    """A provider cannot answer; the message goes back to the user uncached and unretried."""
+
 # --- Security Manager ---
+_BLOCKLIST = (
+    r"sudo\s", r"rm\s+-[rf]", r"chmod\s+777",
+    r"wget\s", r"curl\s", r"\|\s*sh",
+    r">\s*/dev", r"nohup", r"fork\(\)",
+    r"eval\(", r"base64_decode", r"UNION\s+SELECT",
+    r"DROP\s+TABLE", r"<script", r"javascript:"
+)
+
+# Common prompt-injection phrases to detect when user-supplied content
+# will be sent to an LLM. These are conservative heuristics.
+_PROMPT_INJECTION = (
+    r"ignore (previous|all) instructions",
+    r"disregard (previous|earlier) instructions",
+    r"you are now",
+    r"from now on",
+    r"follow these instructions",
+    r"do not follow the",
+    r"respond only with",
+)
+
+
+def _union_pattern(patterns) -> "re.Pattern":
+    """Fuse patterns into one alternation; group ``p<i>`` names the branch that hit."""
+    return re.compile("|".join(f"(?P<p{i}>{p})" for i, p in enumerate(patterns)), re.IGNORECASE)
+
+
+# Compiled once at import and shared by every SecurityManager instance, so
+# each check is a single scan of the input.
+_BLOCKLIST_RE = _union_pattern(_BLOCKLIST)
+_PROMPT_INJECTION_RE = _union_pattern(_PROMPT_INJECTION)
+
+_API_KEY_RULES = {
+    "gemini": {"min_length": 30, "prefixes": ("AI",)},
+    "groq": {"min_length": 40, "prefixes": ("gsk_",)},
+    "huggingface": {"min_length": 30, "prefixes": ("hf_",)},
+    "generic": {"min_length": 20, "prefixes": ()}
+}
+_NON_PRINTABLE_RE = re.compile(r'[^\x20-\x7e\t\n\r]')
+# Invisible, right-to-left, or control unicode chars
+_SUSPICIOUS_UNICODE_RE = re.compile('[\u200b\u202a-\u202e\u2066-\u2069\ufeff]')
+_API_KEY_RE = re.compile(r'^[a-zA-Z0-9_-]+$')
+_LOCAL_URL_RE = re.compile(r'(localhost|127\\.0\\.1|0\\.0\\.0\\.0|::1)')
+
 class SecurityManager:
     def __init__(self):
-        self.blocklist_patterns = [
-            re.compile(p, re.IGNORECASE) for p in [
-                r"sudo\s", r"rm\s+-[rf]", r"chmod\s+777",
-                r"wget\s", r"curl\s", r"\|\s*sh",
-                r">\s*/dev", r"nohup", r"fork\(\)",
-                r"eval\(", r"base64_decode", r"UNION\s+SELECT",
-                r"DROP\s+TABLE", r"<script", r"javascript:"
-            ]
-        ]
+        self.blocklist = _BLOCKLIST
         # Allowlist for commands and file extensions
         self.allowed_commands = {
             'ls', 'pwd', 'whoami', 'date', 'uptime', 'echo', 'cat', 'head', 'tail', 'df', 'du', 'free', 'uname', 'id', 'git'
@@ -276,53 +401,38 @@ class SecurityManager:
         self.violation_count = 0
         self.violation_threshold = 5
 
-        # Common prompt-injection phrases to detect when user-supplied content
-        # will be sent to an LLM. These are conservative heuristics.
-        self.prompt_injection_patterns = [
-            re.compile(p, re.IGNORECASE) for p in [
-                r"ignore (previous|all) instructions",
-                r"disregard (previous|earlier) instructions",
-                r"you are now",
-                r"from now on",
-                r"follow these instructions",
-                r"do not follow the",
-                r"respond only with",
-            ]
-        ]
+        self.prompt_injection_patterns = _PROMPT_INJECTION
 
     def sanitize(self, input_str: str) -> str:
         if not isinstance(input_str, str) or len(input_str) > 10000:
             self.log_violation('Input too long or not a string')
             raise SecurityError("Invalid input")
-        if not self.is_printable(input_str):
+        # Suspicious unicode is a subset of non-printable, so one scan covers both
+        bad = _NON_PRINTABLE_RE.search(input_str)
+        if bad:
+            if _SUSPICIOUS_UNICODE_RE.match(bad.group()):
+                self.log_violation('Suspicious unicode detected')
+                raise SecurityError("Input contains suspicious unicode characters")
             self.log_violation('Non-printable characters detected')
             raise SecurityError("Input contains non-printable characters")
-        if self.has_suspicious_unicode(input_str):
-            self.log_violation('Suspicious unicode detected')
-            raise SecurityError("Input contains suspicious unicode characters")
         
-        sanitized = input_str.strip().replace("\0", "")
-        for pattern in self.blocklist_patterns:
-            if pattern.search(sanitized):
-                self.log_violation(f'Blocked pattern detected')
-                raise SecurityError("Blocked dangerous pattern")
+        # NULs were rejected above, so stripping is all that is left to do
+        sanitized = input_str.strip()
+        match = _BLOCKLIST_RE.search(sanitized)
+        if match:
+            self.log_violation(f'Blocked pattern detected: {self.blocklist[int(match.lastgroup[1:])]}')
+            raise SecurityError("Blocked dangerous pattern")
         return sanitized
 
     def validate_api_key(self, key: str, provider: str = "generic") -> bool:
         if not key or not isinstance(key, str):
             return False
-        rules = {
-            "gemini": {"min_length": 30, "prefixes": ["AI"]},
-            "groq": {"min_length": 40, "prefixes": ["gsk_"]},
-            "huggingface": {"min_length": 30, "prefixes": ["hf_"]},
-            "generic": {"min_length": 20, "prefixes": []}
-        }
-        rule = rules.get(provider.lower(), rules["generic"])
+        rule = _API_KEY_RULES.get(provider.lower(), _API_KEY_RULES["generic"])
         if len(key) < rule["min_length"]:
             return False
-        if rule["prefixes"] and not any(key.startswith(p) for p in rule["prefixes"]):
+        if rule["prefixes"] and not key.startswith(rule["prefixes"]):
             return False
-        return re.match(r'^[a-zA-Z0-9_-]+$', key) is not None
+        return _API_KEY_RE.match(key) is not None
 
     def is_command_allowed(self, cmd: str) -> bool:
         return cmd in self.allowed_commands
@@ -331,18 +441,14 @@ class SecurityManager:
         return any(filename.endswith(ext) for ext in self.allowed_file_extensions)
 
     def is_printable(self, s: str) -> bool:
-        return all(32 <= ord(c) <= 126 or c in '\n\r\t' for c in s)
+        return _NON_PRINTABLE_RE.search(s) is None
 
     def has_suspicious_unicode(self, s: str) -> bool:
-        # Block invisible, right-to-left, or control unicode chars
-        suspicious = [
-            '\u202e', '\u202d', '\u202a', '\u202b', '\u202c', '\u200b', '\ufeff', '\u2066', '\u2067', '\u2068', '\u2069'
-        ]
-        return any(code in s for code in suspicious)
+        return _SUSPICIOUS_UNICODE_RE.search(s) is not None
 
     def log_violation(self, reason: str):
         self.violation_count += 1
-        logging.warning(f"Security violation: {reason}")
+        logging.warning("Security violation: %s", reason)
         if self.violation_count >= self.violation_threshold:
             logging.critical("Repeated security violations detected!")
             # Optionally, trigger alert/lockout here
@@ -352,10 +458,9 @@ class SecurityManager:
         try:
             if not isinstance(s, str):
                 return False
-            for pattern in self.prompt_injection_patterns:
-                if pattern.search(s):
-                    logging.warning(f"Prompt injection pattern detected")
-                    return True
+            if _PROMPT_INJECTION_RE.search(s):
+                logging.warning("Prompt injection pattern detected")
+                return True
         except Exception:
             pass
         return False
@@ -364,28 +469,159 @@ class SecurityManager:
         # Only allow http(s) and block local addresses
         if not url.startswith(('http://', 'https://')):
             return False
-        if re.search(r'(localhost|127\\.0\\.1|0\\.0\\.0\\.0|::1)', url):
+        if _LOCAL_URL_RE.search(url):
             return False
         return True
 
 # --- Prompt Cache ---
-from collections import OrderedDict
+import math
+import mmap
+import sqlite3
+from collections import Counter, OrderedDict, deque
+from itertools import islice
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+def _prompt_vector(text: str) -> Dict[str, float]:
+    """Unit-normalised bag-of-words vector used for near-duplicate prompt lookup."""
+    counts = Counter(_WORD_RE.findall(text.lower()))
+    norm = math.sqrt(sum(c * c for c in counts.values())) or 1.0
+    return {word: c / norm for word, c in counts.items()}
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(word, 0.0) for word, w in a.items())
+
+@lru_cache(maxsize=32)
+def _prompt_digest(clean_prompt: str) -> str:
+    """Cache-key digest; memoised so a stream fallback or multi-model fan-out hashes once."""
+    return hashlib.blake2b(clean_prompt.encode(), digest_size=16).hexdigest()
+
 class PromptCache:
-    def __init__(self, ttl=5, maxsize=100):
+    """LRU prompt cache keyed by ``(model, digest)`` with lazy TTL expiry.
+
+    When ``path`` is given, responses are also written to a SQLite file and
+    kept for ``persist_ttl`` seconds, so exact hits survive restarts; the
+    in-memory store stays in front of it as the first tier.
+
+    When ``similarity`` is set, a miss falls back to comparing the prompt
+    against the ``scan_limit`` most recent entries for the same model and
+    returns a response whose cosine similarity reaches the threshold.
+    """
+    def __init__(self, ttl=5, maxsize=100, similarity=None, scan_limit=32, path=None, persist_ttl=86400):
         self.ttl = ttl
         self.maxsize = maxsize
+        self.similarity = similarity
+        self.scan_limit = scan_limit
+        self.persist_ttl = persist_ttl
         self.store = OrderedDict()
-    def get(self, key):
-        entry = self.store.get(key)
-        if entry and time.time() - entry[1] < self.ttl:
-            return entry[0]
+        # query_async/query_many_async call in from several threads at once
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_lock = threading.Lock()
+        if path:
+            self._open_db(path)
+    def _open_db(self, path):
+        try:
+            db = sqlite3.connect(path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA mmap_size=16777216")
+            db.execute("CREATE TABLE IF NOT EXISTS prompt_cache ("
+                       "model TEXT, digest TEXT, response TEXT, created REAL, "
+                       "PRIMARY KEY (model, digest))")
+            # Expired rows are swept once per process rather than on every lookup
+            db.execute("DELETE FROM prompt_cache WHERE created < ?", (time.time() - self.persist_ttl,))
+            db.commit()
+            self._db = db
+        except sqlite3.Error as e:
+            logging.warning("Prompt cache store unavailable: %s", e)
+    def _db_get(self, key, now):
+        if self._db is None:
+            return None
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT response FROM prompt_cache WHERE model = ? AND digest = ? AND created >= ?",
+                    (key[0], key[1], now - self.persist_ttl)).fetchone()
+        except sqlite3.Error as e:
+            logging.warning("Prompt cache read failed: %s", e)
+            return None
+        return row[0] if row else None
+    def _db_set(self, key, value, now):
+        if self._db is None:
+            return
+        try:
+            with self._db_lock, self._db:
+                self._db.execute("INSERT OR REPLACE INTO prompt_cache VALUES (?, ?, ?, ?)",
+                                 (key[0], key[1], value, now))
+        except sqlite3.Error as e:
+            logging.warning("Prompt cache write failed: %s", e)
+    def get(self, key, prompt=None):
+        now = time.time()
+        with self._lock:
+            entry = self.store.get(key)
+            if entry:
+                if now - entry[1] < self.ttl:
+                    self.store.move_to_end(key)
+                    return entry[0]
+                del self.store[key]
+        value = self._db_get(key, now)
+        if value is not None:
+            self._remember(key, value, prompt, now)
+            return value
+        if prompt is None or not self.similarity:
+            return None
+        vector = _prompt_vector(prompt)
+        with self._lock:
+            for other_key in islice(reversed(self.store), self.scan_limit):
+                value, stamp, other = self.store[other_key]
+                if other_key[0] == key[0] and other and now - stamp < self.ttl \
+                        and _cosine(vector, other) >= self.similarity:
+                    self.store.move_to_end(other_key)
+                    return value
         return None
-    def set(self, key, value):
-        if len(self.store) >= self.maxsize:
-            self.store.popitem(last=False)
-        self.store[key] = (value, time.time())
+    def set(self, key, value, prompt=None):
+        now = time.time()
+        self._remember(key, value, prompt, now)
+        self._db_set(key, value, now)
+    def _remember(self, key, value, prompt, now):
+        vector = _prompt_vector(prompt) if prompt is not None and self.similarity else None
+        with self._lock:
+            # Expired entries drift to the LRU end; drop them before evicting live ones
+            while self.store and now - next(iter(self.store.values()))[1] >= self.ttl:
+                self.store.popitem(last=False)
+            if key in self.store:
+                self.store.move_to_end(key)
+            elif len(self.store) >= self.maxsize:
+                self.store.popitem(last=False)
+            self.store[key] = (value, now, vector)
+
+def _env_float(name: str) -> float:
+    """A float environment setting; unset or malformed values mean 0 (disabled)."""
+    raw = os.getenv(name)
+    if not raw:
+        return 0.0
+    try:
+        value = float(raw)
+    except ValueError:
+        logging.warning("Ignoring %s=%r: not a number", name, raw)
+        return 0.0
+    # NaN and negatives disable the feature too
+    return value if value > 0 else 0.0
+
+def _make_prompt_cache() -> PromptCache:
+    # Near-duplicate matching is opt-in, e.g. NEXUS_PROMPT_SIMILARITY=0.92, and so is
+    # keeping responses on disk across runs, e.g. NEXUS_PROMPT_CACHE_TTL=86400
+    similarity = min(_env_float("NEXUS_PROMPT_SIMILARITY"), 1.0) or None
+    persist_ttl = _env_float("NEXUS_PROMPT_CACHE_TTL")
+    path = None
+    if persist_ttl > 0:
+        path = os.path.join(_get_home_dir(), '.nexus', 'prompt_cache.sqlite3')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    return PromptCache(similarity=similarity, path=path, persist_ttl=persist_ttl)
 
-_prompt_cache = PromptCache()
+_prompt_cache = _make_prompt_cache()
 
 # --- Thread Pool ---
 from concurrent.futures import ThreadPoolExecutor
@@ -403,15 +639,18 @@ class RateLimiter:
     def __init__(self, limit: int = 10, window_seconds: int = 60):
         self.limit = limit
         self.window_seconds = window_seconds
-        self._stores = {}
+        self._stores: Dict[str, deque] = {}
 
     def allow(self, user_id: str) -> bool:
         now = time.time()
-        wins = self._stores.setdefault(user_id, [])
+        wins = self._stores.get(user_id)
+        if wins is None:
+            wins = self._stores[user_id] = deque(maxlen=self.limit)
         # Remove timestamps outside of the sliding window
-        while wins and wins[0] <= now - self.window_seconds:
-            wins.pop(0)
-        if len(wins) >= self.limit:
+        cutoff = now - self.window_seconds
+        while wins and wins[0] <= cutoff:
+            wins.popleft()
+        if len(wins) == wins.maxlen:
             return False
         wins.append(now)
         return True
@@ -423,10 +662,18 @@ class AIManager:
         self.gemini = None
         self.groq = None
         self.session = self._create_session()
+        self._handlers = {
+            "gemini": self._q_gemini,
+            "groq": self._q_groq,
+            "ollama": self._q_ollama,
+            "huggingface": self._q_huggingface,
+            "chatgpt": self._q_chatgpt,
+            "mcp": self._q_mcp,
+        }
         self.status = {
             "gemini": "Not configured",
             "groq": "Not configured",
-            "ollama": "Ready" if self._check_ollama() else "Not installed",
+            "ollama": "Not installed",
             "huggingface": "Ready (requires token)",
             "chatgpt": "Not configured",
             "mcp": "Not configured"
@@ -442,73 +689,104 @@ class AIManager:
             'User-Agent': f'NexusAI/{VERSION}',
             'Accept': 'application/json'
         })
+        # Keep connections to the HF/MCP/Ollama endpoints alive. No adapter-level
+        # retries: query() already retries, and inference POSTs aren't idempotent.
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
         return session
         
-    def _init_services(self):
-        # Cache env vars once
-        _GEMINI_KEY = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-        _GROQ_KEY = os.getenv("GROQ_API_KEY")
-        _OPENAI_KEY = os.getenv("OPENAI_API_KEY")
-        _MCP_KEY = os.getenv("MCP_API_KEY")
+    def _load_credentials(self):
+        """Read and validate the keys consulted per query, once rather than on every call."""
+        openai_key = os.getenv("OPENAI_API_KEY")
+        hf_token = os.getenv("HUGGINGFACE_TOKEN")
+        self._creds = {
+            "openai": openai_key if openai_key and self.security.validate_api_key(openai_key, "generic") else None,
+            "huggingface": hf_token if hf_token and self.security.validate_api_key(hf_token, "huggingface") else None,
+            "mcp": os.getenv("MCP_API_KEY") or None,
+            "mcp_url": os.getenv("MCP_URL", "http://localhost:8080/api/v1/completions"),
+            "ollama_url": _ollama_base_url(),
+        }
 
+    def _init_services(self):
+        self._load_credentials()
+        # Probe every provider at once; init costs max-of rather than sum-of providers
+        probes = {
+            "gemini": _run_in_background(self._init_gemini, os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")),
+            "groq": _run_in_background(self._init_groq, os.getenv("GROQ_API_KEY")),
+            "ollama": _run_in_background(self._init_ollama),
+            "chatgpt": _run_in_background(self._init_chatgpt, os.getenv("OPENAI_API_KEY")),
+            "mcp": _run_in_background(self._init_mcp, os.getenv("MCP_API_KEY")),
+        }
+        for name, future in probes.items():
+            status, client = future.result()
+            if status is not None:
+                self.status[name] = status
+            if name in ("gemini", "groq"):
+                setattr(self, name, client)
+
+    def _init_gemini(self, gemini_key: Optional[str]):
         # Gemini 2.0 Flash (Fixed API)
-        gemini_key = _GEMINI_KEY
         if gemini_key and self.security.validate_api_key(gemini_key, "gemini"):
             try:
-                genai.configure(api_key=gemini_key)
-                self.gemini = genai.GenerativeModel("gemini-2.0-flash-exp")
-                self.status["gemini"] = " Ready"
+                _lazy("genai").configure(api_key=gemini_key)
+                client = _lazy("genai").GenerativeModel("gemini-2.0-flash-exp")
                 logging.info("Gemini 2.0 Flash initialized successfully")
+                return " Ready", client
             except Exception as e:
-                self.status["gemini"] = f" Error: {str(e)[:50]}..."
-                logging.error(f"Gemini init failed: {str(e)}")
+                logging.error("Gemini init failed: %s", e)
+                return f" Error: {str(e)[:50]}...", None
         elif gemini_key:
-            self.status["gemini"] = " Invalid API key format"
-        
+            return " Invalid API key format", None
+        return None, None
+
+    def _init_groq(self, groq_key: Optional[str]):
         # Groq Cloud
-        groq_key = _GROQ_KEY
         if groq_key and self.security.validate_api_key(groq_key, "groq"):
             try:
-                self.groq = Groq(api_key=groq_key)
-                self.status["groq"] = " Ready"
+                client = _lazy("Groq")(api_key=groq_key)
                 logging.info("Groq service initialized")
+                return " Ready", client
             except Exception as e:
-                self.status["groq"] = f" Error: {str(e)[:50]}..."
-                logging.error(f"Groq init failed: {str(e)}")
+                logging.error("Groq init failed: %s", e)
+                return f" Error: {str(e)[:50]}...", None
         elif groq_key:
-            self.status["groq"] = " Invalid API key format"
-        
+            return " Invalid API key format", None
+        return None, None
+
+    def _init_ollama(self):
         # Ollama local
-        if self.status["ollama"] == "Ready":
-            try:
-                models = self._get_ollama_models()
-                self.status["ollama"] = f" Ready ({models})" if models != "Unknown" else " No models"
-            except Exception as e:
-                self.status["ollama"] = f" Error: {str(e)[:50]}..."
-                logging.error(f"Ollama model check failed: {str(e)}")
-        else:
-            self.status["ollama"] = " Not installed"
-        
+        if not self._check_ollama():
+            return " Not installed", None
+        try:
+            models = self._get_ollama_models()
+            return (f" Ready ({models})" if models != "Unknown" else " No models"), None
+        except Exception as e:
+            logging.error("Ollama model check failed: %s", e)
+            return f" Error: {str(e)[:50]}...", None
+
+    def _init_chatgpt(self, openai_key: Optional[str]):
         # ChatGPT (OpenAI)
-        openai_key = _OPENAI_KEY
         if openai_key and self.security.validate_api_key(openai_key, "generic"):
             try:
-                openai.api_key = openai_key
-                self.status["chatgpt"] = " Ready"
+                _lazy("openai").api_key = openai_key
                 logging.info("ChatGPT (OpenAI) initialized successfully")
+                return " Ready", None
             except Exception as e:
-                self.status["chatgpt"] = f" Error: {str(e)[:50]}..."
-                logging.error(f"ChatGPT init failed: {str(e)}")
+                logging.error("ChatGPT init failed: %s", e)
+                return f" Error: {str(e)[:50]}...", None
         elif openai_key:
-            self.status["chatgpt"] = " Invalid API key format"
-        
+            return " Invalid API key format", None
+        return None, None
+
+    def _init_mcp(self, mcp_key: Optional[str]):
         # MCP (Model Context Protocol)
-        mcp_key = _MCP_KEY
         if mcp_key and self.security.validate_api_key(mcp_key, "generic"):
-            self.status["mcp"] = " Ready"
+            return " Ready", None
         elif mcp_key:
-            self.status["mcp"] = " Invalid API key format"
-    
+            return " Invalid API key format", None
+        return None, None
+
     def _check_ollama(self) -> bool:
         """Check if Ollama is running and has models."""
         try:
@@ -524,30 +802,138 @@ class AIManager:
             if models:
                 return ", ".join(models[:3]) + ("..." if len(models) > 3 else "")
         except Exception as e:
-            logging.warning(f"Error getting Ollama models: {str(e)}")
+            logging.warning("Error getting Ollama models: %s", e)
         return "Unknown"
     
     def _query_huggingface(self, prompt: str) -> str:
+        return self._query_huggingface_batch([prompt])[0]
+
+    def _query_huggingface_batch(self, prompts: list[str]) -> list[str]:
+        """Run up to HF_BATCH_SIZE prompts through one inference request.
+
+        Returns one string per prompt; failures raise ProviderError, so ``query``
+        reports them without caching.
+        """
+        prompts = prompts[:HF_BATCH_SIZE]
+        hf_token = self._creds["huggingface"]
+        if not hf_token:
+            raise ProviderError(" HuggingFace token not configured or invalid")
         try:
-            hf_token = os.getenv("HUGGINGFACE_TOKEN")
-            if not hf_token or not self.security.validate_api_key(hf_token, "huggingface"):
-                return " HuggingFace token not configured or invalid"
-            
             response = self.session.post(
                 "https://api-inference.huggingface.co/models/microsoft/DialoGPT-medium",
                 headers={"Authorization": f"Bearer {hf_token}"},
-                json={"inputs": prompt[:MAX_INPUT_LENGTH]}
+                json={"inputs": [p[:MAX_INPUT_LENGTH] for p in prompts]},
+                timeout=REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
                 result = response.json()
-                if isinstance(result, list) and result:
-                    return result[0].get("generated_text", "No response")[:MAX_RESPONSE_LENGTH]
-            
-            return f" HuggingFace API Error: {response.status_code}"
+                if isinstance(result, list) and len(result) == len(prompts):
+                    texts = []
+                    for item in result:
+                        # Batched text generation may nest each output in its own list
+                        if isinstance(item, list):
+                            item = item[0] if item else {}
+                        texts.append(item.get("generated_text", "No response")[:MAX_RESPONSE_LENGTH])
+                    return texts
         except Exception as e:
-            return f" HuggingFace unavailable: {str(e)[:50]}..."
+            raise ProviderError(f" HuggingFace unavailable: {str(e)[:50]}...")
+        raise ProviderError(f" HuggingFace API Error: {response.status_code}")
     
+    def _q_gemini(self, clean_prompt: str, model: str) -> str:
+        if not self.gemini:
+            raise ProviderError(f" Model '{model}' not available")
+        response = self.gemini.generate_content(
+            clean_prompt,
+            generation_config=_lazy("genai").types.GenerationConfig(
+                temperature=0.7,
+                max_output_tokens=MAX_OUTPUT_TOKENS
+            )
+        )
+        
+        if not response or not hasattr(response, 'text') or not response.text:
+            raise APIError("Invalid Gemini response")
+        return response.text[:MAX_RESPONSE_LENGTH]
+
+    def _q_groq(self, clean_prompt: str, model: str) -> str:
+        if not self.groq:
+            raise ProviderError(f" Model '{model}' not available")
+        response = self.groq.chat.completions.create(
+            messages=[{"role": "user", "content": clean_prompt}],
+            model="mixtral-8x7b-32768",
+            max_tokens=MAX_OUTPUT_TOKENS
+        )
+        
+        if not response or not response.choices or not response.choices[0].message.content:
+            raise APIError("Invalid Groq response")
+        return response.choices[0].message.content[:MAX_RESPONSE_LENGTH]
+
+    def _q_ollama(self, clean_prompt: str, model: str) -> str:
+        if not self._check_ollama():
+            raise ProviderError(" Ollama not available")
+        
+        # Extract specific model name if provided
+        if ":" in model:
+            ollama_model = model.split(":", 1)[1]
+        else:
+            ollama_model = "llama3"  # Default fallback
+        
+        try:
+            # Talk to the daemon's REST API directly; the SDK only wraps this call
+            resp = self._ollama_chat(ollama_model, clean_prompt, stream=False)
+            content = (resp.json().get("message") or {}).get("content", "")
+            if not content:
+                raise APIError("Empty Ollama response")
+        except Exception as e:
+            raise ProviderError(f" Error: {str(e)}")
+        return content[:MAX_RESPONSE_LENGTH]
+
+    def _ollama_chat(self, ollama_model: str, clean_prompt: str, stream: bool) -> requests.Response:
+        resp = self.session.post(
+            f"{self._creds['ollama_url']}/api/chat",
+            json={
+                "model": ollama_model,
+                "messages": [{"role": "user", "content": clean_prompt}],
+                "stream": stream
+            },
+            stream=stream,
+            timeout=REQUEST_TIMEOUT
+        )
+        resp.raise_for_status()
+        return resp
+
+    def _q_huggingface(self, clean_prompt: str, model: str) -> str:
+        return self._query_huggingface(clean_prompt)
+
+    def _q_chatgpt(self, clean_prompt: str, model: str) -> str:
+        if not self._creds["openai"]:
+            raise ProviderError(" OpenAI API key not configured or invalid")
+        response = _lazy("openai").ChatCompletion.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": clean_prompt}],
+            max_tokens=MAX_OUTPUT_TOKENS
+        )
+        if not response or not response.choices or not response.choices[0].message.content:
+            raise APIError("Invalid ChatGPT response")
+        return response.choices[0].message.content[:MAX_RESPONSE_LENGTH]
+
+    def _q_mcp(self, clean_prompt: str, model: str) -> str:
+        mcp_key = self._creds["mcp"]
+        if not mcp_key:
+            raise ProviderError(" MCP API key not configured")
+        headers = {"Authorization": f"Bearer {mcp_key}", "Content-Type": "application/json"}
+        data = {"prompt": clean_prompt, "max_tokens": MAX_OUTPUT_TOKENS}
+        try:
+            resp = self.session.post(self._creds["mcp_url"], headers=headers, json=data, timeout=REQUEST_TIMEOUT)
+        except Exception as e:
+            raise ProviderError(f" MCP unavailable: {str(e)[:50]}...")
+        if resp.status_code != 200:
+            raise ProviderError(f" MCP API Error: {resp.status_code}")
+        try:
+            return resp.json().get("text", "No response")[:MAX_RESPONSE_LENGTH]
+        except Exception as e:
+            raise ProviderError(f" MCP unavailable: {str(e)[:50]}...")
+
     def query(self, model: str, prompt: str) -> str:
         if not prompt or len(prompt.strip()) == 0:
             return " Empty prompt provided"
@@ -557,120 +943,25 @@ class AIManager:
         except SecurityError as e:
             return f" Security error: {str(e)}"
         
+        # Only Ollama takes a "provider:model" suffix
+        handler = self._handlers.get("ollama" if model.startswith("ollama:") else model)
+        if handler is None:
+            return f" Model '{model}' not available"
+        
         # Check cache
-        cache_key = (model, hashlib.sha256(clean_prompt.encode()).hexdigest())
-        cached = _prompt_cache.get(cache_key)
+        cache_key = (model, _prompt_digest(clean_prompt))
+        cached = _prompt_cache.get(cache_key, clean_prompt)
         if cached:
             return cached
         
         for attempt in range(MAX_RETRIES):
             try:
-                if model == "gemini" and self.gemini:
-                    response = self.gemini.generate_content(
-                        clean_prompt,
-                        generation_config=genai.types.GenerationConfig(
-                            temperature=0.7,
-                            max_output_tokens=MAX_OUTPUT_TOKENS
-                        )
-                    )
-                    
-                    if not response or not hasattr(response, 'text') or not response.text:
-                        raise APIError("Invalid Gemini response")
-                    result_text = response.text[:MAX_RESPONSE_LENGTH]
-                    _prompt_cache.set(cache_key, result_text)
-                    return result_text
-                
-                elif model == "groq" and self.groq:
-                    response = self.groq.chat.completions.create(
-                        messages=[{"role": "user", "content": clean_prompt}],
-                        model="mixtral-8x7b-32768",
-                        max_tokens=MAX_OUTPUT_TOKENS
-                    )
-                    
-                    if not response or not response.choices or not response.choices[0].message.content:
-                        raise APIError("Invalid Groq response")
-                    
-                    result_text = response.choices[0].message.content[:MAX_RESPONSE_LENGTH]
-                    _prompt_cache.set(cache_key, result_text)
-                    return result_text
-                
-                elif model == "ollama" or model.startswith("ollama:"):
-                    if not self._check_ollama():
-                        return " Ollama not available"
-                    
-                    # Extract specific model name if provided
-                    if ":" in model:
-                        ollama_model = model.split(":", 1)[1]
-                    else:
-                        ollama_model = "llama3"  # Default fallback
-                    
-                    try:
-                        response = ollama.chat(
-                            model=ollama_model,
-                            messages=[{"role": "user", "content": clean_prompt}]
-                        )
-                        
-                        # Handle both dict and ChatResponse object
-                        if hasattr(response, 'message'):
-                            # It's a ChatResponse object
-                            if hasattr(response.message, 'content'):
-                                content = response.message.content
-                            else:
-                                content = str(response.message)
-                        elif isinstance(response, dict) and "message" in response:
-                            # It's a dict
-                            content = response["message"].get("content", "")
-                        else:
-                            raise APIError(f"Invalid Ollama response type: {type(response)}")
-                        
-                        if not content:
-                            raise APIError("Empty Ollama response")
-                        
-                        result_text = content[:MAX_RESPONSE_LENGTH]
-                        _prompt_cache.set(cache_key, result_text)
-                        return result_text
-                    except Exception as e:
-                        return f" Error: {str(e)}"
-                elif model == "huggingface":
-                    result_text = self._query_huggingface(clean_prompt)
-                    _prompt_cache.set(cache_key, result_text)
-                    return result_text
-                
-                elif model == "chatgpt":
-                    openai_key = os.getenv("OPENAI_API_KEY")
-                    if not openai_key or not self.security.validate_api_key(openai_key, "generic"):
-                        return " OpenAI API key not configured or invalid"
-                    response = openai.ChatCompletion.create(
-                        model="gpt-3.5-turbo",
-                        messages=[{"role": "user", "content": clean_prompt}],
-                        max_tokens=MAX_OUTPUT_TOKENS
-                    )
-                    if not response or not response.choices or not response.choices[0].message.content:
-                        raise APIError("Invalid ChatGPT response")
-                    result_text = response.choices[0].message.content[:MAX_RESPONSE_LENGTH]
-                    _prompt_cache.set(cache_key, result_text)
-                    return result_text
+                result_text = handler(clean_prompt, model)
+                _prompt_cache.set(cache_key, result_text, clean_prompt)
+                return result_text
                 
-                elif model == "mcp":
-                    mcp_key = os.getenv("MCP_API_KEY")
-                    mcp_url = os.getenv("MCP_URL", "http://localhost:8080/api/v1/completions")
-                    if not mcp_key:
-                        return " MCP API key not configured"
-                    headers = {"Authorization": f"Bearer {mcp_key}", "Content-Type": "application/json"}
-                    data = {"prompt": clean_prompt, "max_tokens": MAX_OUTPUT_TOKENS}
-                    try:
-                        resp = self.session.post(mcp_url, headers=headers, json=data, timeout=REQUEST_TIMEOUT)
-                        if resp.status_code == 200:
-                            result = resp.json()
-                            result_text = result.get("text", "No response")[:MAX_RESPONSE_LENGTH]
-                            _prompt_cache.set(cache_key, result_text)
-                            return result_text
-                        return f" MCP API Error: {resp.status_code}"
-                    except Exception as e:
-                        return f" MCP unavailable: {str(e)[:50]}..."
-                
-                else:
-                    return f" Model '{model}' not available"
+            except ProviderError as e:
+                return str(e)
                 
             except APIError as e:
                 if attempt == MAX_RETRIES - 1:
@@ -678,89 +969,311 @@ class AIManager:
                 time.sleep(RATE_LIMIT_DELAY * (attempt + 1))
                 
             except Exception as e:
-                logging.warning(f"Attempt {attempt+1} failed for {model}: {str(e)}")
+                logging.warning("Attempt %d failed for %s: %s", attempt + 1, model, e)
                 if attempt == MAX_RETRIES - 1:
                     return f" {model} error: {str(e)[:50]}..."
                 time.sleep(RATE_LIMIT_DELAY * (attempt + 1))
         
         return f" {model} unavailable after {MAX_RETRIES} attempts"
 
+    async def query_async(self, model: str, prompt: str) -> str:
+        """Awaitable ``query`` that keeps the provider round-trip off the event loop."""
+        return await asyncio.to_thread(self.query, model, prompt)
+
+    async def query_many_async(self, models: list[str], prompt: str) -> Dict[str, str]:
+        """Send ``prompt`` to several models at once; wall time is the slowest reply."""
+        results = await asyncio.gather(*(self.query_async(model, prompt) for model in models))
+        return dict(zip(models, results))
+
+    def _provider_stream(self, model: str, clean_prompt: str) -> Optional[Iterator[str]]:
+        """Start a streaming completion, or return None if ``model`` cannot stream."""
+        messages = [{"role": "user", "content": clean_prompt}]
+        if model == "gemini" and self.gemini:
+            response = self.gemini.generate_content(
+                clean_prompt,
+                generation_config=_lazy("genai").types.GenerationConfig(
+                    temperature=0.7,
+                    max_output_tokens=MAX_OUTPUT_TOKENS
+                ),
+                stream=True
+            )
+            return (chunk.text for chunk in response)
+        if model == "groq" and self.groq:
+            response = self.groq.chat.completions.create(
+                messages=messages,
+                model="mixtral-8x7b-32768",
+                max_tokens=MAX_OUTPUT_TOKENS,
+                stream=True
+            )
+            return (getattr(chunk.choices[0].delta, "content", None) for chunk in response if chunk.choices)
+        if (model == "ollama" or model.startswith("ollama:")) and self._check_ollama():
+            ollama_model = model.split(":", 1)[1] if ":" in model else "llama3"
+            resp = self._ollama_chat(ollama_model, clean_prompt, stream=True)
+            # One JSON object per line, each carrying the next piece of the message
+            return ((json.loads(line).get("message") or {}).get("content", "")
+                    for line in resp.iter_lines() if line)
+        if model == "chatgpt" and self._creds["openai"]:
+            response = _lazy("openai").ChatCompletion.create(
+                model="gpt-3.5-turbo",
+                messages=messages,
+                max_tokens=MAX_OUTPUT_TOKENS,
+                stream=True
+            )
+            return (getattr(chunk.choices[0].delta, "content", None) for chunk in response if chunk.choices)
+        return None
+
+    def query_stream(self, model: str, prompt: str) -> Iterator[str]:
+        """Yield the response to ``prompt`` as the provider produces it.
+
+        Providers without a streaming API, and streams that fail before the
+        first chunk, fall back to the blocking :meth:`query`.
+        """
+        try:
+            clean_prompt = self.security.sanitize(prompt) if prompt and prompt.strip() else None
+        except SecurityError:
+            clean_prompt = None
+        if clean_prompt is None:
+            yield self.query(model, prompt)
+            return
+
+        cache_key = (model, _prompt_digest(clean_prompt))
+        cached = _prompt_cache.get(cache_key, clean_prompt)
+        if cached:
+            yield cached
+            return
+
+        parts = []
+        size = 0
+        try:
+            chunks = self._provider_stream(model, clean_prompt)
+            if chunks is not None:
+                for piece in chunks:
+                    if not piece:
+                        continue
+                    piece = piece[:MAX_RESPONSE_LENGTH - size]
+                    parts.append(piece)
+                    size += len(piece)
+                    yield piece
+                    if size >= MAX_RESPONSE_LENGTH:
+                        break
+        except Exception as e:
+            logging.warning("Streaming from %s failed: %s", model, e)
+            if parts:
+                yield f"\n {model} stream interrupted: {str(e)[:50]}..."
+                return
+        if parts:
+            _prompt_cache.set(cache_key, "".join(parts), clean_prompt)
+        else:
+            yield self.query(model, prompt)
+
 # --- User Management ---
+try:
+    import bcrypt as _BCRYPT
+except ImportError:
+    _BCRYPT = None
+
+_BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+# bcrypt of b"dummy" at the default cost; login() checks unknown usernames against it
+_DUMMY_BCRYPT_HASH = b'$2b$12$C2/mX7pwW.u77LRm1cVewOFwouDvZ6FiVZIPuxw8kf9p3UYnz/55G'
+
+def _bcrypt_cost() -> int:
+    """AETHER_BCRYPT_COST clamped to bcrypt's 4-31 range; 12 if unset or malformed."""
+    raw = os.environ.get("AETHER_BCRYPT_COST")
+    if raw is None:
+        return 12
+    try:
+        cost = int(raw)
+    except ValueError:
+        logging.warning("Ignoring AETHER_BCRYPT_COST=%r: not an integer; using 12", raw)
+        return 12
+    if not 4 <= cost <= 31:
+        logging.warning("AETHER_BCRYPT_COST=%d is outside bcrypt's 4-31 range; clamping", cost)
+        cost = min(max(cost, 4), 31)
+    return cost
+
+# One exit hook flushes whichever managers are still alive; the set doesn't keep them so
+_live_user_managers = weakref.WeakSet()
+
+@atexit.register
+def _flush_user_managers():
+    for manager in list(_live_user_managers):
+        manager.flush()
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(obj) -> bytes:
+    """Encode ``obj`` as JSON bytes, using orjson when it is installed."""
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode()
+
+
+def _json_loads(data: bytes):
+    """Decode a JSON payload, using orjson when it is installed."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+# Below this size a plain read() is cheaper than setting up a mapping
+_MMAP_MIN_SIZE = 128 * 1024
+
+
+def _load_json_file(f):
+    """Decode JSON from a binary file, mapping large files straight into orjson."""
+    if orjson is not None and os.fstat(f.fileno()).st_size >= _MMAP_MIN_SIZE:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+        except (OSError, ValueError):
+            # mmap unsupported here (or a file that shrank); fall back to read()
+            f.seek(0)
+    return _json_loads(f.read())
+
 class UserManager:
     def __init__(self):
+        self._bcrypt = _BCRYPT
+        self._sha256 = hashlib.sha256
+        self.bcrypt_cost = _bcrypt_cost()
+        # Ready before the first login so even that probe pays one bcrypt check
+        self._dummy_hash = _DUMMY_BCRYPT_HASH
+        if self._bcrypt is not None and not self._dummy_hash.startswith(b'$2b$%02d$' % self.bcrypt_cost):
+            self._dummy_hash = self._bcrypt.hashpw(b"dummy", self._bcrypt.gensalt(rounds=self.bcrypt_cost))
+        self._save_lock = threading.Lock()
+        # Serialises whole writes so the timer and an exit flush can't share the temp file
+        self._write_lock = threading.Lock()
+        self._save_delay = 0.5
+        self._save_timer = None
+        self._dirty = False
+        _live_user_managers.add(self)
+        # Fixed per instance so a pending save can't land in a later HOME
+        self.user_db_path = USER_DB_PATH()
         self.user_db = self._load_users()
         self.current_user = None
         self.chat_history = {}
         self.admins = set(["admin"])  # Default admin user
         self.last_active = {}
         self.activity_log = {}
-        self.audit_log = []
+        self.audit_log = deque(maxlen=500)
         self.session_timeout = 900  # 15 minutes
-        self._start_timeout_thread()
 
     def _load_users(self):
-        path = USER_DB_PATH()
+        path = self.user_db_path
         if os.path.exists(path):
-            with open(path, 'r') as f:
+            with open(path, 'rb') as f:
                 try:
-                    return json.load(f)
+                    return _load_json_file(f)
                 except Exception:
                     return {}
         return {}
 
     def _save_users(self):
-        path = USER_DB_PATH()
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'w') as f:
-            json.dump(self.user_db, f)
+        """Write the user DB to a 0600 temp file and swap it in with ``os.replace``."""
+        path = self.user_db_path
+        with self._write_lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_json_dumps(self.user_db))
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                # O_CREAT's mode doesn't apply to a leftover temp file
+                os.chmod(tmp_path, 0o600)
+            except Exception:
+                # On Windows, os.chmod with those modes may fail; ignore
+                pass
+            os.replace(tmp_path, path)
+
+    def _mark_dirty(self):
+        """Schedule a save; a burst of changes within the delay is written once"""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self._save_delay, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self):
+        """Write any pending user DB changes to disk immediately"""
+        with self._save_lock:
+            timer, self._save_timer = self._save_timer, None
+            dirty, self._dirty = self._dirty, False
+        if timer is not None:
+            timer.cancel()
+        if not dirty:
+            return
         try:
-            os.chmod(path, 0o600)
-        except Exception:
-            # On Windows, os.chmod with those modes may fail; ignore
-            pass
+            self._save_users()
+        except Exception as e:
+            logging.error("Saving user DB failed: %s", e)
+            self._mark_dirty()
 
     def hash_password(self, password) -> str:
-        """Hash a password using bcrypt (via passlib). If passlib isn't available,
+        """Hash a password using bcrypt. If the bcrypt package isn't available,
         fall back to SHA256 for compatibility (but log a warning).
         New hashes will use bcrypt; legacy SHA256 hashes will be detected and migrated on login.
         """
+        if self._bcrypt is None:
+            logging.warning("bcrypt not available; falling back to SHA256 (insecure)")
+            return self._sha256(password.encode()).hexdigest()
         try:
-            from passlib.hash import bcrypt
-            try:
-                # Use passlib bcrypt to create a salted hash
-                return bcrypt.hash(password)
-            except Exception as e:
-                # If bcrypt backend fails at runtime (some systems have broken bcrypt),
-                # fall back to SHA256 but log the error for diagnostics.
-                logging.warning(f"bcrypt hashing failed, falling back to SHA256: {e}")
-                return hashlib.sha256(password.encode()).hexdigest()
-        except Exception:
-            logging.warning("passlib not available; falling back to SHA256 (insecure)")
-            return hashlib.sha256(password.encode()).hexdigest()
+            # bcrypt only uses the first 72 bytes; truncate as passlib used to
+            return self._bcrypt.hashpw(password.encode()[:72], self._bcrypt.gensalt(rounds=self.bcrypt_cost)).decode()
+        except Exception as e:
+            # If bcrypt backend fails at runtime (some systems have broken bcrypt),
+            # fall back to SHA256 but log the error for diagnostics.
+            logging.warning("bcrypt hashing failed, falling back to SHA256: %s", e)
+            return self._sha256(password.encode()).hexdigest()
 
     def _verify_password(self, password: str, stored_hash: str) -> bool:
         """Verify a plaintext password against a stored hash.
 
-        Supports passlib bcrypt hashes and legacy SHA256 hex digests.
+        Supports bcrypt hashes (including those written by passlib) and legacy
+        SHA256 hex digests.
         """
         if not stored_hash or not isinstance(stored_hash, str):
             return False
-        # Try passlib bcrypt verification first
-        try:
-            from passlib.hash import bcrypt
+        if stored_hash.startswith(_BCRYPT_PREFIXES):
+            if self._bcrypt is None:
+                logging.warning("bcrypt not available; cannot verify bcrypt password hash")
+                return False
             try:
-                return bcrypt.verify(password, stored_hash)
-            except Exception:
-                # If verification fails due to backend issues, fall through to sha256 check
-                pass
-        except Exception:
-            # passlib not available; fall back to SHA256
-            pass
+                # checkpw compares in constant time
+                return self._bcrypt.checkpw(password.encode()[:72], stored_hash.encode())
+            except ValueError:
+                return False
+
+        # Legacy SHA256 hex digest; compare the raw 32-byte digests. These are
+        # migrated to bcrypt on first login, so the decoded form is not cached.
+        try:
+            expected = bytes.fromhex(stored_hash)
+        except ValueError:
+            return False
+        return hmac.compare_digest(expected, self._sha256(password.encode()).digest())
+
+    def _needs_rehash(self, stored_hash: str) -> bool:
+        """True for legacy SHA256 digests and bcrypt hashes below the current cost."""
+        if self._bcrypt is None:
+            return False
+        if not stored_hash.startswith(_BCRYPT_PREFIXES):
+            return True
+        try:
+            return int(stored_hash.split('$')[2]) < self.bcrypt_cost
+        except (IndexError, ValueError):
+            return False
 
-        # Legacy SHA256 hex digest
+    def _maybe_rehash(self, username: str, password: str, stored_hash: str) -> bool:
+        """Upgrade a verified password's hash in place; saves at most once per login."""
         try:
-            return stored_hash == hashlib.sha256(password.encode()).hexdigest()
+            if not self._needs_rehash(stored_hash):
+                return False
+            self.user_db[username]["password"] = self.hash_password(password)
+            self._mark_dirty()
+            return True
         except Exception:
+            # If migration fails, the login still succeeds with the old hash
             return False
 
     def signup(self, username, password, is_admin=False):
@@ -772,33 +1285,26 @@ class UserManager:
             "model": "gemini",
             "role": "admin" if is_admin else "user"
         }
-        self._save_users()
+        self._mark_dirty()
         return True, "Signup successful."
 
     def login(self, username, password):
         user = self.user_db.get(username)
         if not user:
+            # Spend the same bcrypt work as a real check so timing doesn't reveal
+            # whether the username exists
+            if self._bcrypt is not None:
+                self._bcrypt.checkpw(password.encode()[:72], self._dummy_hash)
             return False, "Invalid username or password."
 
         stored = user.get("password")
 
-        # Verify password against stored hash (supports bcrypt via passlib and legacy sha256)
+        # Verify password against stored hash (supports bcrypt and legacy sha256)
         try:
             if self._verify_password(password, stored):
-                # If stored was a legacy SHA256 and passlib is available, migrate to bcrypt
-                try:
-                    # Detect legacy sha256 by length (64 hex chars)
-                    if isinstance(stored, str) and len(stored) == 64:
-                        # Attempt to re-hash using hash_password (which will prefer bcrypt)
-                        new_hash = self.hash_password(password)
-                        self.user_db[username]["password"] = new_hash
-                        self._save_users()
-                        return True, f"Welcome, {username}! (password migrated)"
-                except Exception:
-                    # If migration fails, continue to login normally
-                    pass
-
                 self.current_user = username
+                if self._maybe_rehash(username, password, stored):
+                    return True, f"Welcome, {username}! (password migrated)"
                 return True, f"Welcome, {username}!"
         except Exception:
             # Fall through to invalid login
@@ -810,7 +1316,7 @@ class UserManager:
         if not self.current_user:
             return False, "Not logged in."
         self.user_db[self.current_user]["api_keys"][provider] = key
-        self._save_users()
+        self._mark_dirty()
         return True, f"API key for {provider} set."
 
     def get_api_key(self, provider):
@@ -822,7 +1328,7 @@ class UserManager:
         if not self.current_user:
             return False, "Not logged in."
         self.user_db[self.current_user]["model"] = model
-        self._save_users()
+        self._mark_dirty()
         return True, f"Model set to {model}."
 
     def get_model(self):
@@ -840,7 +1346,7 @@ class UserManager:
         if username not in self.user_db:
             return False, "User not found."
         self.user_db[username]["password"] = self.hash_password(newpassword)
-        self._save_users()
+        self._mark_dirty()
         return True, "Password reset."
 
     def list_users(self):
@@ -848,51 +1354,531 @@ class UserManager:
 
     def add_history(self, username, message):
         if username not in self.chat_history:
-            self.chat_history[username] = []
+            self.chat_history[username] = deque(maxlen=50)
         self.chat_history[username].append(message)
-        if len(self.chat_history[username]) > 50:
-            self.chat_history[username] = self.chat_history[username][-50:]
 
     def get_history(self, username):
-        return self.chat_history.get(username, [])
+        return list(self.chat_history.get(username, ()))
 
     def clear_history(self, username):
-        self.chat_history[username] = []
-
-    def _start_timeout_thread(self):
-        def timeout_checker():
-            while True:
-                now = time.time()
-                for user, last in list(self.last_active.items()):
-                    if self.current_user == user and now - last > self.session_timeout:
-                        self.current_user = None
-                time.sleep(60)
-        t = threading.Thread(target=timeout_checker, daemon=True)
-        t.start()
+        self.chat_history.pop(username, None)
 
-    def update_activity(self, username, action):
-        def _do_update():
+    @property
+    def current_user(self):
+        """The logged-in user, or None once the session has been idle too long.
+
+        Expiry is checked lazily on access, so idle sessions need no watcher thread.
+        """
+        user = self._current_user
+        if user is not None:
+            last = self.last_active.get(user)
+            if last is not None and time.time() - last > self.session_timeout:
+                self._current_user = user = None
+        return user
+
+    @current_user.setter
+    def current_user(self, username):
+        self._current_user = username
+        if username is not None:
+            # A fresh login starts a fresh idle window, not the one that expired
             self.last_active[username] = time.time()
-            if username not in self.activity_log:
-                self.activity_log[username] = []
-            self.activity_log[username].append((time.strftime('%Y-%m-%d %H:%M:%S'), action))
-            if len(self.activity_log[username]) > 100:
-                self.activity_log[username] = self.activity_log[username][-100:]
-            self.audit_log.append((username, time.strftime('%Y-%m-%d %H:%M:%S'), action))
-            if len(self.audit_log) > 500:
-                self.audit_log = self.audit_log[-500:]
-        _run_in_background(_do_update)
+
+    def update_activity(self, username, action):
+        # A few appends: cheaper inline than handing off to a worker
+        self.last_active[username] = time.time()
+        ts = time.strftime('%Y-%m-%d %H:%M:%S')
+        if username not in self.activity_log:
+            self.activity_log[username] = deque(maxlen=100)
+        self.activity_log[username].append((ts, action))
+        self.audit_log.append((username, ts, action))
+
+# --- Subprocess Output ---
+import tempfile
+
+_GIT_OUTPUT_LIMIT = 64 * 1024
+
+def _run_capped(argv, limit: int, timeout: float, cwd: Optional[str] = None):
+    """Run argv keeping at most `limit` bytes of stdout and stderr.
+
+    The child is killed once stdout passes the cap rather than drained, so a
+    huge `git log` costs no more than what is shown. Returns
+    (returncode, stdout, stderr, truncated); a truncated run reports 0.
+    """
+    timed_out = threading.Event()
+    with tempfile.TemporaryFile() as err_file, \
+            subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=err_file, cwd=cwd) as proc:
+        timer = threading.Timer(timeout, lambda: (timed_out.set(), proc.kill()))
+        timer.start()
+        try:
+            out = proc.stdout.read(limit + 1)
+            truncated = len(out) > limit
+            if truncated:
+                proc.kill()
+            proc.wait()
+        finally:
+            timer.cancel()
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(argv, timeout)
+        err_file.seek(0)
+        err = err_file.read(limit)
+    if truncated:
+        # Drop the partial last line so line-based formatters see whole records
+        out = out[:limit]
+        out = out[:out.rfind(b'\n') + 1] or out
+    returncode = 0 if truncated else proc.returncode
+    return returncode, out.decode('utf-8', 'replace'), err.decode('utf-8', 'replace'), truncated
+
+def _parse_status_v2(output: bytes) -> dict:
+    """Summarize raw `git status --porcelain=v2 --branch -z` output in one pass.
+
+    Works on bytes so file entries are never decoded; only header values are.
+    """
+    status = {'oid': None, 'head': None}
+    staged = unstaged = untracked = 0
+    records = iter(output.split(b'\0'))
+    for rec in records:
+        kind = rec[:1]
+        if kind and kind in b'12u':
+            # "<kind> XY ..."; '.' marks an unchanged side
+            staged += rec[2:3] != b'.'
+            unstaged += rec[3:4] != b'.'
+            if kind == b'2':
+                next(records, None)  # rename/copy source path, which may itself look like a record
+        elif kind == b'?':
+            untracked += 1
+        elif kind == b'#':
+            name, _, value = rec[2:].partition(b' ')
+            if name in (b'branch.oid', b'branch.head'):
+                status[name[7:].decode()] = value.decode('utf-8', 'replace')
+    status.update(staged=staged, unstaged=unstaged, untracked=untracked)
+    return status
+
+class _GitObjectReader:
+    """Long-lived `git cat-file --batch` process for reading objects by name.
+
+    Spawned on first use and respawned if the working directory changes, so
+    repeated lookups skip git's process start-up.
+    """
+
+    def __init__(self):
+        self._proc = None
+        self._cwd = None
+        self._lock = threading.Lock()
+
+    def read(self, spec: str) -> Optional[tuple]:
+        """Return (type, content bytes) for e.g. "HEAD" or "HEAD:README.md", or None."""
+        if not spec or '\n' in spec:
+            return None
+        with self._lock:
+            cwd = os.getcwd()
+            if self._proc is None or self._proc.poll() is not None or self._cwd != cwd:
+                self._close()
+                try:
+                    self._proc = subprocess.Popen(['git', 'cat-file', '--batch'], stdin=subprocess.PIPE,
+                                                  stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=cwd)
+                except OSError:
+                    return None
+                self._cwd = cwd
+            try:
+                self._proc.stdin.write(spec.encode() + b'\n')
+                self._proc.stdin.flush()
+                # "<sha> <type> <size>", or "<spec> missing" / "<spec> ambiguous"
+                fields = self._proc.stdout.readline().split()
+                if len(fields) != 3:
+                    if not fields:
+                        self._close()
+                    return None
+                data = self._proc.stdout.read(int(fields[2]) + 1)[:-1]
+                return fields[1].decode(), data
+            except (OSError, ValueError):
+                self._close()
+                return None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        if self._proc is not None:
+            try:
+                self._proc.stdin.close()
+                self._proc.wait(timeout=1)
+            except (OSError, subprocess.SubprocessError):
+                self._proc.kill()
+            self._proc = None
+
+
+def _commit_subject(data: bytes) -> str:
+    """First line of a raw commit object's message."""
+    _, _, message = data.partition(b'\n\n')
+    return message.split(b'\n', 1)[0].decode('utf-8', 'replace')
+
+def _git_state(cwd: str) -> Optional[tuple]:
+    """Cheap fingerprint of a repository's HEAD, refs, config and packs.
+
+    Reads the (tiny) HEAD and branch ref files and stats the rest, so it stays
+    exact across quick successive commits. None when no .git directory is found.
+    """
+    for git_dir in (os.path.join(cwd, '.git'), os.path.join(cwd, '..', '.git')):
+        if os.path.isdir(git_dir):
+            break
+    else:
+        return None
+
+    def read(name):
+        try:
+            with open(os.path.join(git_dir, name), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def stat(name):
+        try:
+            st = os.stat(os.path.join(git_dir, name))
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    head = read('HEAD')
+    if head is None:
+        return None
+    ref = read(head[5:].strip().decode()) if head.startswith(b'ref: ') else None
+    return head, ref, stat('packed-refs'), stat('config'), stat(os.path.join('objects', 'pack'))
+
+# --- Code Search ---
+# Tool and dependency directories never worth searching
+_SEARCH_SKIP_DIRS = frozenset({
+    '.git', '__pycache__', 'node_modules', '.venv', 'venv', 'dist', 'build', '.mypy_cache',
+    '.pytest_cache', '.tox',
+})
+
+
+def _iter_search_paths():
+    for root, dirs, files in os.walk(os.getcwd()):
+        # Prune in place so os.walk never descends into them
+        dirs[:] = [d for d in dirs if d not in _SEARCH_SKIP_DIRS]
+        for file in files:
+            yield os.path.join(root, file)
+
+
+_SCAN_MAX_SIZE = 8 * 1024 * 1024
+
+
+def _scan_buffer(buf, name: str, pattern, limit: int) -> List[str]:
+    """First `limit` matching lines of a bytes-like buffer, one hit per line."""
+    hits = []
+    pos = counted = 0
+    lineno = 1
+    while len(hits) < limit:
+        match = pattern.search(buf, pos)
+        if match is None:
+            break
+        start = buf.rfind(b'\n', 0, match.start()) + 1
+        end = buf.find(b'\n', match.end())
+        if end == -1:
+            end = len(buf)
+        # Line numbers are only worked out for matching lines, counting on from the last one
+        lineno += buf[counted:start].count(b'\n')
+        counted = start
+        hits.append(f"{name}:{lineno}: {buf[start:end].decode('utf-8', 'ignore').strip()}")
+        pos = end + 1
+    return hits
+
+
+def _scan_file(path: str, pattern, limit: int) -> List[str]:
+    """Scan one file with a compiled bytes pattern; skips empty, huge and binary files."""
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size or size > _SCAN_MAX_SIZE or b'\0' in f.read(1024):
+                return []
+            name = os.path.basename(path)
+            if size < _MMAP_MIN_SIZE:
+                f.seek(0)
+                return _scan_buffer(f.read(), name, pattern, limit)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _scan_buffer(mm, name, pattern, limit)
+    except (OSError, ValueError):
+        return []
+
+
+def _walk_search(needles, limit: int) -> List[str]:
+    """Substring search over files under cwd, used outside git repositories.
+
+    Files are read on a thread pool in small batches, keeping walk order, and
+    no new batch is started once `limit` hits are in.
+    """
+    matches = []
+    paths = _iter_search_paths()
+    pattern = re.compile(b'|'.join(re.escape(n.encode()) for n in needles))
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        while len(matches) < limit:
+            batch = list(islice(paths, workers * 2))
+            if not batch:
+                break
+            for hits in pool.map(lambda p: _scan_file(p, pattern, limit), batch):
+                matches.extend(hits)
+                if len(matches) >= limit:
+                    break
+    finally:
+        pool.shutdown(cancel_futures=True)
+    return matches[:limit]
+
+
+def _search_files(needles, limit: int) -> List[str]:
+    """Up to `limit` "file:line: text" hits for any of `needles` under cwd.
+
+    Uses `git grep` (threaded C, honours .gitignore, skips binaries) and stops
+    reading once `limit` hits are in; falls back to a Python walk outside a repo.
+    """
+    argv = ['git', 'grep', '-nIFz', '--untracked', '--no-color']
+    for needle in needles:
+        argv += ['-e', needle]
+    try:
+        proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                text=True, errors='replace')
+    except OSError:
+        return _walk_search(needles, limit)
+    with proc:
+        lines = list(islice(proc.stdout, limit))
+        proc.kill()
+        proc.wait()
+    if not lines and proc.returncode == 128:  # not a repository
+        return _walk_search(needles, limit)
+    matches = []
+    for line in lines:
+        path, lineno, text = (line.split('\0', 2) + ['', ''])[:3]
+        matches.append(f"{os.path.basename(path)}:{lineno}: {text.strip()}")
+    return matches
+
+def _read_excerpt(path: str, limit: int = 2000) -> str:
+    """A file's text if it fits in `limit` bytes, otherwise its first and last halves.
+
+    Only the two ends are read, so long files are never paged in, and the tail
+    (usually the code being worked on) is no longer cut off after the imports.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= limit:
+            # Also bounds reads from special files that report a size of 0
+            data = f.read(limit)
+        else:
+            half = limit // 2
+            head = f.read(half)
+            f.seek(-half, os.SEEK_END)
+            data = head + b'\n...\n' + f.read(half)
+    return data.decode('utf-8', 'replace')
+
+# --- AI Prompt Templates ---
+# Shared by the file commands; `code` is a _read_excerpt of the named file
+_PROMPT_REVIEW = "Review this code for bugs and improvements:\n{code}"
+_PROMPT_SUMMARIZE = "Summarize this file:\n{code}"
+_PROMPT_FINDBUGS = "Find bugs in this code:\n{code}"
+_PROMPT_GENDOC = "Generate docstrings and comments for this code:\n{code}"
+_PROMPT_GENTEST = "Write unit tests for this code:\n{code}"
+_PROMPT_COMMITMSG = "Write a git commit message for this diff or file:\n{code}"
+_PROMPT_REFACTOR = "Refactor this code as per instruction '{instruction}':\n{code}"
+_PROMPT_SUGGEST = "Review this code and provide improvement suggestions:\n\n```{language}\n{code}\n```"
+
+
+@lru_cache(maxsize=1)
+def _help_text() -> Text:
+    """The /help command reference; it only depends on VERSION, so it is built once."""
+    help_text = Text()
+    help_text.append(f"\n🚀 AetherAI Terminal v{VERSION} - COMMAND REFERENCE\n\n", style="bold cyan")
+    help_text.append("📋 BASIC COMMANDS:\n", style="bold yellow")
+    help_text.append("/help          - Show this help menu\n", style="white")
+    help_text.append("/status        - Show detailed service status\n", style="white")
+    help_text.append("/security      - Show security information\n", style="white")
+    help_text.append("/clear         - Clear the screen\n", style="white")
+    help_text.append("/exit          - Quit application\n\n", style="white")
+    help_text.append("🤖 AI MODEL COMMANDS:\n", style="bold yellow")
+    help_text.append("/switch gemini      - Switch to Gemini 2.0 Flash\n", style="white")
+    help_text.append("/switch groq        - Switch to Groq Mixtral\n", style="white")
+    help_text.append("/switch ollama      - Switch to Ollama (default model)\n", style="white")
+    help_text.append("/switch ollama [model] - Switch to specific Ollama model\n", style="white")
+    help_text.append("/switch huggingface - Switch to HuggingFace\n", style="white")
+    help_text.append("/switch chatgpt     - Switch to ChatGPT (OpenAI)\n", style="white")
+    help_text.append("/switch mcp         - Switch to MCP (Model Context Protocol)\n\n", style="white")
+    help_text.append("⚙️ SYSTEM COMMANDS:\n", style="bold yellow")
+    help_text.append("/run [command]      - Execute safe system commands (ls, pwd, whoami, date, etc.)\n", style="white")
+    help_text.append("/models             - List available AI models\n", style="white")
+    help_text.append("/ollama-models      - Show detailed list of available Ollama models\n", style="white")
+    help_text.append("/current-model      - Show currently active AI model\n", style="white")
+    help_text.append("/config             - Show configuration\n", style="white")
+    help_text.append("/sysinfo            - Display system information and resources\n", style="white")
+    help_text.append("/calc [expression]  - Calculate mathematical expressions\n", style="white")
+    help_text.append("/explore            - Interactive file explorer for current directory\n", style="white")
+    help_text.append("/websearch [query]  - Search the web using DuckDuckGo\n", style="white")
+    help_text.append("/weather [city]     - Get current weather information\n", style="white")
+    help_text.append("/note [text]        - Save a quick note\n", style="white")
+    help_text.append("/notes              - View your saved notes\n", style="white")
+    help_text.append("/timer [seconds]    - Start a countdown timer\n", style="white")
+    help_text.append("/convert [val] [from] [to] - Unit converter (temp, weight, data)\n", style="white")
+    help_text.append("/joke               - Get a random joke\n", style="white")
+    help_text.append("/password [length]  - Generate a secure password\n", style="white")
+    help_text.append("/tip                - Get a random productivity tip\n", style="white")
+    help_text.append("/clear              - Clear the screen\n\n", style="white")
+
+    help_text.append("🔀 GIT VERSION CONTROL:\n", style="bold yellow")
+    help_text.append("/git status            - Show repository status\n", style="white")
+    help_text.append("/git add [files]       - Stage files for commit\n", style="white")
+    help_text.append("/git commit [message]  - Commit staged changes\n", style="white")
+    help_text.append("/git push              - Push commits to remote\n", style="white")
+    help_text.append("/git pull              - Pull changes from remote\n", style="white")
+    help_text.append("/git log [n]           - Show commit history\n", style="white")
+    help_text.append("/git diff              - Show unstaged changes\n", style="white")
+    help_text.append("/git diff --staged     - Show staged changes\n", style="white")
+    help_text.append("/git branch            - List branches\n", style="white")
+    help_text.append("/git checkout [branch] - Switch to branch\n", style="white")
+    help_text.append("/git merge [branch]    - Merge branch into current\n", style="white")
+    help_text.append("/git stash             - Stash current changes\n", style="white")
+    help_text.append("/git stash pop         - Apply stashed changes\n", style="white")
+    help_text.append("/git reset [file]      - Unstage file\n", style="white")
+    help_text.append("/git reset --hard      - Reset to last commit\n", style="white")
+    help_text.append("/git remote -v         - Show remote repositories\n", style="white")
+    help_text.append("/git blame [file]      - Show who changed each line\n", style="white")
+    help_text.append("/git cherry-pick [hash] - Apply specific commit\n", style="white")
+    help_text.append("/git rebase [branch]   - Rebase current branch\n", style="white")
+    help_text.append("/git bisect start      - Start binary search for bugs\n", style="white")
+    help_text.append("/git tag [name]        - Create a tag\n", style="white")
+    help_text.append("/git reflog            - Show reference log\n", style="white")
+    help_text.append("/git new-branch [name] - Create and switch to new branch\n", style="white")
+    help_text.append("/git undo-last-commit  - Undo last commit (keep changes)\n", style="white")
+    help_text.append("/git amend [message]   - Amend last commit message\n", style="white")
+    help_text.append("/git uncommit          - Uncommit but keep changes staged\n", style="white")
+    help_text.append("/git discard           - Discard all unstaged changes\n", style="white")
+    help_text.append("/git ignore [pattern]  - Add pattern to .gitignore\n", style="white")
+    help_text.append("/git repo-info         - Show comprehensive repo information\n", style="white")
+    help_text.append("/git contributors      - Show contributors by commit count\n", style="white")
+    help_text.append("/git file-history [f]  - Show history of a specific file\n", style="white")
+    help_text.append("/git stats             - Show repository statistics\n\n", style="white")
+
+    help_text.append("💡 EXAMPLES:\n", style="bold green")
+    help_text.append("• Write a Python function to sort a list\n", style="cyan")
+    help_text.append("• /switch ollama llama2:13b\n", style="cyan")
+    help_text.append("• /ollama-models\n", style="cyan")
+    help_text.append("• /run ls -la\n", style="cyan")
+    help_text.append("• Explain quantum computing\n\n", style="cyan")
+
+    # Add new advanced features section
+    help_text.append("🚀 ADVANCED FEATURES:\n", style="bold magenta")
+
+    help_text.append("🤖 CONTEXT-AWARE AI:\n", style="bold yellow")
+    help_text.append("/learn [topic]          - Teach AI about technologies\n", style="white")
+    help_text.append("/remind [task]          - Set task reminders\n", style="white")
+    help_text.append("/reminders              - View active reminders\n", style="white")
+    help_text.append("/complete-reminder [n]  - Mark reminder as complete\n\n", style="white")
+
+    help_text.append("📊 ANALYTICS & MONITORING:\n", style="bold yellow")
+    help_text.append("/analytics              - View usage statistics\n", style="white")
+    help_text.append("/error-analytics        - View error analytics\n", style="white")
+    help_text.append("/start-monitoring       - Start system monitoring\n", style="white")
+    help_text.append("/stop-monitoring        - Stop system monitoring\n", style="white")
+    help_text.append("/net-diag               - Network diagnostics\n", style="white")
+    help_text.append("/analyze-logs           - Analyze log files\n", style="white")
+    help_text.append("/health                 - System health check\n\n", style="white")
+
+    help_text.append("🎮 GAMES & LEARNING:\n", style="bold yellow")
+    help_text.append("/challenge [difficulty] - Get coding challenge\n", style="white")
+    help_text.append("/submit-challenge [id] [pid] [code] - Submit solution\n", style="white")
+    help_text.append("/tutorial [topic]       - Start interactive tutorial\n", style="white")
+    help_text.append("/tutorial-section [id] [num] - Get tutorial section\n", style="white")
+    help_text.append("/quiz [topic]           - Take interactive quiz\n", style="white")
+    help_text.append("/answer-quiz [id] [num] - Answer quiz question\n", style="white")
+    help_text.append("/user-stats             - View learning statistics\n\n", style="white")
+
+    help_text.append("🎨 CREATIVE TOOLS:\n", style="bold yellow")
+    help_text.append("/ascii [text]           - Generate ASCII art\n", style="white")
+    help_text.append("/colors [type] [base]   - Generate color schemes\n", style="white")
+    help_text.append("/music [mood] [length]  - Generate music patterns\n", style="white")
+    help_text.append("/story [genre] [length] - Generate creative stories\n\n", style="white")
+
+    help_text.append("🔒 ADVANCED SECURITY:\n", style="bold yellow")
+    help_text.append("/encrypt [message]      - Encrypt messages\n", style="white")
+    help_text.append("/decrypt [message]      - Decrypt messages\n", style="white")
+    help_text.append("/rotate-key [service] [key] - Rotate API keys\n", style="white")
+    help_text.append("/biometric-auth [data]  - Biometric authentication\n", style="white")
+    help_text.append("/secure-password [len]  - Generate secure passwords\n", style="white")
+    help_text.append("/security-report        - View security report\n", style="white")
+    help_text.append("/threat-scan [text]     - Scan for security threats\n\n", style="white")
+
+    help_text.append("🎨 THEME MANAGEMENT:\n", style="bold yellow")
+    help_text.append("/themes                  - List all available themes\n", style="white")
+    help_text.append("/theme set [name]        - Switch to a theme\n", style="white")
+    help_text.append("/theme current           - Show current theme\n", style="white")
+    help_text.append("/theme preview [name]    - Preview a theme\n", style="white")
+    help_text.append("/theme create [name] [base] - Create custom theme\n", style="white")
+    help_text.append("/theme delete [name]     - Delete custom theme\n", style="white")
+    help_text.append("/theme export [name] [fmt] - Export theme (json/python)\n", style="white")
+    help_text.append("/theme stats             - Show theme statistics\n", style="white")
+    help_text.append("/theme reset             - Reset to default theme\n\n", style="white")
+
+    help_text.append("� CODE REVIEW ASSISTANT:\n", style="bold yellow")
+    help_text.append("/review analyze [file]   - Full code analysis\n", style="white")
+    help_text.append("/review security [file]  - Security analysis only\n", style="white")
+    help_text.append("/review performance [file] - Performance analysis only\n", style="white")
+    help_text.append("/review quality [file]   - Quality metrics only\n", style="white")
+    help_text.append("/review compare [f1] [f2] - Compare two files\n", style="white")
+    help_text.append("/review suggest [file]   - AI improvement suggestions\n", style="white")
+    help_text.append("/review language [file]  - Detect programming language\n", style="white")
+    help_text.append("/review history          - Recent review history\n", style="white")
+    help_text.append("/review stats            - Review statistics\n\n", style="white")
+
+    help_text.append("�📝 TASK MANAGEMENT:\n", style="bold yellow")
+    help_text.append("/task add [title]       - Add a new task\n", style="white")
+    help_text.append("/task create [title]    - Create a new task\n", style="white")
+    help_text.append("/tasks                  - List all pending tasks\n", style="white")
+    help_text.append("/task show [id]         - Show task details\n", style="white")
+    help_text.append("/task complete [id]     - Mark task as completed\n", style="white")
+    help_text.append("/task delete [id]       - Delete a task\n", style="white")
+    help_text.append("/task update [id] [field] [value] - Update task field\n", style="white")
+    help_text.append("/task priority [id] [priority] - Set priority (low/medium/high/urgent)\n", style="white")
+    help_text.append("/task category [id] [category] - Set task category\n", style="white")
+    help_text.append("/task due [id] [date]   - Set due date (YYYY-MM-DD)\n", style="white")
+    help_text.append("/task subtask add [task_id] [title] - Add subtask\n", style="white")
+    help_text.append("/task subtask complete [task_id] [subtask_id] - Complete subtask\n", style="white")
+    help_text.append("/task stats             - Show task statistics\n", style="white")
+    help_text.append("/task search [query]    - Search tasks\n", style="white")
+    help_text.append("/task overdue           - Show overdue tasks\n", style="white")
+    help_text.append("/task export [format]   - Export tasks (json/csv)\n\n", style="white")
+    return help_text
+
 
 # --- Core Application ---
+# Shell metacharacters, wildcards, traversal and system paths, in one pass per argument
+_FORBIDDEN_ARG_RE = re.compile(r"[><|;&*\\]|\.\.|/etc|/var|/root")
+# /websearch scraping of DuckDuckGo's HTML results page
+_DDG_RESULT_RE = re.compile(r'<a rel="nofollow" class="result__a" href="(.*?)">(.*?)</a>', re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]*>')
+# git subcommands that can move HEAD, refs or remotes; they invalidate cached queries
+_GIT_MUTATING = frozenset({
+    'add', 'am', 'branch', 'checkout', 'cherry-pick', 'clean', 'clone', 'commit', 'fetch', 'init',
+    'merge', 'pull', 'push', 'rebase', 'remote', 'reset', 'revert', 'stash', 'switch', 'tag',
+})
+# Models accepted as default_model in config.yaml
+_CONFIG_MODELS = frozenset({"gemini", "groq", "ollama", "huggingface"})
+
 class NexusAI:
     def __init__(self, quiet: bool = False):
         self.user_manager = UserManager()
         self.ai = AIManager()
         self.security = SecurityManager()
         self.current_model = self._load_config()
-        self.allowed_commands = [
+        self.allowed_commands = frozenset([
             'ls', 'pwd', 'whoami', 'date', 'uptime', 'echo', 'cat', 'head', 'tail', 'df', 'du', 'free', 'uname', 'id', 'git'
-        ]
+        ])
+        self._allowed_display = ', '.join(sorted(self.allowed_commands))
+        self._register_commands()
+        self._git_repo_dirs = set()
+        self._git_cache = OrderedDict()
+        self._git_cache_lock = threading.Lock()
+        self._git_generation = 0
+        self._repo_size_cache = None
+        self._git_objects = _GitObjectReader()
+        atexit.register(self._git_objects.close)
         
         # Initialize new core features
         self.history_manager = HistoryManager()
@@ -945,10 +1931,10 @@ class NexusAI:
             cfg = CONFIG_PATH()
             if os.path.exists(cfg):
                 with open(cfg) as f:
-                    config = yaml.safe_load(f)
+                    config = yaml.load(f, Loader=_YamlLoader)
                     if isinstance(config, dict):
                         model = config.get("default_model", "gemini")
-                        if model in ["gemini", "groq", "ollama", "huggingface"]:
+                        if model in _CONFIG_MODELS:
                             return model
         except:
             pass
@@ -959,14 +1945,14 @@ class NexusAI:
             cfg = CONFIG_PATH()
             os.makedirs(os.path.dirname(cfg), exist_ok=True)
             with open(cfg, "w") as f:
-                yaml.dump({"default_model": self.current_model}, f)
+                yaml.dump({"default_model": self.current_model}, f, Dumper=_YamlDumper)
             # Restrict config file permissions (owner read/write only)
             try:
                 os.chmod(cfg, 0o600)
             except Exception:
                 pass
         except Exception as e:
-            logging.error(f"Config save error: {str(e)}")
+            logging.error("Config save error: %s", e)
     
     def show_banner(self):
         # Modern, Clean Banner (No ASCII Art)
@@ -994,21 +1980,6 @@ class NexusAI:
             title_align="right"
         ))
         
-        # Status Table
-        table = Table(title=" AI Services Status", show_header=True, header_style="bold magenta")
-        table.add_column("Service", style="cyan", width=15)
-        table.add_column("Status", style="green", width=30)
-        table.add_column("Description", style="white", width=40)
-        
-        descriptions = {
-            "gemini": "Google's Gemini 2.0 Flash (Fixed API)",
-            "groq": "Groq Cloud - Mixtral 8x7B",
-            "ollama": "Local Ollama Models (Most Secure)",
-            "huggingface": "HuggingFace Inference API",
-            "chatgpt": "OpenAI's ChatGPT (API)",
-            "mcp": "Model Context Protocol (API)"
-        }
-    
         console.print(f"\n Current Model: [bold yellow]{self.current_model.upper()}[/bold yellow]")
         console.print("\n Type [bold cyan]/help[/bold cyan] for commands or start chatting!\n")
 
@@ -1020,31 +1991,30 @@ class NexusAI:
             # Only allow commands in the allowlist
             parts = shlex.split(clean_cmd)
             if not parts or parts[0] not in self.allowed_commands:
-                return f"❌ Command '{parts[0] if parts else ''}' not allowed. Allowed: {', '.join(self.allowed_commands)}"
+                return f"❌ Command '{parts[0] if parts else ''}' not allowed. Allowed: {self._allowed_display}"
 
             # Block wildcards, path traversal, shell metacharacters in arguments
-            forbidden_patterns = [r"[><|;&]", r"\*", r"\.\.", r"/etc", r"/var", r"/root", r"\\"]
-            for arg in parts[1:]:
-                for pat in forbidden_patterns:
-                    if re.search(pat, arg):
-                        return "❌ Command arguments contain forbidden patterns."
+            if any(_FORBIDDEN_ARG_RE.search(arg) for arg in parts[1:]):
+                return "❌ Command arguments contain forbidden patterns."
             
             # Restrict file arguments for file commands to current directory only
             file_cmds = {"cat", "head", "tail"}
             if parts[0] in file_cmds and len(parts) > 1:
+                cwd = os.getcwd()
+                inside = cwd.rstrip(os.sep) + os.sep
                 for arg in parts[1:]:
-                    if not os.path.abspath(arg).startswith(os.getcwd()):
+                    # Same as abspath(arg), without a getcwd() per argument
+                    path = os.path.normpath(os.path.join(cwd, arg))
+                    # The separator guard keeps /home/foobar from matching /home/foo
+                    if path != cwd and not path.startswith(inside):
                         return "❌ Only files in the current directory are allowed."
             
             # Log only the command name for audit (not arguments)
-            logging.info(f"Command executed: {parts[0]}")
+            logging.info("Command executed: %s", parts[0])
             
-            result = subprocess.run(
-                parts, capture_output=True,
-                text=True, timeout=15
-            )
-            output = (result.stdout or "")[:2000]
-            error = (result.stderr or "")[:2000]
+            _, output, error, _ = _run_capped(parts, 2000, timeout=15)
+            output = output[:2000]
+            error = error[:2000]
             return output if output else error or "Command executed"
             
         except subprocess.TimeoutExpired:
@@ -1052,32 +2022,46 @@ class NexusAI:
         except Exception as e:
             return f"❌ Error: {str(e)[:100]}..."
     
-    def execute_git_command(self, git_cmd: str) -> str:
-        """Execute Git commands with enhanced formatting and error handling"""
+    def execute_git_command(self, git_cmd: Union[str, List[str]]) -> str:
+        """Execute Git commands with enhanced formatting and error handling.
+
+        Accepts a ready-made argv list or, for user-typed text, a string that is
+        tokenized with shlex.
+        """
         try:
-            # Check if we're in a Git repository
-            if not os.path.exists('.git') and not os.path.exists('../.git'):
-                return "❌ Not a Git repository. Initialize with 'git init' or navigate to a Git repository."
+            # Check if we're in a Git repository; only hits are cached so that a
+            # later `git init` or clone in this directory is picked up
+            cwd = os.getcwd()
+            if cwd not in self._git_repo_dirs:
+                if not os.path.exists('.git') and not os.path.exists('../.git'):
+                    return "❌ Not a Git repository. Initialize with 'git init' or navigate to a Git repository."
+                self._git_repo_dirs.add(cwd)
             
-            clean_cmd = self.security.sanitize(git_cmd)
+            if isinstance(git_cmd, str):
+                clean_cmd = self.security.sanitize(git_cmd)
+                parts = None
+            else:
+                parts = list(git_cmd)
+                clean_cmd = git_cmd = self.security.sanitize(" ".join(parts))
             if len(clean_cmd) > 500:
                 return "❌ Git command too long (max 500 characters)"
             
             # Parse the command
-            parts = shlex.split(clean_cmd)
+            if parts is None:
+                parts = shlex.split(clean_cmd)
             if not parts or parts[0] != 'git':
                 return "❌ Invalid Git command format"
+            if len(parts) > 1 and parts[1] in _GIT_MUTATING:
+                self._git_generation += 1
             
             # Execute the Git command
-            result = subprocess.run(
-                parts, capture_output=True,
-                text=True, timeout=30,  # Git commands can take longer
-                cwd=os.getcwd()
-            )
+            # Git commands can take longer; output past the cap is never read
+            returncode, stdout, stderr, _ = _run_capped(parts, _GIT_OUTPUT_LIMIT, timeout=30, cwd=cwd)
             
             # Format the output based on command type
-            if result.returncode == 0:
-                output = result.stdout.strip()
+            if returncode == 0:
+                # Keep leading spaces: they are significant in porcelain status codes
+                output = stdout.rstrip()
                 if not output:
                     return "✅ Git command executed successfully"
                 
@@ -1093,7 +2077,7 @@ class NexusAI:
                 else:
                     return output[:2000]  # Limit output size
             else:
-                error = result.stderr.strip()
+                error = stderr.strip()
                 return f"❌ Git error: {error[:500]}"
                 
         except subprocess.TimeoutExpired:
@@ -1101,44 +2085,37 @@ class NexusAI:
         except Exception as e:
             return f"❌ Git command failed: {str(e)[:100]}"
     
+    # Porcelain XY code -> (section, label)
+    _GIT_STATUS_MAP = {
+        'M ': ('staged', "📝 Modified"),
+        'A ': ('staged', "➕ Added"),
+        'D ': ('staged', "🗑️  Deleted"),
+        'R ': ('staged', "📋 Renamed"),
+        'C ': ('staged', "📄 Copied"),
+        '??': ('untracked', "❓ Untracked"),
+        ' M': ('unstaged', "📝 Modified"),
+        ' D': ('unstaged', "🗑️  Deleted"),
+    }
+
     def _format_git_status(self, output: str) -> str:
         """Format git status output with colors and structure"""
         if not output:
             return "📁 Repository is clean - no changes to commit"
         
-        lines = output.split('\n')
-        formatted = "📊 Git Status:\n\n"
+        sections = {'staged': [], 'unstaged': [], 'untracked': []}
+        status_map = self._GIT_STATUS_MAP
+        for line in output.split('\n'):
+            entry = status_map.get(line[:2])
+            if entry:
+                sections[entry[0]].append(f"{entry[1]}: {line[3:]}")
         
-        staged = []
-        unstaged = []
-        untracked = []
+        formatted = ["📊 Git Status:\n\n"]
+        for key, title in (('staged', "✅ Staged Changes"), ('unstaged', "📝 Unstaged Changes"),
+                           ('untracked', "❓ Untracked Files")):
+            if sections[key]:
+                formatted.append(f"{title}:\n" + "\n".join(sections[key]) + "\n\n")
         
-        for line in lines:
-            if line.startswith('M '):
-                staged.append(f"📝 Modified: {line[3:]}")
-            elif line.startswith('A '):
-                staged.append(f"➕ Added: {line[3:]}")
-            elif line.startswith('D '):
-                staged.append(f"🗑️  Deleted: {line[3:]}")
-            elif line.startswith('R '):
-                staged.append(f"📋 Renamed: {line[3:]}")
-            elif line.startswith('C '):
-                staged.append(f"📄 Copied: {line[3:]}")
-            elif line.startswith('?? '):
-                untracked.append(f"❓ Untracked: {line[3:]}")
-            elif line.startswith(' M'):
-                unstaged.append(f"📝 Modified: {line[3:]}")
-            elif line.startswith(' D'):
-                unstaged.append(f"🗑️  Deleted: {line[3:]}")
-        
-        if staged:
-            formatted += "✅ Staged Changes:\n" + "\n".join(staged) + "\n\n"
-        if unstaged:
-            formatted += "📝 Unstaged Changes:\n" + "\n".join(unstaged) + "\n\n"
-        if untracked:
-            formatted += "❓ Untracked Files:\n" + "\n".join(untracked) + "\n\n"
-        
-        return formatted
+        return "".join(formatted)
     
     def _format_git_log(self, output: str) -> str:
         """Format git log output with better readability"""
@@ -1187,7 +2164,12 @@ class NexusAI:
         
         return formatted
     
-    def process_input(self, user_input: str) -> str:
+    def process_input(self, user_input: str, stream: Optional[Callable[[str], None]] = None) -> str:
+        """Handle one line of input.
+
+        If ``stream`` is given, plain chat responses are passed to it chunk by
+        chunk as they arrive and an empty string is returned.
+        """
         try:
             clean_input = self.security.sanitize(user_input)
             if self.user_manager.current_user:
@@ -1209,10 +2191,17 @@ class NexusAI:
                     return self.ai.query(self.current_model, f"Translate: {clean_input[10:]}")
                 if clean_input.startswith("explain "):
                     return self.ai.query(self.current_model, f"Explain: {clean_input[8:]}")
-            response = self.ai.query(self.current_model, clean_input)
+            if stream is None:
+                response = self.ai.query(self.current_model, clean_input)
+            else:
+                chunks = []
+                for chunk in self.ai.query_stream(self.current_model, clean_input):
+                    stream(chunk)
+                    chunks.append(chunk)
+                response = "".join(chunks)
             if self.voice_manager.enabled:
                 self.voice_manager.speak(response)
-            return response
+            return response if stream is None else ""
         except SecurityError:
             # Track security errors
             if self.analytics:
@@ -1222,35 +2211,347 @@ class NexusAI:
             # Track general errors
             if self.analytics:
                 self.analytics.track_error("processing_error", str(e))
-            logging.error(f"Processing error: {str(e)}")
+            logging.error("Processing error: %s", e)
             return "❌ System error - see logs for details"
     
+    # --- Table-dispatched commands ---
+    def _register_commands(self) -> None:
+        """Build the exact-match and prefix dispatch tables used by handle_command."""
+        git = self.execute_git_command
+        fixed = {
+            # Read-only views skip the optional index refresh lock
+            "git status": ["git", "--no-optional-locks", "status", "--porcelain"],
+            "git push": ["git", "push", "origin", "HEAD"],
+            "git pull": ["git", "pull", "--rebase"],
+            "git diff": ["git", "--no-optional-locks", "diff"],
+            "git diff --staged": ["git", "--no-optional-locks", "diff", "--staged"],
+            "git branch": ["git", "branch", "-a"],
+            "git stash": ["git", "stash"],
+            "git stash pop": ["git", "stash", "pop"],
+            "git remote -v": ["git", "remote", "-v"],
+            "git bisect start": ["git", "bisect", "start"],
+            "git reflog": ["git", "reflog", "--oneline", "-10"],
+            "git undo-last-commit": ["git", "reset", "--soft", "HEAD~1"],
+            "git uncommit": ["git", "reset", "--soft", "HEAD~1"],
+            "git discard": ["git", "checkout", "--", "."],
+        }
+        self._cmd_exact: Dict[str, Callable[[list], str]] = {
+            name: (lambda parts, argv=argv: git(argv)) for name, argv in fixed.items()
+        }
+        self._cmd_exact.update({
+            "myactivity": self._cmd_myactivity,
+            "auditlog": self._cmd_auditlog,
+            "listusers": self._cmd_listusers,
+            "save-session": self._cmd_save_session,
+            "history": self._cmd_history,
+            "clearhistory": self._cmd_clearhistory,
+            "git repo-info": self._cmd_git_repo_info,
+            "git stats": self._cmd_git_stats,
+            "git contributors": self._cmd_git_contributors,
+        })
+        # git subcommands that take one argument and pass it straight through
+        passthrough = {
+            "git checkout": (["git", "checkout"], "Usage: /git checkout [branch]"),
+            "git merge": (["git", "merge"], "Usage: /git merge [branch]"),
+            "git blame": (["git", "blame"], "Usage: /git blame [file]"),
+            "git cherry-pick": (["git", "cherry-pick"], "Usage: /git cherry-pick [commit-hash]"),
+            "git rebase": (["git", "rebase"], "Usage: /git rebase [branch]"),
+            "git tag": (["git", "tag"], "Usage: /git tag [tag-name]"),
+            "git new-branch": (["git", "checkout", "-b"], "Usage: /git new-branch [name] - Create and switch to new branch"),
+            "git file-history": (["git", "log", "--follow", "--oneline"],
+                                 "Usage: /git file-history [filename] - Show history of a specific file"),
+        }
+        prefix = [
+            (name, lambda parts, base=base, usage=usage:
+                git(base + parts[2:]) if len(parts) > 2 else usage)
+            for name, (base, usage) in passthrough.items()
+        ]
+        # ...and those that take exactly one
+        single = {
+            "git create-branch": (["git", "branch"], "Usage: /git create-branch [name]"),
+            "git delete-branch": (["git", "branch", "-d"], "Usage: /git delete-branch [name]"),
+        }
+        prefix += [
+            (name, lambda parts, base=base, usage=usage:
+                git(base + parts[2:]) if len(parts) == 3 else usage)
+            for name, (base, usage) in single.items()
+        ]
+        prefix += [
+            ("resetpw", self._cmd_resetpw),
+            ("git add", self._cmd_git_add),
+            ("git commit", self._cmd_git_commit),
+            ("git amend", self._cmd_git_amend),
+            ("git log", self._cmd_git_log),
+            ("git reset", self._cmd_git_reset),
+            ("git ignore", self._cmd_git_ignore),
+            ("git pull-request", lambda parts: "💡 To create a pull request, push your branch and use your Git hosting service (GitHub, GitLab, etc.)"),
+            ("refactor", self._cmd_refactor),
+        ]
+        # AI helpers that send the start of one file along with a fixed instruction:
+        # name -> (index of the filename argument, usage, prompt)
+        ai_file = {
+            "codereview": (1, "Usage: /codereview [filename]", _PROMPT_REVIEW),
+            "summarizefile": (1, "Usage: /summarizefile [filename]", _PROMPT_SUMMARIZE),
+            "findbugs": (1, "Usage: /findbugs [filename]", _PROMPT_FINDBUGS),
+            "gendoc": (1, "Usage: /gendoc [filename]", _PROMPT_GENDOC),
+            "gentest": (1, "Usage: /gentest [filename]", _PROMPT_GENTEST),
+            "git commitmsg": (2, "Usage: /git commitmsg [diff or file]", _PROMPT_COMMITMSG),
+        }
+        prefix += [
+            (name, lambda parts, spec=spec: self._ai_file_command(parts, *spec))
+            for name, spec in ai_file.items()
+        ]
+        prefix.append(("aifind", self._cmd_aifind))
+        self._cmd_exact["todos"] = self._cmd_todos
+        # Keyed by the command's first one or two words
+        self._cmd_prefix = dict(prefix)
+
+    def _find_command(self, cmd: str) -> Optional[Callable[[list], str]]:
+        handler = self._cmd_exact.get(cmd)
+        if handler is not None:
+            return handler
+        # Whole-word keys, so "git commit" does not swallow "git commitmsg"
+        words = cmd.split(maxsplit=2)
+        return self._cmd_prefix.get(" ".join(words[:2])) or self._cmd_prefix.get(words[0] if words else "")
+
+    def _ai_file_command(self, parts: list, path_index: int, usage: str, prompt: str) -> str:
+        if len(parts) != path_index + 1:
+            return usage
+        try:
+            content = _read_excerpt(parts[path_index])
+        except Exception as e:
+            return f"Error reading file: {str(e)}"
+        return self.ai.query(self.current_model, prompt.format(code=content))
+
+    def _cmd_refactor(self, parts: list) -> str:
+        if len(parts) < 3:
+            return "Usage: /refactor [filename] [instruction]"
+        instruction = " ".join(parts[2:])
+        try:
+            code = _read_excerpt(parts[1])
+        except Exception as e:
+            return f"Error reading file: {str(e)}"
+        return self.ai.query(self.current_model, _PROMPT_REFACTOR.format(instruction=instruction, code=code))
+
+    def _cmd_aifind(self, parts: list) -> str:
+        if len(parts) != 2:
+            return "Usage: /aifind [keyword]"
+        matches = _search_files([parts[1]], 10)
+        if not matches:
+            return "No matches found."
+        context = "\n".join(matches)
+        return self.ai.query(self.current_model, f"Explain the context of these code lines:\n{context}")
+
+    def _cmd_todos(self, parts: list) -> str:
+        todos = _search_files(['TODO', 'FIXME'], 20)
+        if not todos:
+            return "No TODOs/FIXMEs found."
+        return self.ai.query(self.current_model, "Summarize these TODOs/FIXMEs:\n" + "\n".join(todos))
+
+    def _cmd_myactivity(self, parts: list) -> str:
+        if not self.user_manager.current_user:
+            return "Not logged in."
+        log = self.user_manager.activity_log.get(self.user_manager.current_user, [])
+        return "\n".join([f"{t}: {a}" for t, a in log]) or "No activity."
+
+    def _cmd_auditlog(self, parts: list) -> str:
+        if not self.user_manager.is_admin():
+            return "Admin only."
+        return "\n".join([f"{u} {t}: {a}" for u, t, a in self.user_manager.audit_log]) or "No audit log."
+
+    def _cmd_resetpw(self, parts: list) -> str:
+        if len(parts) != 3:
+            return "Usage: /resetpw [username] [newpassword]"
+        if not self.user_manager.is_admin():
+            return "Admin only."
+        ok, msg = self.user_manager.reset_password(parts[1], parts[2])
+        return msg
+
+    def _cmd_listusers(self, parts: list) -> str:
+        if not self.user_manager.is_admin():
+            return "Admin only."
+        return "Users: " + ", ".join(self.user_manager.list_users())
+
+    def _cmd_save_session(self, parts: list) -> str:
+        if not self.user_manager.current_user:
+            return "Not logged in."
+        hist = self.user_manager.get_history(self.user_manager.current_user)
+        messages = [{"role": "user", "content": m} for m in hist]
+        path = self.history_manager.save_session(self.user_manager.current_user, messages)
+        if path:
+            return f"💾 Session saved to {path}"
+        return "❌ Failed to save session"
+
+    def _cmd_history(self, parts: list) -> str:
+        if not self.user_manager.current_user:
+            return "Not logged in."
+        hist = self.user_manager.get_history(self.user_manager.current_user)
+        return "\n".join(hist) if hist else "No history."
+
+    def _cmd_clearhistory(self, parts: list) -> str:
+        if not self.user_manager.current_user:
+            return "Not logged in."
+        self.user_manager.clear_history(self.user_manager.current_user)
+        return "History cleared."
+
+    def _cmd_git_add(self, parts: list) -> str:
+        if len(parts) < 3:
+            return "Usage: /git add [files] or /git add . for all files"
+        return self.execute_git_command(["git", "add"] + parts[2:])
+
+    def _cmd_git_commit(self, parts: list) -> str:
+        if len(parts) < 3:
+            return "Usage: /git commit [message] - Commit staged changes"
+        return self.execute_git_command(["git", "commit", "-m", " ".join(parts[2:])])
+
+    def _cmd_git_amend(self, parts: list) -> str:
+        if len(parts) < 3:
+            return "Usage: /git amend [message] - Amend last commit with new message"
+        return self.execute_git_command(["git", "commit", "--amend", "-m", " ".join(parts[2:])])
+
+    def _cmd_git_log(self, parts: list) -> str:
+        limit = parts[2] if len(parts) > 2 and parts[2].isdigit() else "10"
+        return self.execute_git_command(["git", "log", "--oneline", f"-{limit}"])
+
+    def _cmd_git_reset(self, parts: list) -> str:
+        if len(parts) == 3 and parts[2] == "--hard":
+            return self.execute_git_command(["git", "reset", "--hard", "HEAD"])
+        if len(parts) >= 3:
+            return self.execute_git_command(["git", "reset", "HEAD", parts[2]])
+        return "Usage: /git reset [file] or /git reset --hard"
+
+    def _cmd_git_ignore(self, parts: list) -> str:
+        if len(parts) < 3:
+            return "Usage: /git ignore [pattern] - Add pattern to .gitignore"
+        pattern = ' '.join(parts[2:])
+        try:
+            # One read both dedupes and tells us whether the file ends mid-line
+            with open('.gitignore', 'a+') as f:
+                f.seek(0)
+                existing = f.read()
+                if pattern in {line.strip() for line in existing.splitlines()}:
+                    return f"ℹ️ '{pattern}' is already in .gitignore"
+                f.write(("\n" if existing and not existing.endswith("\n") else "") + pattern + "\n")
+            return f"✅ Added '{pattern}' to .gitignore"
+        except Exception as e:
+            return f"❌ Failed to update .gitignore: {str(e)}"
+
+    def _cmd_git_repo_info(self, parts: list) -> str:
+        # One porcelain v2 status carries the branch, HEAD sha and change counts
+        try:
+            result = subprocess.run(['git', '--no-optional-locks', 'status', '--porcelain=v2', '--branch', '-z'],
+                                    capture_output=True, timeout=10)
+        except (OSError, subprocess.SubprocessError):
+            return "❌ Could not retrieve repository information"
+        if result.returncode != 0:
+            return "❌ Could not retrieve repository information"
+        status = _parse_status_v2(result.stdout)
+        
+        remote = self._cached_git(['git', 'remote', 'get-url', 'origin'])
+        head = self._git_objects.read('HEAD')
+        last_commit = None
+        if head and head[0] == 'commit':
+            last_commit = f"{status['oid'][:7]} {_commit_subject(head[1])}"
+        
+        info = []
+        if remote:
+            info.append(f"🌐 Remote URL: {remote}")
+        info.append(f"🌿 Current Branch: {status['head']}")
+        if last_commit:
+            info.append(f"📝 Last Commit: {last_commit}")
+        info.append(f"📊 Changes: {status['staged']} staged, {status['unstaged']} unstaged, "
+                    f"{status['untracked']} untracked")
+        return "📋 Repository Information:\n" + "\n".join(info)
+
+    def _cached_git(self, argv: List[str], run: Optional[Callable[[List[str]], Optional[str]]] = None):
+        """Run a read-only git query, reusing its result until HEAD, refs or config change."""
+        run = run or self._git_output
+        cwd = os.getcwd()
+        state = _git_state(cwd)
+        if state is None:
+            return run(argv)
+        key = (run.__name__, tuple(argv), cwd, state, self._git_generation)
+        with self._git_cache_lock:
+            if key in self._git_cache:
+                self._git_cache.move_to_end(key)
+                return self._git_cache[key]
+        value = run(argv)
+        with self._git_cache_lock:
+            self._git_cache[key] = value
+            self._git_cache.move_to_end(key)
+            if len(self._git_cache) > 32:
+                self._git_cache.popitem(last=False)
+        return value
+
+    @staticmethod
+    def _git_output(argv: List[str]) -> Optional[str]:
+        """Stripped stdout of a short read-only git query, or None if it failed."""
+        # Queries never need the optional locks, so they cannot contend with a
+        # concurrent git process (or each other, as in /git stats)
+        argv = argv[:1] + ['--no-optional-locks'] + argv[1:]
+        try:
+            # git emits UTF-8 (author names, subjects) whatever the locale says
+            res = subprocess.run(argv, capture_output=True, encoding='utf-8', errors='replace', timeout=10)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return res.stdout.strip() if res.returncode == 0 else None
+
+    def _cmd_git_stats(self, parts: list) -> str:
+        # Get repository statistics; the two history walks run side by side
+        # HEAD is explicit: without a revision, shortlog reads stdin when it is not a tty
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            total = pool.submit(self._cached_git, ['git', 'rev-list', '--count', 'HEAD'])
+            contributors = pool.submit(self._cached_git, ['git', 'shortlog', '-sn', '--no-merges', 'HEAD'])
+            size = self._repo_size()
+            total, contributors = total.result(), contributors.result()
+        
+        stats = []
+        if total:
+            stats.append(f"📊 Total Commits: {total}")
+        if contributors:
+            count = contributors.count('\n') + 1
+            stats.append(f"👥 Contributors: {count}")
+        if size:
+            stats.append(f"💾 Repository Size: {size}")
+        
+        if stats:
+            return "📈 Repository Statistics:\n" + "\n".join(stats)
+        else:
+            return "❌ Could not retrieve repository statistics"
+
+    def _cmd_git_contributors(self, parts: list) -> str:
+        # Shares the cached shortlog with /git stats
+        output = self._cached_git(['git', 'shortlog', '-sn', '--no-merges', 'HEAD'])
+        if output is None:
+            return "❌ Could not list contributors"
+        return output or "No contributors found"
+
+    def _repo_size(self) -> Optional[str]:
+        """Packed size from count-objects, reused for a minute since it rarely moves."""
+        cwd = os.getcwd()
+        cached = self._repo_size_cache
+        if cached and cached[0] == cwd and time.monotonic() - cached[1] < 60:
+            return cached[2]
+        size = None
+        for line in (self._git_output(['git', 'count-objects', '-vH']) or '').split('\n'):
+            if line.startswith('size-pack:'):
+                size = line.split(':', 1)[1].strip()
+                break
+        self._repo_size_cache = (cwd, time.monotonic(), size)
+        return size
+
     def handle_command(self, command: str) -> str:
         try:
             cmd = command[1:].strip().lower()
-            # --- Session Timeout ---
-            if cmd == "myactivity":
-                if not self.user_manager.current_user:
-                    return "Not logged in."
-                log = self.user_manager.activity_log.get(self.user_manager.current_user, [])
-                return "\n".join([f"{t}: {a}" for t, a in log]) or "No activity."
-            if cmd == "auditlog":
-                if not self.user_manager.is_admin():
-                    return "Admin only."
-                return "\n".join([f"{u} {t}: {a}" for u, t, a in self.user_manager.audit_log]) or "No audit log."
-            # --- Advanced User Management ---
-            if cmd.startswith("resetpw"):
-                parts = command.split()
-                if len(parts) != 3:
-                    return "Usage: /resetpw [username] [newpassword]"
-                if not self.user_manager.is_admin():
-                    return "Admin only."
-                ok, msg = self.user_manager.reset_password(parts[1], parts[2])
-                return msg
-            if cmd == "listusers":
-                if not self.user_manager.is_admin():
-                    return "Admin only."
-                return "Users: " + ", ".join(self.user_manager.list_users())
+            parts = command.split()
+            handler = self._find_command(cmd)
+            if handler is not None:
+                # Table handlers build argv lists, so quoting is honoured here once
+                try:
+                    parts = shlex.split(command)
+                except ValueError as e:
+                    return f"❌ Could not parse command ({e}). Check that quotes are balanced."
+                return handler(parts)
             # --- New Features ---
             if cmd == "voice on":
                 self.voice_manager.enabled = True
@@ -1369,594 +2670,15 @@ class NexusAI:
                 else:
                     return self.rag_manager.ingest_file(target)
             
-            if cmd == "save-session":
-                if not self.user_manager.current_user:
-                    return "Not logged in."
-                hist = self.user_manager.get_history(self.user_manager.current_user)
-                messages = [{"role": "user", "content": m} for m in hist]
-                path = self.history_manager.save_session(self.user_manager.current_user, messages)
-                if path:
-                    return f"💾 Session saved to {path}"
-                return "❌ Failed to save session"
-
-            # --- Chat History ---
-            if cmd == "history":
-                if not self.user_manager.current_user:
-                    return "Not logged in."
-                hist = self.user_manager.get_history(self.user_manager.current_user)
-                return "\n".join(hist) if hist else "No history."
-            if cmd == "clearhistory":
-                if not self.user_manager.current_user:
-                    return "Not logged in."
-                self.user_manager.clear_history(self.user_manager.current_user)
-                return "History cleared."
-            # --- Git Advanced ---
-            if cmd.startswith("git create-branch"):
-                parts = command.split()
-                if len(parts) != 3:
-                    return "Usage: /git create-branch [name]"
-                return self.execute_git_command(f"git branch {parts[2]}")
-            if cmd.startswith("git delete-branch"):
-                parts = command.split()
-                if len(parts) != 3:
-                    return "Usage: /git delete-branch [name]"
-                return self.execute_git_command(f"git branch -d {parts[2]}")
-            
-            # --- Advanced Git Commands ---
-            if cmd == "git status":
-                return self.execute_git_command("git status --porcelain")
-            
-            if cmd.startswith("git add"):
-                parts = command.split(maxsplit=2)
-                if len(parts) == 1:
-                    return "Usage: /git add [files] or /git add . for all files"
-                files = parts[1] if len(parts) > 1 else "."
-                return self.execute_git_command(f"git add {files}")
-            
-            if cmd.startswith("git commit"):
-                parts = command.split(maxsplit=2)
-                if len(parts) < 3:
-                    return "Usage: /git commit [message] - Commit staged changes"
-                message = parts[2]
-                return self.execute_git_command(f"git commit -m \"{message}\"")
-            
-            if cmd == "git push":
-                return self.execute_git_command("git push origin HEAD")
-            
-            if cmd == "git pull":
-                return self.execute_git_command("git pull --rebase")
-            
-            if cmd.startswith("git log"):
-                parts = command.split()
-                limit = parts[1] if len(parts) > 1 and parts[1].isdigit() else "10"
-                return self.execute_git_command(f"git log --oneline -{limit}")
-            
-            if cmd == "git diff":
-                return self.execute_git_command("git diff")
-            
-            if cmd == "git diff --staged":
-                return self.execute_git_command("git diff --staged")
-            
-            if cmd == "git branch":
-                return self.execute_git_command("git branch -a")
-            
-            if cmd.startswith("git checkout"):
-                parts = command.split(maxsplit=2)
-                if len(parts) < 3:
-                    return "Usage: /git checkout [branch]"
-                branch = parts[2]
-                return self.execute_git_command(f"git checkout {branch}")
-            
-            if cmd.startswith("git merge"):
-                parts = command.split(maxsplit=2)
-                if len(parts) < 3:
-                    return "Usage: /git merge [branch]"
-                branch = parts[2]
-                return self.execute_git_command(f"git merge {branch}")
-            
-            if cmd == "git stash":
-                return self.execute_git_command("git stash")
-            
-            if cmd == "git stash pop":
-                return self.execute_git_command("git stash pop")
-            
-            if cmd.startswith("git reset"):
-                parts = command.split(maxsplit=3)
-                if len(parts) == 3 and parts[2] == "--hard":
-                    return self.execute_git_command("git reset --hard HEAD")
-                elif len(parts) >= 3:
-                    file_path = parts[2]
-                    return self.execute_git_command(f"git reset HEAD {file_path}")
-                else:
-                    return "Usage: /git reset [file] or /git reset --hard"
-            
-            if cmd == "git remote -v":
-                return self.execute_git_command("git remote -v")
-            
-            if cmd.startswith("git blame"):
-                parts = command.split(maxsplit=2)
-                if len(parts) < 3:
-                    return "Usage: /git blame [file]"
-                file_path = parts[2]
-                return self.execute_git_command(f"git blame {file_path}")
-            
-            if cmd.startswith("git cherry-pick"):
-                parts = command.split(maxsplit=2)
-                if len(parts) < 3:
-                    return "Usage: /git cherry-pick [commit-hash]"
-                commit_hash = parts[2]
-                return self.execute_git_command(f"git cherry-pick {commit_hash}")
-            
-            if cmd.startswith("git rebase"):
-                parts = command.split(maxsplit=2)
-                if len(parts) < 3:
-                    return "Usage: /git rebase [branch]"
-                branch = parts[2]
-                return self.execute_git_command(f"git rebase {branch}")
-            
-            if cmd == "git bisect start":
-                return self.execute_git_command("git bisect start")
-            
-            if cmd.startswith("git tag"):
-                parts = command.split(maxsplit=2)
-                if len(parts) < 3:
-                    return "Usage: /git tag [tag-name]"
-                tag_name = parts[2]
-                return self.execute_git_command(f"git tag {tag_name}")
-            
-            if cmd == "git reflog":
-                return self.execute_git_command("git reflog --oneline -10")
-            
-            # --- Git Workflow Commands ---
-            if cmd.startswith("git new-branch"):
-                parts = command.split(maxsplit=2)
-                if len(parts) < 3:
-                    return "Usage: /git new-branch [name] - Create and switch to new branch"
-                branch_name = parts[2]
-                # Create branch and switch to it
-                create_result = self.execute_git_command(f"git checkout -b {branch_name}")
-                return create_result
-            
-            if cmd == "git undo-last-commit":
-                return self.execute_git_command("git reset --soft HEAD~1")
-            
-            if cmd.startswith("git amend"):
-                parts = command.split(maxsplit=2)
-                if len(parts) < 3:
-                    return "Usage: /git amend [message] - Amend last commit with new message"
-                message = parts[2]
-                return self.execute_git_command(f"git commit --amend -m \"{message}\"")
-            
-            if cmd == "git uncommit":
-                return self.execute_git_command("git reset --soft HEAD~1")
-            
-            if cmd == "git discard":
-                return self.execute_git_command("git checkout -- .")
-            
-            if cmd.startswith("git ignore"):
-                parts = command.split(maxsplit=2)
-                if len(parts) < 3:
-                    return "Usage: /git ignore [pattern] - Add pattern to .gitignore"
-                pattern = parts[2]
-                try:
-                    with open('.gitignore', 'a') as f:
-                        f.write(f"\n{pattern}")
-                    return f"✅ Added '{pattern}' to .gitignore"
-                except Exception as e:
-                    return f"❌ Failed to update .gitignore: {str(e)}"
-            
-            if cmd == "git repo-info":
-                # Get comprehensive repository information
-                info = []
-                
-                # Basic repo info
-                try:
-                    result = subprocess.run(['git', 'remote', 'get-url', 'origin'], 
-                                          capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        info.append(f"🌐 Remote URL: {result.stdout.strip()}")
-                except:
-                    pass
-                
-                # Current branch
-                try:
-                    result = subprocess.run(['git', 'branch', '--show-current'], 
-                                          capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        info.append(f"🌿 Current Branch: {result.stdout.strip()}")
-                except:
-                    pass
-                
-                # Last commit
-                try:
-                    result = subprocess.run(['git', 'log', '--oneline', '-1'], 
-                                          capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        info.append(f"📝 Last Commit: {result.stdout.strip()}")
-                except:
-                    pass
-                
-                # Status summary
-                try:
-                    result = subprocess.run(['git', 'status', '--porcelain'], 
-                                          capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        lines = result.stdout.strip().split('\n')
-                        staged = len([l for l in lines if l and not l.startswith(' ')])
-                        unstaged = len([l for l in lines if l and l.startswith(' ')])
-                        untracked = len([l for l in lines if l and l.startswith('??')])
-                        info.append(f"📊 Changes: {staged} staged, {unstaged} unstaged, {untracked} untracked")
-                except:
-                    pass
-                
-                if info:
-                    return "📋 Repository Information:\n" + "\n".join(info)
-                else:
-                    return "❌ Could not retrieve repository information"
-            
             # --- Additional Git Commands ---
-            if cmd.startswith("git "):
-                # Run git commands in background to keep UI responsive
-                def _run_git():
-                    res = self.execute_git_command(command) # Use 'command' here, not 'cmd'
-                    console.print(f"\n{res}")
-                    console.print(f"\n[{self.current_model.upper()}] 🚀 > ", end="")
-                _run_in_background(_run_git)
-                return "⏳ Git command running in background..."
-            
-            if cmd == "git init":
-                return self.execute_git_command("git init")
-            
-            if cmd.startswith("git clone"):
-                parts = command.split(maxsplit=2)
-                if len(parts) < 3:
-                    return "Usage: /git clone [url] - Clone a repository"
-                url = parts[2]
-                return self.execute_git_command(f"git clone {url}")
-            
-            if cmd == "git fetch":
-                return self.execute_git_command("git fetch --all")
-            
-            if cmd.startswith("git pull-request"):
-                return "💡 To create a pull request, push your branch and use your Git hosting service (GitHub, GitLab, etc.)"
-            
-            if cmd == "git contributors":
-                return self.execute_git_command("git shortlog -sn --no-merges")
+            if cmd == "git" or cmd.startswith("git "):
+                # Only the /git subcommands in the dispatch tables run; free-form git is never executed
+                return f"❌ Unknown git subcommand: /{cmd}\n   Type /help to see the supported /git commands"
             
-            if cmd == "git file-history":
-                return "Usage: /git file-history [filename] - Show history of a specific file"
-            
-            if cmd.startswith("git file-history"):
-                parts = command.split(maxsplit=2)
-                if len(parts) < 3:
-                    return "Usage: /git file-history [filename] - Show history of a specific file"
-                filename = parts[2]
-                return self.execute_git_command(f"git log --follow --oneline {filename}")
-            
-            if cmd == "git clean":
-                return self.execute_git_command("git clean -fd")
-            
-            if cmd == "git stats":
-                # Get repository statistics
-                stats = []
-                try:
-                    # Total commits
-                    result = subprocess.run(['git', 'rev-list', '--count', 'HEAD'], 
-                                          capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        stats.append(f"📊 Total Commits: {result.stdout.strip()}")
-                except:
-                    pass
-                
-                try:
-                    # Contributors count
-                    result = subprocess.run(['git', 'shortlog', '-sn', '--no-merges'], 
-                                          capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        lines = result.stdout.strip().split('\n')
-                        stats.append(f"👥 Contributors: {len(lines)}")
-                except:
-                    pass
-                
-                try:
-                    # Repository size
-                    result = subprocess.run(['git', 'count-objects', '-vH'], 
-                                          capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        for line in result.stdout.split('\n'):
-                            if 'size-pack:' in line:
-                                stats.append(f"💾 Repository Size: {line.split(':')[1].strip()}")
-                                break
-                except:
-                    pass
-                
-                if stats:
-                    return "📈 Repository Statistics:\n" + "\n".join(stats)
-                else:
-                    return "❌ Could not retrieve repository statistics"
-            
-            # --- AI Code Review ---
-            if cmd.startswith("codereview"):
-                parts = command.split()
-                if len(parts) != 2:
-                    return "Usage: /codereview [filename]"
-                try:
-                    with open(parts[1], 'r') as f:
-                        code = f.read(2000)
-                    return self.ai.query(self.current_model, f"Review this code for bugs and improvements:\n{code}")
-                except Exception as e:
-                    return f"Error reading file: {str(e)}"
-            # --- AI File Summarization ---
-            if cmd.startswith("summarizefile"):
-                parts = command.split()
-                if len(parts) != 2:
-                    return "Usage: /summarizefile [filename]"
-                try:
-                    with open(parts[1], 'r') as f:
-                        content = f.read(2000)
-                    return self.ai.query(self.current_model, f"Summarize this file:\n{content}")
-                except Exception as e:
-                    return f"Error reading file: {str(e)}"
-            # --- AI File Search ---
-            if cmd.startswith("aifind"):
-                parts = command.split()
-                if len(parts) != 2:
-                    return "Usage: /aifind [keyword]"
-                matches = []
-                for root, dirs, files in os.walk(os.getcwd()):
-                    for file in files:
-                        try:
-                            with open(os.path.join(root, file), 'r', errors='ignore') as f:
-                                for i, line in enumerate(f):
-                                    if parts[1] in line:
-                                        matches.append(f"{file}:{i+1}: {line.strip()}")
-                                        if len(matches) > 10:
-                                            break
-                        except Exception:
-                            continue
-                if not matches:
-                    return "No matches found."
-                context = "\n".join(matches[:10])
-                return self.ai.query(self.current_model, f"Explain the context of these code lines:\n{context}")
-            # --- AI Commit Message Generator ---
-            if cmd.startswith("git commitmsg"):
-                parts = command.split()
-                if len(parts) == 3:
-                    try:
-                        with open(parts[2], 'r') as f:
-                            diff = f.read(2000)
-                        return self.ai.query(self.current_model, f"Write a git commit message for this diff or file:\n{diff}")
-                    except Exception as e:
-                        return f"Error reading file: {str(e)}"
-                return "Usage: /git commitmsg [diff or file]"
-            # --- AI Bug Finder ---
-            if cmd.startswith("findbugs"):
-                parts = command.split()
-                if len(parts) != 2:
-                    return "Usage: /findbugs [filename]"
-                try:
-                    with open(parts[1], 'r') as f:
-                        code = f.read(2000)
-                    return self.ai.query(self.current_model, f"Find bugs in this code:\n{code}")
-                except Exception as e:
-                    return f"Error reading file: {str(e)}"
-            # --- AI Refactor ---
-            if cmd.startswith("refactor"):
-                parts = command.split(maxsplit=2)
-                if len(parts) != 3:
-                    return "Usage: /refactor [filename] [instruction]"
-                try:
-                    with open(parts[1], 'r') as f:
-                        code = f.read(2000)
-                    return self.ai.query(self.current_model, f"Refactor this code as per instruction '{parts[2]}':\n{code}")
-                except Exception as e:
-                    return f"Error reading file: {str(e)}"
-            # --- Project TODO Extractor ---
-            if cmd == "todos":
-                todos = []
-                for root, dirs, files in os.walk(os.getcwd()):
-                    for file in files:
-                        try:
-                            with open(os.path.join(root, file), 'r', errors='ignore') as f:
-                                for i, line in enumerate(f):
-                                    if 'TODO' in line or 'FIXME' in line:
-                                        todos.append(f"{file}:{i+1}: {line.strip()}")
-                                        if len(todos) > 20:
-                                            break
-                        except Exception:
-                            continue
-                if not todos:
-                    return "No TODOs/FIXMEs found."
-                return self.ai.query(self.current_model, f"Summarize these TODOs/FIXMEs:\n" + "\n".join(todos[:20]))
-            # --- AI Documentation Generator ---
-            if cmd.startswith("gendoc"):
-                parts = command.split()
-                if len(parts) != 2:
-                    return "Usage: /gendoc [filename]"
-                try:
-                    with open(parts[1], 'r') as f:
-                        code = f.read(2000)
-                    return self.ai.query(self.current_model, f"Generate docstrings and comments for this code:\n{code}")
-                except Exception as e:
-                    return f"Error reading file: {str(e)}"
-            # --- AI Test Generator ---
-            if cmd.startswith("gentest"):
-                parts = command.split()
-                if len(parts) != 2:
-                    return "Usage: /gentest [filename]"
-                try:
-                    with open(parts[1], 'r') as f:
-                        code = f.read(2000)
-                    return self.ai.query(self.current_model, f"Write unit tests for this code:\n{code}")
-                except Exception as e:
-                    return f"Error reading file: {str(e)}"
             # --- Existing Commands ---
             if cmd == "help":
                 try:
-                    help_text = Text()
-                    help_text.append(f"\n🚀 AetherAI Terminal v{VERSION} - COMMAND REFERENCE\n\n", style="bold cyan")
-                    help_text.append("📋 BASIC COMMANDS:\n", style="bold yellow")
-                    help_text.append("/help          - Show this help menu\n", style="white")
-                    help_text.append("/status        - Show detailed service status\n", style="white")
-                    help_text.append("/security      - Show security information\n", style="white")
-                    help_text.append("/clear         - Clear the screen\n", style="white")
-                    help_text.append("/exit          - Quit application\n\n", style="white")
-                    help_text.append("🤖 AI MODEL COMMANDS:\n", style="bold yellow")
-                    help_text.append("/switch gemini      - Switch to Gemini 2.0 Flash\n", style="white")
-                    help_text.append("/switch groq        - Switch to Groq Mixtral\n", style="white")
-                    help_text.append("/switch ollama      - Switch to Ollama (default model)\n", style="white")
-                    help_text.append("/switch ollama [model] - Switch to specific Ollama model\n", style="white")
-                    help_text.append("/switch huggingface - Switch to HuggingFace\n", style="white")
-                    help_text.append("/switch chatgpt     - Switch to ChatGPT (OpenAI)\n", style="white")
-                    help_text.append("/switch mcp         - Switch to MCP (Model Context Protocol)\n\n", style="white")
-                    help_text.append("⚙️ SYSTEM COMMANDS:\n", style="bold yellow")
-                    help_text.append("/run [command]      - Execute safe system commands (ls, pwd, whoami, date, etc.)\n", style="white")
-                    help_text.append("/models             - List available AI models\n", style="white")
-                    help_text.append("/ollama-models      - Show detailed list of available Ollama models\n", style="white")
-                    help_text.append("/current-model      - Show currently active AI model\n", style="white")
-                    help_text.append("/config             - Show configuration\n", style="white")
-                    help_text.append("/sysinfo            - Display system information and resources\n", style="white")
-                    help_text.append("/calc [expression]  - Calculate mathematical expressions\n", style="white")
-                    help_text.append("/explore            - Interactive file explorer for current directory\n", style="white")
-                    help_text.append("/websearch [query]  - Search the web using DuckDuckGo\n", style="white")
-                    help_text.append("/weather [city]     - Get current weather information\n", style="white")
-                    help_text.append("/note [text]        - Save a quick note\n", style="white")
-                    help_text.append("/notes              - View your saved notes\n", style="white")
-                    help_text.append("/timer [seconds]    - Start a countdown timer\n", style="white")
-                    help_text.append("/convert [val] [from] [to] - Unit converter (temp, weight, data)\n", style="white")
-                    help_text.append("/joke               - Get a random joke\n", style="white")
-                    help_text.append("/password [length]  - Generate a secure password\n", style="white")
-                    help_text.append("/tip                - Get a random productivity tip\n", style="white")
-                    help_text.append("/clear              - Clear the screen\n\n", style="white")
-                    
-                    help_text.append("🔀 GIT VERSION CONTROL:\n", style="bold yellow")
-                    help_text.append("/git status            - Show repository status\n", style="white")
-                    help_text.append("/git add [files]       - Stage files for commit\n", style="white")
-                    help_text.append("/git commit [message]  - Commit staged changes\n", style="white")
-                    help_text.append("/git push              - Push commits to remote\n", style="white")
-                    help_text.append("/git pull              - Pull changes from remote\n", style="white")
-                    help_text.append("/git log [n]           - Show commit history\n", style="white")
-                    help_text.append("/git diff              - Show unstaged changes\n", style="white")
-                    help_text.append("/git diff --staged     - Show staged changes\n", style="white")
-                    help_text.append("/git branch            - List branches\n", style="white")
-                    help_text.append("/git checkout [branch] - Switch to branch\n", style="white")
-                    help_text.append("/git merge [branch]    - Merge branch into current\n", style="white")
-                    help_text.append("/git stash             - Stash current changes\n", style="white")
-                    help_text.append("/git stash pop         - Apply stashed changes\n", style="white")
-                    help_text.append("/git reset [file]      - Unstage file\n", style="white")
-                    help_text.append("/git reset --hard      - Reset to last commit\n", style="white")
-                    help_text.append("/git remote -v         - Show remote repositories\n", style="white")
-                    help_text.append("/git blame [file]      - Show who changed each line\n", style="white")
-                    help_text.append("/git cherry-pick [hash] - Apply specific commit\n", style="white")
-                    help_text.append("/git rebase [branch]   - Rebase current branch\n", style="white")
-                    help_text.append("/git bisect start      - Start binary search for bugs\n", style="white")
-                    help_text.append("/git tag [name]        - Create a tag\n", style="white")
-                    help_text.append("/git reflog            - Show reference log\n", style="white")
-                    help_text.append("/git new-branch [name] - Create and switch to new branch\n", style="white")
-                    help_text.append("/git undo-last-commit  - Undo last commit (keep changes)\n", style="white")
-                    help_text.append("/git amend [message]   - Amend last commit message\n", style="white")
-                    help_text.append("/git uncommit          - Uncommit but keep changes staged\n", style="white")
-                    help_text.append("/git discard           - Discard all unstaged changes\n", style="white")
-                    help_text.append("/git ignore [pattern]  - Add pattern to .gitignore\n", style="white")
-                    help_text.append("/git repo-info         - Show comprehensive repo information\n", style="white")
-                    help_text.append("/git init              - Initialize a new Git repository\n", style="white")
-                    help_text.append("/git clone [url]       - Clone a repository\n", style="white")
-                    help_text.append("/git fetch             - Fetch all branches from remote\n", style="white")
-                    help_text.append("/git contributors      - Show contributors by commit count\n", style="white")
-                    help_text.append("/git file-history [f]  - Show history of a specific file\n", style="white")
-                    help_text.append("/git clean             - Remove untracked files\n", style="white")
-                    help_text.append("/git stats             - Show repository statistics\n\n", style="white")
-
-                    help_text.append("💡 EXAMPLES:\n", style="bold green")
-                    help_text.append("• Write a Python function to sort a list\n", style="cyan")
-                    help_text.append("• /switch ollama llama2:13b\n", style="cyan")
-                    help_text.append("• /ollama-models\n", style="cyan")
-                    help_text.append("• /run ls -la\n", style="cyan")
-                    help_text.append("• Explain quantum computing\n\n", style="cyan")
-
-                    # Add new advanced features section
-                    help_text.append("🚀 ADVANCED FEATURES:\n", style="bold magenta")
-                    
-                    help_text.append("🤖 CONTEXT-AWARE AI:\n", style="bold yellow")
-                    help_text.append("/learn [topic]          - Teach AI about technologies\n", style="white")
-                    help_text.append("/remind [task]          - Set task reminders\n", style="white")
-                    help_text.append("/reminders              - View active reminders\n", style="white")
-                    help_text.append("/complete-reminder [n]  - Mark reminder as complete\n\n", style="white")
-
-                    help_text.append("📊 ANALYTICS & MONITORING:\n", style="bold yellow")
-                    help_text.append("/analytics              - View usage statistics\n", style="white")
-                    help_text.append("/error-analytics        - View error analytics\n", style="white")
-                    help_text.append("/start-monitoring       - Start system monitoring\n", style="white")
-                    help_text.append("/stop-monitoring        - Stop system monitoring\n", style="white")
-                    help_text.append("/net-diag               - Network diagnostics\n", style="white")
-                    help_text.append("/analyze-logs           - Analyze log files\n", style="white")
-                    help_text.append("/health                 - System health check\n\n", style="white")
-
-                    help_text.append("🎮 GAMES & LEARNING:\n", style="bold yellow")
-                    help_text.append("/challenge [difficulty] - Get coding challenge\n", style="white")
-                    help_text.append("/submit-challenge [id] [pid] [code] - Submit solution\n", style="white")
-                    help_text.append("/tutorial [topic]       - Start interactive tutorial\n", style="white")
-                    help_text.append("/tutorial-section [id] [num] - Get tutorial section\n", style="white")
-                    help_text.append("/quiz [topic]           - Take interactive quiz\n", style="white")
-                    help_text.append("/answer-quiz [id] [num] - Answer quiz question\n", style="white")
-                    help_text.append("/user-stats             - View learning statistics\n\n", style="white")
-
-                    help_text.append("🎨 CREATIVE TOOLS:\n", style="bold yellow")
-                    help_text.append("/ascii [text]           - Generate ASCII art\n", style="white")
-                    help_text.append("/colors [type] [base]   - Generate color schemes\n", style="white")
-                    help_text.append("/music [mood] [length]  - Generate music patterns\n", style="white")
-                    help_text.append("/story [genre] [length] - Generate creative stories\n\n", style="white")
-
-                    help_text.append("🔒 ADVANCED SECURITY:\n", style="bold yellow")
-                    help_text.append("/encrypt [message]      - Encrypt messages\n", style="white")
-                    help_text.append("/decrypt [message]      - Decrypt messages\n", style="white")
-                    help_text.append("/rotate-key [service] [key] - Rotate API keys\n", style="white")
-                    help_text.append("/biometric-auth [data]  - Biometric authentication\n", style="white")
-                    help_text.append("/secure-password [len]  - Generate secure passwords\n", style="white")
-                    help_text.append("/security-report        - View security report\n", style="white")
-                    help_text.append("/threat-scan [text]     - Scan for security threats\n\n", style="white")
-
-                    help_text.append("🎨 THEME MANAGEMENT:\n", style="bold yellow")
-                    help_text.append("/themes                  - List all available themes\n", style="white")
-                    help_text.append("/theme set [name]        - Switch to a theme\n", style="white")
-                    help_text.append("/theme current           - Show current theme\n", style="white")
-                    help_text.append("/theme preview [name]    - Preview a theme\n", style="white")
-                    help_text.append("/theme create [name] [base] - Create custom theme\n", style="white")
-                    help_text.append("/theme delete [name]     - Delete custom theme\n", style="white")
-                    help_text.append("/theme export [name] [fmt] - Export theme (json/python)\n", style="white")
-                    help_text.append("/theme stats             - Show theme statistics\n", style="white")
-                    help_text.append("/theme reset             - Reset to default theme\n\n", style="white")
-
-                    help_text.append("� CODE REVIEW ASSISTANT:\n", style="bold yellow")
-                    help_text.append("/review analyze [file]   - Full code analysis\n", style="white")
-                    help_text.append("/review security [file]  - Security analysis only\n", style="white")
-                    help_text.append("/review performance [file] - Performance analysis only\n", style="white")
-                    help_text.append("/review quality [file]   - Quality metrics only\n", style="white")
-                    help_text.append("/review compare [f1] [f2] - Compare two files\n", style="white")
-                    help_text.append("/review suggest [file]   - AI improvement suggestions\n", style="white")
-                    help_text.append("/review language [file]  - Detect programming language\n", style="white")
-                    help_text.append("/review history          - Recent review history\n", style="white")
-                    help_text.append("/review stats            - Review statistics\n\n", style="white")
-
-                    help_text.append("�📝 TASK MANAGEMENT:\n", style="bold yellow")
-                    help_text.append("/task add [title]       - Add a new task\n", style="white")
-                    help_text.append("/task create [title]    - Create a new task\n", style="white")
-                    help_text.append("/tasks                  - List all pending tasks\n", style="white")
-                    help_text.append("/task show [id]         - Show task details\n", style="white")
-                    help_text.append("/task complete [id]     - Mark task as completed\n", style="white")
-                    help_text.append("/task delete [id]       - Delete a task\n", style="white")
-                    help_text.append("/task update [id] [field] [value] - Update task field\n", style="white")
-                    help_text.append("/task priority [id] [priority] - Set priority (low/medium/high/urgent)\n", style="white")
-                    help_text.append("/task category [id] [category] - Set task category\n", style="white")
-                    help_text.append("/task due [id] [date]   - Set due date (YYYY-MM-DD)\n", style="white")
-                    help_text.append("/task subtask add [task_id] [title] - Add subtask\n", style="white")
-                    help_text.append("/task subtask complete [task_id] [subtask_id] - Complete subtask\n", style="white")
-                    help_text.append("/task stats             - Show task statistics\n", style="white")
-                    help_text.append("/task search [query]    - Search tasks\n", style="white")
-                    help_text.append("/task overdue           - Show overdue tasks\n", style="white")
-                    help_text.append("/task export [format]   - Export tasks (json/csv)\n\n", style="white")
-
-                    console.print(Panel(help_text, border_style="bright_green", padding=(1, 2)))
+                    console.print(Panel(_help_text(), border_style="bright_green", padding=(1, 2)))
                     return ""
                 except Exception as e:
                     return f"❌ Error displaying help: {str(e)}"
@@ -1972,6 +2694,7 @@ class NexusAI:
                         os.environ["OPENAI_API_KEY"] = parts[2]
                     if parts[1] == "mcp":
                         os.environ["MCP_API_KEY"] = parts[2]
+                    self.ai._load_credentials()
                 return msg
             
             elif cmd.startswith("switch"):
@@ -1988,28 +2711,10 @@ class NexusAI:
                         # User specified a specific Ollama model
                         specific_model = parts[2]
                         try:
-                            # Check if the model exists
-                            ollama_response = ollama.list()
-                            
-                            # Handle ListResponse object or dict
-                            if hasattr(ollama_response, 'models'):
-                                ollama_models = ollama_response.models
-                            elif isinstance(ollama_response, dict):
-                                ollama_models = ollama_response.get("models", [])
-                            else:
-                                ollama_models = []
-                            
-                            # Extract model names from the response
-                            model_names = []
-                            for m in ollama_models:
-                                if hasattr(m, 'model'):
-                                    model_names.append(m.model)
-                                elif hasattr(m, 'name'):
-                                    model_names.append(m.name)
-                                elif isinstance(m, dict):
-                                    model_names.append(m.get('name') or m.get('model', str(m)))
-                                else:
-                                    model_names.append(str(m))
+                            # Check if the model exists; re-probe once in case it was just pulled
+                            model_names = _get_ollama_models_list()
+                            if specific_model not in model_names:
+                                model_names = _get_ollama_models_list(refresh=True)
                             
                             if specific_model in model_names:
                                 self.current_model = f"ollama:{specific_model}"
@@ -2052,7 +2757,7 @@ class NexusAI:
                 try:
                     details = [
                         "🔒 Security Info:",
-                        f"Allowed commands: {', '.join(self.allowed_commands)}",
+                        f"Allowed commands: {self._allowed_display}",
                         f"Config path: {CONFIG_PATH()}",
                         f"User DB path: {USER_DB_PATH()}"
                     ]
@@ -2094,14 +2799,7 @@ class NexusAI:
                     # Support detailed specs: /ollama-models [model_name]
                     parts = command.split(maxsplit=1)
                     try:
-                        ollama_response = ollama.list()
-                        # Handle ListResponse object or dict
-                        if hasattr(ollama_response, 'models'):
-                            models = ollama_response.models
-                        elif isinstance(ollama_response, dict):
-                            models = ollama_response.get("models", [])
-                        else:
-                            models = []
+                        models = _ollama_list()
                     except Exception as e:
                         return f"❌ Ollama not available: {str(e)[:100]}"
 
@@ -2126,18 +2824,12 @@ class NexusAI:
                         # Find the matching model entry (for size/modified)
                         meta = None
                         for m in models:
-                            if hasattr(m, 'model') and m.model == target:
-                                meta = m
-                                break
-                            elif hasattr(m, 'name') and m.name == target:
-                                meta = m
-                                break
-                            elif isinstance(m, dict) and m.get("name") == target:
+                            if _ollama_model_name(m) == target:
                                 meta = m
                                 break
                         
                         try:
-                            info = ollama.show(target)
+                            info = _ollama_show(target)
                         except Exception as e:
                             return f"❌ Could not fetch specs for '{target}': {str(e)[:100]}"
 
@@ -2182,6 +2874,19 @@ class NexusAI:
                     header = f"{'NAME':<36}  {'SIZE':>10}  {'PARAMS':>8}  {'FAMILY':<12}  {'QUANT':<8}  MODIFIED"
                     sep = "-" * len(header)
                     rows = ["🦙 Installed Ollama Models:", header, sep]
+
+                    # Specs for plain-dict entries are fetched side by side, not one round-trip each
+                    def _safe_show(name):
+                        try:
+                            return _ollama_show(name) or {}
+                        except Exception:
+                            return {}
+                    names = [m.get("name", "unknown") for m in models if not hasattr(m, 'model')]
+                    infos = {}
+                    if names:
+                        with ThreadPoolExecutor(max_workers=min(8, len(names))) as pool:
+                            infos = dict(zip(names, pool.map(_safe_show, names)))
+
                     for m in models:
                         # Handle both dict and Model object
                         if hasattr(m, 'model'):
@@ -2203,10 +2908,9 @@ class NexusAI:
                             size = _fmt_size(m.get("size", 0))
                             modified = m.get("modified_at", "") or ""
                             params = family = quant = "?"
-                            # Try to enrich with details via ollama.show (best-effort)
+                            # Enrich with the details fetched above (best-effort)
                             try:
-                                info = ollama.show(name)
-                                d = (info or {}).get('details', {}) or {}
+                                d = infos.get(name, {}).get('details', {}) or {}
                                 params = d.get('parameter_size', params) or params
                                 family = d.get('family', family) or (d.get('families', [family])[0] if isinstance(d.get('families'), list) and d.get('families') else family)
                                 quant = d.get('quantization_level', quant) or quant
@@ -2452,20 +3156,20 @@ class NexusAI:
 
                     if resp.status_code == 200:
                         # Enhanced result extraction
-                        import re
-                        results = re.findall(r'<a rel="nofollow" class="result__a" href="(.*?)">(.*?)</a>', resp.text)
+                        results = _DDG_RESULT_RE.findall(resp.text)
 
                         if not results:
                             return " No search results found. Try different keywords."
 
                         # Create a nice table for results
-                        search_table = Table(title=f" Web Search Results for: '{query}'", show_header=True, header_style="bold blue")
+                        # Query, titles and URLs are page/user text, so they go in as Text, not markup
+                        search_table = Table(title=Text(f" Web Search Results for: '{query}'"), show_header=True, header_style="bold blue")
                         search_table.add_column("#", style="cyan", width=3)
                         search_table.add_column("Title", style="white", min_width=40)
                         search_table.add_column("URL", style="green", min_width=30)
 
                         for i, (url, title) in enumerate(results[:8]):  # Show more results
-                            clean_title = re.sub('<.*?>', '', title).strip()
+                            clean_title = _TAG_RE.sub('', title).strip()
                             if len(clean_title) > 60:
                                 clean_title = clean_title[:57] + "..."
 
@@ -2475,11 +3179,13 @@ class NexusAI:
                             elif url.startswith('/'):
                                 url = 'https://duckduckgo.com' + url
 
-                            search_table.add_row(str(i+1), clean_title, url)
+                            search_table.add_row(str(i+1), Text(clean_title), Text(url))
 
-                        console.print(search_table)
-                        console.print(f"\n Found {len(results)} results (showing top 8)")
-                        console.print(" Click on URLs to visit the pages")
+                        console.print(Group(
+                            search_table,
+                            Text(f"\n Found {len(results)} results (showing top 8)"),
+                            Text(" Click on URLs to visit the pages"),
+                        ))
                         return ""
 
                     return f" Web search error: HTTP {resp.status_code}"
@@ -2722,9 +3428,9 @@ class NexusAI:
                 if not os.path.exists(parts[1]):
                     return f"❌ File not found: {parts[1]}"
                 try:
-                    with open(parts[1], 'r') as f:
-                        code = f.read(2000)  # Limit to 2000 chars for AI processing
-                    return self.ai.query(self.current_model, f"Review this code and provide improvement suggestions:\n\n```{self.code_reviewer.detect_language(parts[1])}\n{code}\n```")
+                    code = _read_excerpt(parts[1])  # At most ~2000 bytes for AI processing
+                    language = self.code_reviewer.detect_language(parts[1])
+                    return self.ai.query(self.current_model, _PROMPT_SUGGEST.format(language=language, code=code))
                 except Exception as e:
                     return f"❌ Error reading file: {str(e)}"
 
@@ -2749,7 +3455,7 @@ class NexusAI:
                        "• /integrate supported - List supported services\n" \
                        "• /integrate add [service] - Add a service\n" \
                        "• /integrate remove [service] - Remove a service\n" \
-                       "• /integrate test [service] - Test connection\n" \
+                       "• /integrate test [service|all] - Test connection\n" \
                        "• /integrate info [service] - Service information\n" \
                        "• /integrate action [service] [action] - Execute action"
 
@@ -2786,9 +3492,12 @@ class NexusAI:
             if cmd.startswith("integrate test"):
                 parts = command.split()
                 if len(parts) != 3:
-                    return "Usage: /integrate test [service] - Test service connection"
+                    return "Usage: /integrate test [service|all] - Test service connection"
                 if not self.integration_hub:
                     return "❌ Integration Hub module not available"
+                if parts[2] == "all":
+                    results = self.integration_hub.test_all_connections()
+                    return "\n".join(results.values()) if results else "📋 No services configured"
                 return self.integration_hub.test_connection(parts[2])
 
             if cmd.startswith("integrate info"):
@@ -2841,6 +3550,14 @@ class NexusAI:
                 except json.JSONDecodeError:
                     return "❌ Invalid JSON events list"
 
+            if cmd.startswith("webhook remove"):
+                parts = command.split()
+                if len(parts) != 3:
+                    return "Usage: /webhook remove [webhook_id] - Remove webhook"
+                if not self.integration_hub:
+                    return "❌ Integration Hub module not available"
+                return self.integration_hub.remove_webhook(parts[2])
+
             # --- Task Management ---
             if cmd.startswith("task add"):
                 parts = command.split(maxsplit=1)
@@ -3376,11 +4093,7 @@ class NexusAI:
                 
                 try:
                     # Get models - handle both dict and ListResponse object
-                    models_response = ollama.list()
-                    if hasattr(models_response, 'models'):
-                        models_data = models_response.models
-                    else:
-                        models_data = models_response.get("models", [])
+                    models_data = _ollama_list()
                     
                     if not models_data:
                         return "❌ No Ollama models found.\n   Use 'ollama pull [model]' to download models."
@@ -3515,7 +4228,7 @@ class NexusAI:
                 return "Usage: /ml [list|train <data>|evaluate <model>]"
 
         except Exception as e:
-            logging.error(f"Command handling error: {str(e)}")
+            logging.error("Command handling error: %s", e)
             return " Command processing error"
 # --- Main Loop ---
 # --- Main Loop ---
@@ -3544,6 +4257,9 @@ def run_cli_mode() -> int:
         print(f"Fatal CLI error: {e}")
         return 1
 
+def _print_chunk(chunk: str) -> None:
+    console.print(chunk, end="", soft_wrap=True, markup=False, highlight=False)
+
 def run_interactive_mode() -> int:
     """Run interactive mode with prompt_toolkit"""
     try:
@@ -3581,7 +4297,8 @@ def run_interactive_mode() -> int:
                     console.print("[yellow]Goodbye![/yellow]")
                     break
                 
-                response = nexus.process_input(user_input)
+                # Chat replies are printed as they stream; the returned "" ends the line
+                response = nexus.process_input(user_input, stream=_print_chunk)
                 console.print(response)
                 
             except KeyboardInterrupt:
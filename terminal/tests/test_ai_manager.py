@@ -0,0 +1,237 @@
+import pytest
+
+from terminal import main
+
+
+def test_ollama_model_list_is_cached_until_refresh(monkeypatch):
+    probes = []
+
+    def fake_probe():
+        probes.append(1)
+        return ['llama3']
+
+    monkeypatch.setattr(main, '_probe_ollama_models', fake_probe)
+    monkeypatch.setattr(main, '_ollama_models_cache', None)
+    assert main._get_ollama_models_list() == ['llama3']
+    assert main._get_ollama_models_list() == ['llama3']
+    assert len(probes) == 1
+
+    main._get_ollama_models_list(refresh=True)
+    assert len(probes) == 2
+
+
+def test_prompt_cache_similarity_tier():
+    cache = main.PromptCache(ttl=60, similarity=0.9)
+    cache.set(('groq', 'a'), 'Paris', 'What is the capital of France?')
+    assert cache.get(('groq', 'b'), 'what is the capital of france') == 'Paris'
+    assert cache.get(('groq', 'c'), 'What is the capital of Spain?') is None
+    assert cache.get(('gemini', 'b'), 'what is the capital of france') is None
+
+    exact_only = main.PromptCache(ttl=60)
+    exact_only.set(('groq', 'a'), 'Paris', 'What is the capital of France?')
+    assert exact_only.get(('groq', 'b'), 'what is the capital of france') is None
+
+
+def test_prompt_cache_evicts_least_recently_used():
+    cache = main.PromptCache(ttl=60, maxsize=2)
+    cache.set(('m', 'a'), 'A')
+    cache.set(('m', 'b'), 'B')
+    assert cache.get(('m', 'a')) == 'A'
+    cache.set(('m', 'c'), 'C')
+    assert cache.get(('m', 'a')) == 'A'
+    assert cache.get(('m', 'b')) is None
+
+
+def test_query_stream_yields_chunks_and_caches(monkeypatch):
+    ai = main.AIManager.__new__(main.AIManager)
+    ai.security = main.SecurityManager()
+    calls = []
+
+    def fake_stream(model, prompt):
+        calls.append(prompt)
+        return iter(['Hel', None, 'lo'])
+
+    monkeypatch.setattr(ai, '_provider_stream', fake_stream)
+    monkeypatch.setattr(main, '_prompt_cache', main.PromptCache(ttl=60))
+    assert list(ai.query_stream('groq', 'hi there')) == ['Hel', 'lo']
+    assert list(ai.query_stream('groq', 'hi there')) == ['Hello']
+    assert calls == ['hi there']
+
+
+def test_query_stream_falls_back_to_query(monkeypatch):
+    ai = main.AIManager.__new__(main.AIManager)
+    ai.security = main.SecurityManager()
+    monkeypatch.setattr(ai, '_provider_stream', lambda model, prompt: None)
+    monkeypatch.setattr(ai, 'query', lambda model, prompt: f"{model}:{prompt}")
+    monkeypatch.setattr(main, '_prompt_cache', main.PromptCache(ttl=60))
+    assert list(ai.query_stream('mcp', 'hi')) == ['mcp:hi']
+
+
+def test_huggingface_batch_sends_one_request(monkeypatch):
+    ai = main.AIManager.__new__(main.AIManager)
+    ai._creds = {'huggingface': 'hf_token'}
+    sent = []
+
+    class Response:
+        status_code = 200
+
+        def json(self):
+            return [[{'generated_text': 'a'}], {'generated_text': 'b'}]
+
+    def post(url, **kwargs):
+        sent.append(kwargs['json'])
+        return Response()
+
+    ai.session = main.requests.Session()
+    monkeypatch.setattr(ai.session, 'post', post)
+    assert ai._query_huggingface_batch(['x', 'y']) == ['a', 'b']
+    assert sent == [{'inputs': ['x', 'y']}]
+
+
+def test_query_many_async_runs_models_concurrently(monkeypatch):
+    import asyncio
+    import threading
+
+    ai = main.AIManager.__new__(main.AIManager)
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_query(model, prompt):
+        barrier.wait()  # deadlocks unless both queries are in flight together
+        return f"{model}:{prompt}"
+
+    monkeypatch.setattr(ai, 'query', fake_query)
+    assert asyncio.run(ai.query_many_async(['groq', 'gemini'], 'hi')) == {'groq': 'groq:hi', 'gemini': 'gemini:hi'}
+
+
+def test_prompt_cache_persists_between_instances(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    main.PromptCache(ttl=60, path=path).set(('groq', 'abc'), 'answer')
+    assert main.PromptCache(ttl=60, path=path).get(('groq', 'abc')) == 'answer'
+    assert main.PromptCache(ttl=60, path=path, persist_ttl=-1).get(('groq', 'abc')) is None
+
+
+def test_ollama_list_shapes_normalise_to_names():
+    from types import SimpleNamespace
+    obj = SimpleNamespace(models=[SimpleNamespace(model='llama3'), SimpleNamespace(model=None, name='phi')])
+    assert [main._ollama_model_name(m) for m in main._ollama_model_entries(obj)] == ['llama3', 'phi']
+    assert [main._ollama_model_name(m) for m in main._ollama_model_entries({'models': [{'model': 'qwen'}]})] == ['qwen']
+    assert main._ollama_model_entries(None) == []
+
+
+def test_query_dispatches_to_provider_handler(monkeypatch):
+    ai = main.AIManager.__new__(main.AIManager)
+    ai.security = main.SecurityManager()
+    ai._creds = {'openai': None}
+    ai._handlers = {'chatgpt': ai._q_chatgpt, 'ollama': lambda prompt, model: f"{model}|{prompt}"}
+    monkeypatch.setattr(main, '_prompt_cache', main.PromptCache(ttl=60))
+    assert ai.query('ollama:phi', 'hi') == 'ollama:phi|hi'
+    assert ai.query('chatgpt', 'hi') == " OpenAI API key not configured or invalid"
+    assert ai.query('nope', 'hi') == " Model 'nope' not available"
+
+
+def test_ollama_query_posts_to_chat_endpoint(monkeypatch):
+    ai = main.AIManager.__new__(main.AIManager)
+    ai._creds = {'ollama_url': 'http://ollama:11434'}
+    ai.session = main.requests.Session()
+    sent = []
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {'message': {'role': 'assistant', 'content': 'hello'}}
+
+    def post(url, **kwargs):
+        sent.append((url, kwargs['json']['model'], kwargs['json']['stream']))
+        return Response()
+
+    monkeypatch.setattr(ai.session, 'post', post)
+    monkeypatch.setattr(ai, '_check_ollama', lambda: True)
+    assert ai._q_ollama('hi', 'ollama:phi3') == 'hello'
+    assert sent == [('http://ollama:11434/api/chat', 'phi3', False)]
+
+
+def test_ollama_listing_is_reused_and_survives_outage(monkeypatch):
+    calls = []
+
+    class FakeOllama:
+        down = False
+
+        def list(self):
+            calls.append('list')
+            if self.down:
+                raise ConnectionError('refused')
+            return {'models': [{'name': 'llama3'}]}
+
+        def show(self, name):
+            calls.append(('show', name))
+            return {'details': {'family': 'llama'}}
+
+    fake = FakeOllama()
+    monkeypatch.setitem(vars(main), 'ollama', fake)
+    monkeypatch.setattr(main, '_ollama_list_cache', None)
+    monkeypatch.setattr(main, '_ollama_show_cache', {})
+    assert main._ollama_list() == main._ollama_list() == [{'name': 'llama3'}]
+    assert main._ollama_show('llama3') is main._ollama_show('llama3')
+    assert calls == ['list', ('show', 'llama3')]
+
+    fake.down = True
+    assert main._ollama_list(refresh=True) == [{'name': 'llama3'}]
+    monkeypatch.setattr(main, '_ollama_list_cache', None)
+    with pytest.raises(ConnectionError):
+        main._ollama_list()
+
+
+def test_ollama_models_table_fetches_specs_concurrently(monkeypatch):
+    import threading
+    barrier = threading.Barrier(3, timeout=5)
+    entries = [{'name': n, 'size': 0} for n in ('a', 'b', 'c')]
+
+    def show(name):
+        barrier.wait()  # only passes once all three lookups are in flight
+        return {'details': {'family': f'fam-{name}', 'parameter_size': '7B'}}
+
+    monkeypatch.setattr(main, '_ollama_list', lambda refresh=False: entries)
+    monkeypatch.setattr(main, '_ollama_show', show)
+    nexus = main.NexusAI.__new__(main.NexusAI)
+    nexus._register_commands()
+    out = nexus.handle_command('/ollama-models')
+    assert 'fam-a' in out and 'fam-c' in out and '7B' in out
+
+
+def test_prompt_cache_is_safe_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    cache = main.PromptCache(ttl=60, maxsize=16, similarity=0.99)
+
+    def hammer(n):
+        for i in range(300):
+            prompt = f'prompt {n} {i % 40}'
+            cache.set(('groq', prompt), prompt, prompt)
+            cache.get(('groq', prompt + '?'), prompt + ' again')
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(hammer, range(8)))  # re-raises any RuntimeError/KeyError
+    assert len(cache.store) <= 16
+
+
+def test_huggingface_errors_are_not_cached(monkeypatch):
+    ai = main.AIManager.__new__(main.AIManager)
+    ai.security = main.SecurityManager()
+    ai._creds = {'huggingface': None}
+    ai._handlers = {'huggingface': ai._q_huggingface}
+    cache = main.PromptCache(ttl=60)
+    monkeypatch.setattr(main, '_prompt_cache', cache)
+    assert ai.query('huggingface', 'hello') == " HuggingFace token not configured or invalid"
+    assert not cache.store
+
+
+def test_malformed_prompt_cache_settings_are_ignored(monkeypatch):
+    monkeypatch.setenv('NEXUS_PROMPT_SIMILARITY', 'high')
+    monkeypatch.setenv('NEXUS_PROMPT_CACHE_TTL', 'a day')
+    cache = main._make_prompt_cache()
+    assert cache.similarity is None and cache._db is None
+
+    monkeypatch.setenv('NEXUS_PROMPT_SIMILARITY', '5')
+    monkeypatch.delenv('NEXUS_PROMPT_CACHE_TTL')
+    assert main._make_prompt_cache().similarity == 1.0
@@ -0,0 +1,278 @@
+import os
+import re
+import subprocess
+import sys
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from terminal.main import (
+    NexusAI, _GitObjectReader, _commit_subject, _parse_status_v2, _run_capped, _search_files,
+)
+
+
+def _nexus():
+    nexus = NexusAI.__new__(NexusAI)
+    nexus.git_calls = []
+
+    def fake_git(argv):
+        nexus.git_calls.append(argv)
+        return " ".join(argv)
+
+    nexus.execute_git_command = fake_git
+    nexus._git_cache, nexus._git_generation, nexus._repo_size_cache = OrderedDict(), 0, None
+    nexus._git_cache_lock = threading.Lock()
+    nexus._register_commands()
+    return nexus
+
+
+def test_git_commands_dispatch_through_tables():
+    nexus = _nexus()
+    assert nexus.handle_command("/git status") == "git --no-optional-locks status --porcelain"
+    assert nexus.handle_command("/git add a.py b.py") == "git add a.py b.py"
+    assert nexus.handle_command("/git log 3") == "git log --oneline -3"
+    assert nexus.handle_command("/git checkout") == "Usage: /git checkout [branch]"
+    assert nexus.handle_command("/git stats").startswith("📈")
+    assert nexus.handle_command('/git commit "fix  the \\"quoted\\" bug"') == 'git commit -m fix  the "quoted" bug'
+    assert nexus.git_calls[-1] == ["git", "commit", "-m", 'fix  the "quoted" bug']
+    nexus.handle_command('/git add "my file.txt" b.py')
+    assert nexus.git_calls[-1] == ["git", "add", "my file.txt", "b.py"]
+    assert nexus.handle_command('/git commit "unbalanced').startswith("❌ Could not parse command")
+    assert nexus.handle_command("/git create-branch a b") == "Usage: /git create-branch [name]"
+    assert nexus.handle_command("/git delete-branch old") == "git branch -d old"
+    # Destructive or long-running commands stay behind the background catch-all
+    for name in ("git clean", "git clone", "git fetch", "git init"):
+        assert nexus._find_command(name) is None
+
+
+def test_prefix_commands_match_whole_words():
+    nexus = _nexus()
+    assert nexus._find_command("git commit fix it") is nexus._find_command("git commit")
+    assert nexus._find_command("git commitmsg x.diff") not in (None, nexus._find_command("git commit"))
+    assert nexus._find_command("git status") is not None
+    assert nexus._find_command("gitstatus") is None and nexus._find_command("") is None
+
+
+def test_ai_file_commands_send_file_head(tmp_path):
+    nexus = _nexus()
+    nexus.current_model = 'gemini'
+    nexus.ai = SimpleNamespace(query=lambda model, prompt: prompt)
+    (tmp_path / 'a.py').write_text('x = 1\n')
+    assert nexus.handle_command(f"/findbugs {tmp_path / 'a.py'}") == "Find bugs in this code:\nx = 1\n"
+    assert nexus.handle_command(f"/refactor {tmp_path / 'a.py'} use snake case") == (
+        "Refactor this code as per instruction 'use snake case':\nx = 1\n")
+    assert nexus.handle_command("/gendoc") == "Usage: /gendoc [filename]"
+
+
+def test_git_repo_check_is_cached_per_directory(tmp_path, monkeypatch):
+    nexus = NexusAI.__new__(NexusAI)
+    nexus._git_repo_dirs = set()
+    monkeypatch.chdir(tmp_path)
+    assert nexus.execute_git_command(["git", "status"]).startswith("❌ Not a Git repository")
+    assert nexus._git_repo_dirs == set()
+
+    calls = []
+    monkeypatch.setattr("terminal.main.os.path.exists", lambda p: calls.append(p) or True)
+    nexus.execute_git_command(["git", "status"])
+    nexus.execute_git_command(["git", "status"])
+    assert nexus._git_repo_dirs == {str(tmp_path)} and len(calls) == 1
+
+
+def test_run_capped_stops_reading_at_limit():
+    code, out, err, truncated = _run_capped(
+        [sys.executable, '-c', 'print("line\\n" * 10 ** 6)'], 12, timeout=10)
+    assert (code, out, truncated) == (0, "line\nline\n", True)
+
+    code, out, err, truncated = _run_capped(
+        [sys.executable, '-c', 'import sys; sys.exit("boom")'], 100, timeout=10)
+    assert code == 1 and err.strip() == "boom" and not truncated
+
+
+def test_format_git_status_groups_porcelain_codes():
+    nexus = NexusAI.__new__(NexusAI)
+    out = nexus._format_git_status(" M a.py\nA  b.py\n?? c.py\nMM skipped.py")
+    assert out == ("📊 Git Status:\n\n"
+                   "✅ Staged Changes:\n➕ Added: b.py\n\n"
+                   "📝 Unstaged Changes:\n📝 Modified: a.py\n\n"
+                   "❓ Untracked Files:\n❓ Untracked: c.py\n\n")
+
+
+def test_file_commands_stay_inside_cwd(tmp_path, monkeypatch):
+    from terminal.main import SecurityManager
+    nexus = NexusAI.__new__(NexusAI)
+    nexus.security = SecurityManager()
+    nexus.allowed_commands = frozenset(['cat'])
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'sub' / 'a.txt').write_text('hello')
+    (tmp_path / 'subx.txt').write_text('secret')
+    monkeypatch.chdir(tmp_path / 'sub')
+    assert nexus.execute_command('cat a.txt') == 'hello'
+    # A sibling that merely shares the directory name as a prefix is outside
+    assert nexus.execute_command('cat ' + str(tmp_path / 'subx.txt')).startswith("❌ Only files")
+
+
+def test_parse_status_v2_counts_each_side():
+    out = b"\0".join([
+        b"# branch.oid abc123", b"# branch.head main",
+        b"1 M. N... 100644 100644 100644 h1 h2 staged.py",
+        b"1 MM N... 100644 100644 100644 h1 h2 both.py",
+        b"2 R. N... 100644 100644 100644 h1 h2 R100 new.py", b"? looks-untracked.py",
+        b"? notes.txt", b"",
+    ])
+    assert _parse_status_v2(out) == {'oid': 'abc123', 'head': 'main',
+                                     'staged': 3, 'unstaged': 1, 'untracked': 1}
+
+
+def _commit(message):
+    subprocess.run(['git', '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-q',
+                    '--allow-empty', '-m', message], check=True)
+
+
+def test_git_object_reader_sees_new_commits(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    subprocess.run(['git', 'init', '-q'], check=True)
+    _commit('first')
+    reader = _GitObjectReader()
+    try:
+        kind, data = reader.read('HEAD')
+        assert kind == 'commit' and _commit_subject(data) == 'first'
+        _commit('second')
+        assert _commit_subject(reader.read('HEAD')[1]) == 'second'
+        assert reader.read('HEAD:missing.txt') is None
+    finally:
+        reader.close()
+
+
+def test_git_queries_are_cached_until_head_moves(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    subprocess.run(['git', 'init', '-q'], check=True)
+    _commit('first')
+    nexus = _nexus()
+    calls = []
+
+    def run(argv):
+        calls.append(argv)
+        return len(calls)
+
+    assert nexus._cached_git(['git', 'rev-list', '--count', 'HEAD'], run) == 1
+    assert nexus._cached_git(['git', 'rev-list', '--count', 'HEAD'], run) == 1
+    _commit('second')
+    assert nexus._cached_git(['git', 'rev-list', '--count', 'HEAD'], run) == 2
+
+
+def test_git_cache_is_thread_safe(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    subprocess.run(['git', 'init', '-q'], check=True)
+    _commit('first')
+    nexus = _nexus()
+
+    def run(argv):
+        return argv[-1]
+
+    def worker(i):
+        for j in range(50):
+            arg = str((i * 50 + j) % 40)
+            assert nexus._cached_git(['git', 'log', arg], run) == arg
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(nexus._git_cache) <= 32
+
+
+def test_search_files_uses_git_grep_and_honours_gitignore(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'a.py').write_text('x = 1  # TODO: a\n')
+    (tmp_path / 'build.log').write_text('TODO: ignored\n')
+    # Outside a repository every file is walked
+    assert sorted(_search_files(['TODO'], 5)) == ['a.py:1: x = 1  # TODO: a', 'build.log:1: TODO: ignored']
+
+    subprocess.run(['git', 'init', '-q'], check=True)
+    (tmp_path / '.gitignore').write_text('*.log\n')
+    (tmp_path / 'b.py').write_text('# FIXME b\n' * 3)
+    assert _search_files(['TODO', 'FIXME'], 3) == [
+        'a.py:1: x = 1  # TODO: a', 'b.py:1: # FIXME b', 'b.py:2: # FIXME b']
+
+
+def test_walk_search_stops_at_limit_and_skips_tool_dirs(tmp_path, monkeypatch):
+    from terminal import main
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'node_modules').mkdir()
+    (tmp_path / 'node_modules' / 'dep.js').write_text('TODO dep\n')
+    (tmp_path / 'a.py').write_text('TODO 1\nTODO 2\nTODO 3\n')
+    opened = []
+    real_open = open
+    monkeypatch.setattr('builtins.open', lambda p, *a, **kw: opened.append(p) or real_open(p, *a, **kw))
+    assert main._walk_search(['TODO'], 2) == ['a.py:1: TODO 1', 'a.py:2: TODO 2']
+    assert [os.path.basename(p) for p in opened] == ['a.py']
+
+
+def test_scan_file_reports_line_numbers_through_mmap(tmp_path, monkeypatch):
+    from terminal import main
+    monkeypatch.setattr(main, '_MMAP_MIN_SIZE', 1)
+    pattern = re.compile(b'TODO|FIXME')
+    text = tmp_path / 'a.py'
+    text.write_bytes(b'x\nTODO one TODO\n\ny  # FIXME\nTODO')
+    assert main._scan_file(str(text), pattern, 10) == [
+        'a.py:2: TODO one TODO', 'a.py:4: y  # FIXME', 'a.py:5: TODO']
+    assert main._scan_file(str(text), pattern, 1) == ['a.py:2: TODO one TODO']
+    binary = tmp_path / 'b.bin'
+    binary.write_bytes(b'\0TODO')
+    assert main._scan_file(str(binary), pattern, 10) == []
+
+
+def test_read_excerpt_keeps_both_ends_of_long_files(tmp_path):
+    from terminal.main import _read_excerpt
+    short = tmp_path / 'short.py'
+    short.write_text('x = 1\n')
+    assert _read_excerpt(str(short)) == 'x = 1\n'
+    long = tmp_path / 'long.py'
+    long.write_bytes(b'a' * 3000 + b'b' * 3000)
+    assert _read_excerpt(str(long), 10) == 'aaaaa\n...\nbbbbb'
+
+
+def test_unknown_git_subcommands_are_rejected_up_front():
+    nexus = _nexus()
+    assert nexus.handle_command("/git fetch origin").startswith("❌ Unknown git subcommand: /git fetch")
+    assert nexus.handle_command("/git -c alias.x=!sh x").startswith("❌ Unknown git subcommand")
+    assert nexus.git_calls == []
+
+
+def test_git_ignore_skips_existing_patterns(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    nexus = _nexus()
+    (tmp_path / '.gitignore').write_text('*.log')
+    assert nexus.handle_command("/git ignore build/").startswith("✅")
+    assert nexus.handle_command("/git ignore *.log").startswith("ℹ️")
+    assert nexus.handle_command("/git ignore build/").startswith("ℹ️")
+    assert (tmp_path / '.gitignore').read_text() == '*.log\nbuild/\n'
+
+
+def test_websearch_prints_results_once(monkeypatch):
+    from terminal import main
+    html = ('<a rel="nofollow" class="result__a" href="//example.com/a">[/b] <b>A</b></a>'
+            '<a rel="nofollow" class="result__a" href="/l/?u=b">B</a>')
+    nexus = _nexus()
+    nexus.ai = SimpleNamespace(session=SimpleNamespace(
+        get=lambda *a, **kw: SimpleNamespace(status_code=200, text=html)))
+    printed = []
+    monkeypatch.setattr(main.console, 'print', lambda *a, **kw: printed.append(a))
+    assert nexus.handle_command("/websearch [red]rich[/red]") == ""
+    assert len(printed) == 1
+    with main.console.capture() as capture:
+        main.Console.print(main.console, *printed[0])
+    out = capture.get()
+    assert "[red]rich[/red]" in out and "[/b] A" in out and "https://duckduckgo.com/l/?u=b" in out
+    assert "Found 2 results" in out
+
+
+def test_free_form_git_commands_are_not_executed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    subprocess.run(['git', 'init', '-q'], check=True)
+    nexus = NexusAI.__new__(NexusAI)
+    nexus._git_repo_dirs = set()
+    # The catch-all hands over the raw '/git ...' text, which never reaches git
+    out = nexus.execute_git_command("/git -c alias.x=!touch${IFS}pwned x")
+    assert out.startswith("❌") and not (tmp_path / 'pwned').exists()
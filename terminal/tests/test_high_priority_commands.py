@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+from terminal.high_priority_commands import (
+    get_all_high_priority_commands,
+    register_api_commands,
+    register_db_commands,
+    register_watch_commands,
+)
+
+
+class Recorder:
+    """Fake manager that records every method call it receives."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return name
+        return method
+
+
+def _nexus(**managers):
+    return SimpleNamespace(_http_last_method='GET', _http_last_url='http://x',
+                           _http_last_data=None, **managers)
+
+
+def test_missing_args_return_usage():
+    api = Recorder()
+    commands = register_api_commands(_nexus(api_client=api))
+    assert commands['http post'](['http://x']) == "Usage: /http post [url] [json_data]"
+    assert api.calls == []
+
+
+def test_optional_args_use_defaults_and_coercion():
+    api = Recorder()
+    commands = register_api_commands(_nexus(api_client=api))
+    commands['http get'](['http://x'])
+    commands['http benchmark'](['http://x', '5'])
+    commands['http test'](['http://x'])
+    assert api.calls == [
+        ('get', ('http://x', None), {}),
+        ('benchmark', ('http://x', 5), {}),
+        ('test_endpoint', ('http://x', 200), {}),
+    ]
+
+
+def test_variadic_commands_join_arguments():
+    db, watch = Recorder(), Recorder()
+    nexus = _nexus(database_manager=db, file_watcher=watch)
+    register_db_commands(nexus)['db query'](['SELECT', '*', 'FROM', 't'])
+    register_watch_commands(nexus)['watch start'](['src', 'npm', 'test'])
+    assert db.calls == [('query', ('SELECT * FROM t',), {})]
+    assert watch.calls == [('start', ('src', 'npm test'), {})]
+
+
+def test_save_uses_last_request():
+    api = Recorder()
+    register_api_commands(_nexus(api_client=api))['http save'](['mine'])
+    assert api.calls == [('save_collection', ('mine', 'GET', 'http://x', None), {})]
+
+
+def test_repeated_registration_shares_handlers():
+    nexus = _nexus(api_client=Recorder())
+    first = register_api_commands(nexus)
+    second = register_api_commands(nexus)
+    assert first['http get'] is second['http get']
+    assert register_api_commands(_nexus(api_client=Recorder()))['http get'] is not first['http get']
+
+
+def test_invalid_int_argument_returns_usage():
+    api = Recorder()
+    commands = register_api_commands(_nexus(api_client=api))
+    assert commands['http benchmark'](['http://x', 'lots']) == "Usage: /http benchmark [url] [requests]"
+    assert api.calls == []
+
+
+def test_all_commands_skip_missing_managers():
+    nexus = _nexus(api_client=Recorder(), database_manager=None, package_manager=None,
+                   test_runner=Recorder(), file_watcher=None)
+    commands = get_all_high_priority_commands(nexus)
+    assert 'http get' in commands and 'test run' in commands
+    assert 'db query' not in commands
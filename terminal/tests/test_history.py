@@ -0,0 +1,19 @@
+from terminal.history import HistoryManager
+
+
+def test_save_and_load_session(tmp_path):
+    hm = HistoryManager(base_dir=str(tmp_path))
+    messages = [{'role': 'user', 'content': 'héllo'}]
+    path = hm.save_session('alice', messages)
+    assert path
+
+    sessions = hm.list_sessions('alice')
+    assert len(sessions) == 1
+    data = hm.load_session(sessions[0])
+    assert data['username'] == 'alice'
+    assert data['messages'] == messages
+
+
+def test_load_missing_session(tmp_path):
+    hm = HistoryManager(base_dir=str(tmp_path))
+    assert hm.load_session('nobody_0.json') is None
@@ -0,0 +1,186 @@
+import asyncio
+import json
+
+import pytest
+
+from terminal.integration_hub import IntegrationHub
+
+
+@pytest.fixture
+def hub(tmp_path, monkeypatch):
+    # integrations.json is resolved relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    hub = IntegrationHub()
+    yield hub
+    hub.close()
+
+
+def test_session_is_reused_and_reset_on_reconfigure(hub):
+    hub.add_service('github', {'token': 'abc'})
+    session = hub._get_session('github')
+    assert hub._get_session('github') is session
+    assert session.headers['Authorization'] == 'token abc'
+
+    hub.add_service('github', {'token': 'xyz'})
+    assert hub._get_session('github') is not session
+    assert hub._get_session('github').headers['Authorization'] == 'token xyz'
+
+
+def test_integrations_persist_between_instances(hub, tmp_path):
+    hub.add_service('slack', {'token': 't'})
+    hub.add_service('github', {'token': 'g'})
+    hub.flush()
+    assert not (tmp_path / 'integrations.json.tmp').exists()
+    assert set(IntegrationHub().services) == {'slack', 'github'}
+
+
+
+def test_failed_save_is_rescheduled(hub):
+    hub.add_service('slack', {'token': 't'})
+    hub.save_integrations = lambda: "❌ Error saving integrations: disk full"
+    assert hub.flush().startswith("❌")
+    assert hub._dirty and hub._save_timer is not None
+    del hub.save_integrations
+    assert hub.flush().startswith("✅")
+
+def test_all_connections_runs_every_service(hub, monkeypatch):
+    hub.add_service('github', {'token': 'a'})
+    hub.add_service('slack', {'token': 'b'})
+
+    def fake_test(name):
+        hub._set_status(name, 'connected')
+        return f"ok {name}"
+
+    monkeypatch.setattr(hub, 'test_connection', fake_test)
+    assert hub.test_all_connections() == {'github': 'ok github', 'slack': 'ok slack'}
+    assert hub.get_integration_stats()['connected_services'] == 2
+
+
+def test_successful_connection_test_is_cached(hub, monkeypatch):
+    hub.add_service('github', {'token': 'a'})
+    calls = []
+
+    def fake_github(service):
+        calls.append(service['token'])
+        return "✅ GitHub connected as me"
+
+    monkeypatch.setitem(hub._test_dispatch, 'github', fake_github)
+    assert hub.test_connection('github') == hub.test_connection('github')
+    assert calls == ['a']
+
+    hub.add_service('github', {'token': 'b'})
+    hub.test_connection('github')
+    assert calls == ['a', 'b']
+
+
+@pytest.mark.parametrize('url', [
+    'http://127.0.0.1/hook',
+    'https://localhost:8080/hook',
+    'http://[::1]/hook',
+    'http://172.16.0.5/hook',
+    'http://169.254.169.254/latest',
+    'file:///etc/passwd',
+])
+def test_webhook_rejects_local_targets(hub, url):
+    hub.add_service('github', {'token': 'a'})
+    with pytest.raises(ValueError):
+        hub.setup_webhook('github', url, ['push'])
+
+
+def test_webhook_accepts_public_url(hub):
+    hub.add_service('github', {'token': 'a'})
+    assert hub.setup_webhook('github', 'https://example.com/hook', ['Push!']).startswith('✅')
+    assert list(hub.webhooks.values())[0]['events'] == ['push']
+
+
+def test_headers_are_derived_not_persisted(hub, tmp_path):
+    hub.add_service('jira', {'email': 'a@b.c', 'api_token': 'tok', 'domain': 'acme'})
+    assert hub.services['jira']['_headers']['Authorization'].startswith('Basic ')
+    hub.flush()
+    assert '_headers' not in (tmp_path / 'integrations.json').read_text()
+    assert IntegrationHub().services['jira']['_headers'] == hub.services['jira']['_headers']
+
+
+def test_async_all_connections(hub, monkeypatch):
+    hub.add_service('github', {'token': 'a'})
+    hub.add_service('notion', {'token': 'b'})
+    monkeypatch.setattr(hub, 'test_connection', lambda name: f"ok {name}")
+    assert asyncio.run(hub.atest_all_connections()) == {'github': 'ok github', 'notion': 'ok notion'}
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None, content=b'{}'):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = content
+
+
+def test_request_retries_once_after_rate_limit(hub, monkeypatch):
+    hub.add_service('github', {'token': 'a'})
+    responses = [FakeResponse(429, {'Retry-After': '0'}), FakeResponse(200, content=b'{"login": "me"}')]
+    session = hub._get_session('github')
+    monkeypatch.setattr(session, 'request', lambda *a, **kw: responses.pop(0))
+    assert hub.test_connection('github') == "✅ GitHub connected as me"
+    assert responses == []
+
+
+def test_export_configuration(hub, tmp_path):
+    hub.add_service('github', {'token': 'a'})
+    exported = json.loads(hub.export_configuration())
+    # Keys come out sorted, so exports of the same config diff cleanly
+    assert list(exported) == ['connection_status', 'exported_at', 'services', 'webhooks']
+    assert '_headers' not in exported['services']['github']
+
+    out = tmp_path / 'export.json'
+    assert hub.export_configuration(path=str(out)).startswith('✅')
+    assert json.loads(out.read_bytes())['services'] == exported['services']
+    assert hub.export_configuration('yaml').startswith('❌')
+
+
+def test_stats_track_status_and_webhook_changes(hub):
+    hub.add_service('github', {'token': 'a'})
+    hub._set_status('github', 'connected')
+    hub._set_status('slack', 'failed')
+    hub._set_status('github', 'failed')
+    hub.setup_webhook('github', 'https://example.com/a', ['push'])
+    hub.setup_webhook('github', 'https://example.com/a', ['push'])
+    stats = hub.get_integration_stats()
+    assert (stats['connected_services'], stats['failed_connections']) == (0, 2)
+    assert (stats['total_webhooks'], stats['active_webhooks']) == (1, 1)
+
+    hub.remove_webhook(next(iter(hub.webhooks)))
+    assert hub.get_integration_stats()['active_webhooks'] == 0
+
+
+def test_exit_flush_does_not_keep_hubs_alive(tmp_path, monkeypatch):
+    import gc
+    import weakref
+    from terminal import integration_hub
+    monkeypatch.chdir(tmp_path)
+    hub = IntegrationHub()
+    hub.add_service('github', {'token': 'a'})
+    integration_hub._flush_live_hubs()
+    assert 'github' in IntegrationHub().services
+
+    ref = weakref.ref(hub)
+    hub.close()
+    del hub
+    gc.collect()
+    assert ref() is None
+
+
+def test_service_catalogue_is_read_only():
+    from terminal.integration_hub import SUPPORTED_SERVICES
+    with pytest.raises(TypeError):
+        SUPPORTED_SERVICES['github']['name'] = 'x'
+    with pytest.raises(AttributeError):
+        SUPPORTED_SERVICES['github']['features'].append('x')
+
+
+def test_added_services_do_not_share_template_features(hub):
+    from terminal.integration_hub import SUPPORTED_SERVICES
+    hub.add_service('github', {'token': 'a'})
+    hub.services['github']['features'].append('gists')
+    assert 'gists' not in SUPPORTED_SERVICES['github']['features']
+    hub.add_service('github', {'token': 'b'})
+    assert 'gists' not in hub.services['github']['features']
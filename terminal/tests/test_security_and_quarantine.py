@@ -1,7 +1,9 @@
 import time
 import os
 from terminal.context_aware_ai import QuarantineQueue
-from terminal.main import SecurityManager, RateLimiter
+import pytest
+
+from terminal.main import SecurityManager, SecurityError, RateLimiter
 
 
 def test_prompt_injection_detection():
@@ -10,6 +12,13 @@ def test_prompt_injection_detection():
     assert not sm.detect_prompt_injection("Hello, how are you?")
 
 
+@pytest.mark.parametrize('text', ["sudo reboot", "cat x | sh", "1 UNION  SELECT pw", "<SCRIPT>"])
+def test_sanitize_blocks_any_listed_pattern(text):
+    with pytest.raises(SecurityError):
+        SecurityManager().sanitize(text)
+    assert SecurityManager().sanitize("  explain sudoku  ") == "explain sudoku"
+
+
 def test_rate_limiter_allows_then_blocks(tmp_path):
     rl = RateLimiter(limit=2, window_seconds=1)
     user = 'tester'
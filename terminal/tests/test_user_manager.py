@@ -2,6 +2,9 @@ import os
 import json
 import importlib.util
 import sys
+import time
+
+import pytest
 
 
 def _load_terminal_main():
@@ -64,16 +67,133 @@ def test_legacy_sha256_migration(tmp_path, monkeypatch):
     um = tm.UserManager()
     ok, msg = um.login('bob', 'oldpass')
     assert ok
-    # After login, if passlib is installed we expect the password to be re-hashed
+    # After login, if bcrypt is installed we expect the password to be re-hashed
     try:
-        from passlib.hash import bcrypt  # type: ignore
-        passlib_present = True
+        import bcrypt  # type: ignore
+        bcrypt_present = True
     except Exception:
-        passlib_present = False
+        bcrypt_present = False
 
-    if passlib_present:
+    if bcrypt_present:
         assert um.user_db['bob']['password'] != legacy_hash
     else:
-        # If passlib isn't available in the environment we fall back to sha256 and
+        # If bcrypt isn't available in the environment we fall back to sha256 and
         # the stored password will remain the legacy hash.
-        assert um.user_db['bob']['password'] == legacy_hash
\ No newline at end of file
+        assert um.user_db['bob']['password'] == legacy_hash
+
+def test_low_cost_bcrypt_hash_is_upgraded_on_login(tmp_path, monkeypatch):
+    bcrypt = pytest.importorskip('bcrypt')
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setenv('AETHER_BCRYPT_COST', '5')
+
+    tm = _load_terminal_main()
+    um = tm.UserManager()
+    um.signup('carol', 'secret')
+    assert um.user_db['carol']['password'].startswith('$2b$05$')
+
+    um.bcrypt_cost = 6
+    ok, msg = um.login('carol', 'secret')
+    assert ok and um.current_user == 'carol'
+    assert um.user_db['carol']['password'].startswith('$2b$06$')
+    assert bcrypt.checkpw(b'secret', um.user_db['carol']['password'].encode())
+
+
+def test_user_db_saves_are_batched_and_atomic(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    tm = _load_terminal_main()
+    um = tm.UserManager()
+    um.signup('dave', 'pw')
+    um.signup('erin', 'pw')
+    db_path = tmp_path / '.nexus' / 'users.json'
+    assert not db_path.exists()
+
+    um.flush()
+    assert set(json.loads(db_path.read_text())) == {'dave', 'erin'}
+    assert not (tmp_path / '.nexus' / 'users.json.tmp').exists()
+    assert set(tm.UserManager().list_users()) == {'dave', 'erin'}
+
+
+
+def test_failed_user_db_save_is_rescheduled(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    tm = _load_terminal_main()
+    um = tm.UserManager()
+    um.signup('dave', 'pw')
+    real_save = um._save_users
+    um._save_users = lambda: (_ for _ in ()).throw(OSError('disk full'))
+    um.flush()
+    assert um._dirty and um._save_timer is not None
+
+    um._save_users = real_save
+    um.flush()
+    assert set(json.loads((tmp_path / '.nexus' / 'users.json').read_text())) == {'dave'}
+
+
+def test_paths_follow_home_changes(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path / 'a'))
+    tm = _load_terminal_main()
+    assert tm.USER_DB_PATH() == str(tmp_path / 'a' / '.nexus' / 'users.json')
+    monkeypatch.setenv('HOME', str(tmp_path / 'b'))
+    assert tm.USER_DB_PATH() == str(tmp_path / 'b' / '.nexus' / 'users.json')
+    assert tm.CONFIG_PATH() == str(tmp_path / 'b' / '.nexus' / 'config.yaml')
+
+def test_history_and_activity_logs_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    tm = _load_terminal_main()
+    um = tm.UserManager()
+    for i in range(60):
+        um.add_history('frank', str(i))
+        um.update_activity('frank', str(i))
+    assert um.get_history('frank') == [str(i) for i in range(10, 60)]
+    assert len(um.activity_log['frank']) == 60
+    ts, action = um.activity_log['frank'][-1]
+    assert um.audit_log[-1] == ('frank', ts, action) == ('frank', ts, '59')
+
+    um.clear_history('frank')
+    assert um.get_history('frank') == []
+
+
+def test_idle_session_expires_on_access(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    tm = _load_terminal_main()
+    um = tm.UserManager()
+    um.signup('gina', 'pw')
+    um.login('gina', 'pw')
+    um.last_active['gina'] = time.time()
+    assert um.current_user == 'gina'
+
+    um.last_active['gina'] -= um.session_timeout + 1
+    assert um.current_user is None
+
+    # Logging back in after expiry must not be undone by the stale timestamp
+    assert um.login('gina', 'pw')[0]
+    assert um.current_user == 'gina'
+
+
+def test_large_user_db_loads_through_mmap(tmp_path, monkeypatch):
+    pytest.importorskip('orjson')
+    monkeypatch.setenv('HOME', str(tmp_path))
+    tm = _load_terminal_main()
+    monkeypatch.setattr(tm, '_MMAP_MIN_SIZE', 1)
+    um = tm.UserManager()
+    um.signup('hank', 'pw')
+    um.flush()
+    assert tm.UserManager().list_users() == ['hank']
+
+
+def test_unknown_user_login_uses_prebuilt_dummy_hash(tmp_path, monkeypatch):
+    pytest.importorskip('bcrypt')
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setenv('AETHER_BCRYPT_COST', '5')
+    tm = _load_terminal_main()
+    um = tm.UserManager()
+    assert um._dummy_hash.startswith(b'$2b$05$')
+    monkeypatch.setattr(um._bcrypt, 'hashpw', lambda *a: pytest.fail('hashed during login'))
+    assert um.login('nobody', 'pw') == (False, "Invalid username or password.")
+
+
+@pytest.mark.parametrize('value, cost', [('lots', 12), ('2', 4), ('99', 31), ('10', 10)])
+def test_bcrypt_cost_setting_is_validated(monkeypatch, value, cost):
+    monkeypatch.setenv('AETHER_BCRYPT_COST', value)
+    tm = _load_terminal_main()
+    assert tm._bcrypt_cost() == cost